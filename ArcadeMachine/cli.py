@@ -29,41 +29,88 @@ along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
 # Google Doc Python: python documentation style guide
 # Doc String
 from ArcadeMachine import ArcadeCatalog, Game
-
-
-def main():
+from arcade_common.autocomplete import titles, did_you_mean  # Shared with workshop-II
+from arcade_common.session import SessionMachine, SessionStore, Step, number, yes_no, text
+
+
+def _game_code(answer, data):
+    """Accepts the code or the title (or the start of it) of a game compatible with the selected machine type."""
+    machine_type = "modern" if data["machine_type"] == 1 else "retro"
+    game = Game.available_games.by_code(answer.strip())
+    if game is not None and game.type.lower() != machine_type:
+        raise ValueError(f"This game is not valid for a {machine_type} machine.")
+    game = game or titles().resolve(machine_type, answer)
+    if game is None:
+        suggestions = did_you_mean(machine_type, answer)
+        raise ValueError(f"Invalid game code.\n{suggestions}" if suggestions else "Invalid game code.")
+    return game.code
+
+
+def _games_prompt(data):
+    machine_type = "modern" if data["machine_type"] == 1 else "retro"
+    lines = [f"\nAvailable games for {machine_type.capitalize()} Machines:"]
+    lines += [f"- Code: {game.code}, Title: {game.title}" for game in Game.available_games.by_type(machine_type)]
+    lines.append("Enter the code or title of the game you want to add (empty to finish): ")
+    return "\n".join(lines)
+
+
+def _options(category, options):
+    lines = [f"\n{category}:"] + [f"{idx}. {option}" for idx, option in enumerate(options, start=1)]
+    lines.append(f"Select an option for {category}: ")
+    return "\n".join(lines)
+
+
+STEPS = [
+    Step("machine_type", "\nSelect the machine type: 1. Modern, 2. Retro: ",
+         number({1, 2}, "Invalid input. Please enter 1 or 2.")),
+    Step("material", _options("Materials", ["Wood", "Aluminum", "Carbon Fiber"]),
+         number(range(1, 4), "Please select a number between 1 and 3.")),
+    Step("color", _options("Colors", ["Black", "White", "Red", "Blue", "Green", "Yellow", "Purple"]),
+         number(range(1, 8), "Please select a number between 1 and 7.")),
+    Step("lights", _options("Light Colors", ["White", "Red", "Blue", "Green", "Yellow", "Purple", "None"]),
+         number(range(1, 8), "Please select a number between 1 and 7.")),
+    Step("sound", "\nWould you like to add sound or speakers? (y/n): ", yes_no),
+    Step("games", _games_prompt, _game_code, repeat=True),
+    Step("name", "\nEnter your name: ", text("Please enter your name.")),
+    Step("address", "Enter your address: ", text("Please enter your address.")),
+    Step("phone", "Enter your phone number: ", text("Please enter your phone number."))
+]
+
+
+def main(kiosk="kiosk", idle_timeout=300):
     """
     Main function to interact with the arcade catalog.
     This function allows the user to select a machine type,
     view available games, add games to the machine,
     and complete the purchase by entering customer details.
-    """
 
-    catalog = ArcadeCatalog()
+    Every answer is saved in a session, so the flow of a customer is resumed
+    if the process restarts, and a customer idle for longer than idle_timeout
+    seconds is abandoned so the kiosk serves the next one. It runs until the
+    end of the input.
+    """
+    store = SessionStore(idle_timeout=idle_timeout, app="v1")
+    store.evict_idle()
+    flow = SessionMachine(STEPS)
 
     print("Welcome to the Arcade Machine Catalog.")
     while True:
+        session = flow.resume(store, kiosk)
         try:
-            # Prompt user to select the type of arcade machine
-            machine_type = int(
-                input("\nSelect the machine type: 1. Modern, 2. Retro: ")
-            )
+            finished = flow.run(session, store)
+        except EOFError:
             break
-        except ValueError:
-            print("Invalid input. Please enter 1 or 2.")
-
-    catalog.choose_machine(machine_type)
-    catalog.show_games()
-
-    # Start the process of adding games until the user decides to exit
-    catalog.add_games()
-
-    # Get customer information
-    name = input("\nEnter your name: ")
-    address = input("Enter your address: ")
-    phone = input("Enter your phone number: ")
-
-    catalog.complete_purchase(name, address, phone)
+        if not finished:
+            print("\nSession expired. Welcome to the Arcade Machine Catalog.")
+            continue
+
+        data = session.data
+        catalog = ArcadeCatalog()
+        catalog.configure(data["machine_type"], data["material"], data["color"], data["lights"],
+                          "With sound" if data["sound"] else "Without sound")
+        for code in data["games"]:
+            catalog.add_game_by_code(code)
+        catalog.complete_purchase(data["name"], data["address"], data["phone"])
 
 
 # Games available in the catalog (Added directly)
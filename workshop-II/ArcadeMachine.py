@@ -1,6 +1,8 @@
 """
-This module contains class definitions for arcade machines, including abstract and concrete classes.
-It also includes a class for games and a class for managing the arcade catalog.
+This module contains the arcade catalog of workshop-II: the cart, its lines and the
+purchases. The machine classes, their builder and factory, Game and Customer are the
+core shared with the original ArcadeMachine package (v1), defined in arcade_common and
+imported from here by the rest of workshop-II.
 The module provides functionality for customizing arcade machines, adding games, and completing purchases.
 
 
@@ -26,678 +28,169 @@ along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
 # Doc String
 
 
-from abc import ABC, abstractmethod
-from enum import Enum
-
-
-class Material(Enum):
-    """
-    Enum for arcade machine materials.
-
-    This enum defines the different types of materials available
-    for the construction of arcade machines.
-
-    """
-
-    WOOD = "Wood"
-    ALUMINUM = "Aluminum"
-    CARBON_FIBER = "Carbon Fiber"
-    
-class Glasses(Enum):
-    """
-    Enum for glasses of VirtualRealityMachine.
-
-    This enum defines the different types of glasses available
-    for glasses of VirtualRealityMachine.
-
-    """
-
-    OCULUS_RIFT = "Oculus Rift"
-    HTC_Vive = "HTC Vive"
-    VALVE_INDEX = "Valve Index"
-
-class Resolution(Enum):
-    """
-    Enum for arcade machine materials.
-
-    This enum defines the different types of materials available
-    for the construction of arcade machines.
-
+import json
+
+from arcade_common.game_catalog import Game, GameCatalog
+from arcade_common.machines import (Material, Glasses, Resolution, Sound, SimRacing, Color,
+                                    ArcadeMachine, ModernArcadeMachine, RetroArcadeMachine,
+                                    DanceRevolutionMachine, ClassicalArcadeMachine, ShootingMachine,
+                                    RacingMachine, VirtualRealityMachine, MACHINE_TYPES, MATERIAL_INCREASES,
+                                    machine_type_of, ArcadeMachineBuilder, ArcadeMachineFactory, Customer)
+from specs import machine_specs
+
+ArcadeMachine.specs_parser = staticmethod(machine_specs)  # Machines built here parse their specs
+
+
+# Options of the catalog menus, mapped to their enum members. Built once:
+# the customize_* methods are called for every order.
+MATERIAL_OPTIONS = {"wood": Material.WOOD, "aluminum": Material.ALUMINUM, "fiber": Material.CARBON_FIBER}
+COLOR_OPTIONS = {
+    1: Color.MULTICOLOR,
+    2: Color.WHITE,
+    3: Color.RED,
+    4: Color.BLUE,
+    5: Color.GREEN,
+    6: Color.YELLOW,
+    7: Color.PURPLE
+}
+LIGHT_OPTIONS = {
+    1: Color.MULTICOLOR,
+    2: Color.RED,
+    3: Color.BLUE,
+    4: Color.GREEN,
+    5: Color.YELLOW,
+    6: Color.PURPLE,
+    8: Color.DEFAULT
+}
+
+
+def configuration_key(machine):
     """
-
-    FULLHD = "1920x1080"
-    QHD = "2560x1440"
-    UHD = "3840x2160"
-
-class Sound(Enum):
+    Returns a hashable key of the configuration of a machine: its class, its
+    attributes and the codes of its installed games. Machines with the same
+    key are identical units.
     """
-    Enum for arcade machine materials.
+    attributes = tuple(item for item in vars(machine).items() if item[0] != "_games")
+    return type(machine), attributes, tuple(str(game._code) for game in machine._games)
 
-    This enum defines the different types of materials available
-    for the construction of arcade machines.
 
+class CartLine:
     """
+    A distinct machine configuration of a cart and the number of units.
 
-    MONO = "mono"
-    ESTEREO = "Estereo"
-    SURROUND = "Surround"
-    
-class SimRacing(Enum):
-    """
-    Enum for arcade machine materials.
-
-    This enum defines the different types of simRacing available
-    for the construction of Racing machines.
-
+    Attributes:
+    -----------
+    machine : ArcadeMachine
+        A unit of the configuration.
+    quantity : int
+        The number of units.
+    unit_price : float
+        The price of a unit, set when the cart is priced.
     """
+    def __init__(self, machine, quantity):
+        self.machine = machine
+        self.quantity = quantity
+        self.unit_price = None
 
-    PROFESIONAL = "forcefeedback steering wheel and pedals"
-    AMATEUR = "digital stering wheel and pedals"
-    STARTER = "analog stering wheel and pedals"
+    @property
+    def total(self):
+        return self.unit_price * self.quantity
 
 
-class Color(Enum):
-    """
-    Enum for arcade machine colors.
-
-    This enum defines the different colors that can be applied to arcade machines.
-    applied to arcade machines and their lights.
-    """
-    MULTICOLOR = "Multicolor"
-    WHITE = "White"
-    RED = "Red"
-    BLUE = "Blue"
-    GREEN = "Green"
-    YELLOW = "Yellow"
-    PURPLE = "Purple"
-    DEFAULT = "Default"
-
-
-class ArcadeMachine(ABC):
-    """This class represents the behavior of an Arcade Machine"""
-    
-    def __init__(self, material: Material, color: Color, lights: Color,
-                 sound: Sound, controls: str, dimensions: str,
-                 weight: float, power_consumption: float,
-                 memory: str, processor: str, base_price: float):
-        self._material = material  # Encapsulation (protected attribute)
-        self._color = color
-        self._lights = lights
-        self._sound = sound
-        self._games = []  # List for the games added to the machine
-        self._controls = controls
-        self._dimensions = dimensions
-        self._weight = weight
-        self._power_consumption = power_consumption
-        self._memory = memory
-        self._processor = processor
-        self._base_price = base_price
-        
-    @abstractmethod
-    def show_available_games(self):
-        """ Abstract method to display the available games for the arcade machine. """
-
-    @abstractmethod
-    def is_game_valid(self, game):
-        """ Abstract method to verify if a game is valid for this type of arcade machine. """
-
-    def add_game(self, game):
-        """ Adds a game to the list of games installed on the arcade machine. """
-        self._games.append(game)
-
-    def show_info(self):
-        return (f"Máquina Arcade:\n"
-                f"Material: {self._material.value}\n"
-                f"Color: {self._color.value}\n"
-                f"Luces: {self._lights.value}\n"
-                f"Sonido: {self._sound}\n"
-                f"Controles: {self._controls}\n"
-                f"Dimensiones: {self._dimensions}\n"
-                f"Peso: {self._weight}\n"
-                f"Consumo de energía: {self._power_consumption}\n"
-                f"Memoria: {self._memory}\n"
-                f"Procesador: {self._processor}\n"
-                f"Precio base: ${self._base_price:.2f}")
-
-class ModernArcadeMachine(ArcadeMachine):
-    """Concrete class representing a modern arcade machine.
-    
-    Inherits from:
-    --------------
-    ArcadeMachine : Abstract base class representing the general behavior of an arcade machine.
-    """
-    def __init__(self, material: Material, color: Color, lights: Color,
-                 sound: Sound, dimensions: str, weight: float,
-                 power_consumption: float, memory: str, processor: str,
-                 base_price: float):
-        """Initializes the modern arcade machine with material, color, lights, and sound system."""
-        
-        # Llamar al constructor de la clase base (ArcadeMachine)
-        super().__init__(material, color, lights, sound, controls="Modern Controls",
-                         dimensions=dimensions, weight=weight,
-                         power_consumption=power_consumption,
-                         memory=memory, processor=processor, base_price=base_price)
-
-    def show_available_games(self):
-        """
-        Returns a list of available modern games that can be played on the modern arcade machine.
-        Automatically filters the available games from the Game class by type 'modern'.
-        """
-        # Filter type games 'modern'
-        modern_games = [game.title for game in Game.available_games if game.type.lower() == "modern"]
-        return modern_games
-
-    def is_game_valid(self, game):
-        """This method checks if a game is valid for this arcade machine based on its type.
-        and return true if the game is modern"""
-        return game.type.lower() == "modern"
-
-    def show_info(self):
-        """
-        Returns a string representation of the object's information, including the controls.
-        Returns:
-            str: A string representation of the object's information, including the controls.
-        """
-        return super().show_info() + f", Controls: {self._controls}"
-    
-    def __str__(self):
-        return (f"Modern Arcade Machine:\n"
-                f"Material: {self._material.value}\n"
-                f"controls: {self._controls}\n"
-                f"Color: {self._color.value}\n"
-                f"Lights: {self._lights.value}\n"
-                f"Sound: {self._sound.value}\n"
-                f"Dimensions: {self._dimensions}\n"
-                f"Weight: {self._weight}\n"
-                f"Power Consumption: {self._power_consumption}\n"
-                f"Memory: {self._memory}\n"
-                f"Processor: {self._processor}\n"
-                f"Base Price: ${self._base_price:.2f}")
-
-# Concrete class: RetroArcadeMachine (Inheritance)
-class RetroArcadeMachine(ArcadeMachine):
-    """ Represents a retro arcade machine.
-    Args:
-        material (Material): The material of the arcade machine.
-        color (Color): The color of the arcade machine.
-        lights (Color): The color of the lights on the arcade machine.
-        sound (str): The sound of the arcade machine.
-    Attributes:
-        _controls (str): The additional attribute for retro controls.
-    Methods:
-        show_available_games(): Returns a list of available games.
-        is_game_valid(game): Checks if a game is valid for the arcade machine.
-        show_info(): Returns the information about the arcade machine. """
-    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, power_consumption: float,dimensions: str, weight: float, memory: str, processor: str, base_price: float):
-        """Initializes the retro arcade machine with material, color, lights, and sound system."""
-        # Llamar al constructor de la clase base (ArcadeMachine)
-        super().__init__(material, color, lights, sound, controls="Retro Controls", 
-                         dimensions=dimensions, weight=weight, power_consumption=power_consumption, 
-                         memory=memory, processor=processor, base_price=base_price)
-    def show_available_games(self):
-        """
-        Returns a list of available modern games that can be played on the modern arcade machine.
-        Automatically filters the available games from the Game class by type 'modern'.
+# Class that manages the arcade catalog
+class ArcadeCatalog:
+    """ Manages the arcade machine catalog and handles customer interactions."""
+    def __init__(self, pricing=None, orders_path=None, customers=None):
         """
-        # Filter type games 'modern'
-        retro_games = [game.title for game in Game.available_games if game.type.lower() == "retro"]
-        return retro_games
-
-    def is_game_valid(self, game):
-        return game.type.lower() == "retro"
+        Initializes the catalog with no selected machine, customer, or machine type.
 
-    def show_info(self):
-        return super().show_info() + f", Controls: {self._controls}"
-    
-class DanceRevolutionMachine(ArcadeMachine):
-    """Represents a Dance Revolution arcade machine."""
-
-    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, 
-                 dimensions: str, weight: float, power_consumption: float, 
-                 memory: str, processor: str, base_price: float, difficulties: str, 
-                 arrow_cardinalities: str, controls_price: float):
-        
-        super().__init__(material, color, lights, sound, controls="Dance Revolution Controls", 
-                         dimensions=dimensions, weight=weight, power_consumption=power_consumption, 
-                        memory=memory, processor=processor, 
-                         base_price=base_price)
-
-        self._difficulties = difficulties
-        self._arrow_cardinalities = arrow_cardinalities
-        self._controls_price = controls_price
-        
-    def show_available_games(self):
-        """
-        Returns a list of available modern games that can be played on the modern arcade machine.
-        Automatically filters the available games from the Game class by type 'modern'.
-        """
-        # Filter type games 'modern'
-        retro_games = [game.title for game in Game.available_games if game.type.lower() == "dance"]
-        return retro_games
-
-    def is_game_valid(self, game):
-        return game.type.lower() == "dance"
-
-    def show_info(self):
-        return super().show_info() + f", Controls: {self._controls}"
-
-class ClassicalArcadeMachine(ArcadeMachine):
-    """ Represents a retro arcade machine.
-    Args:
-        material (Material): The material of the arcade machine.
-        color (Color): The color of the arcade machine.
-        lights (Color): The color of the lights on the arcade machine.
-        sound (str): The sound of the arcade machine.
-    Attributes:
-        _controls (str): The additional attribute for retro controls.
-    Methods:
-        show_available_games(): Returns a list of available games.
-        is_game_valid(game): Checks if a game is valid for the arcade machine.
-        show_info(): Returns the information about the arcade machine. """
-    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, dimensions: str, weight: float, power_consumption: float, memory: str, processor: str, base_price: float, make_vibration: bool, sound_record_alert:bool):
-        """Initializes the retro arcade machine with material, color, lights, and sound system."""
-        # Llamar al constructor de la clase base (ArcadeMachine)
-        super().__init__(material, color, lights, sound, controls="Classical Controls", 
-                         dimensions=dimensions, weight=weight, power_consumption= power_consumption, 
-                         memory=memory, processor=processor, base_price=base_price)
-        
-        self._make_vibration = make_vibration
-        self._sound_record_alert = sound_record_alert
-        
-    def show_available_games(self):
-        """
-        Returns a list of available modern games that can be played on the modern arcade machine.
-        Automatically filters the available games from the Game class by type 'modern'.
-        """
-        # Filter type games 'modern'
-        retro_games = [game.title for game in Game.available_games if game.type.lower() == "classical"]
-        return retro_games
-
-    def is_game_valid(self, game):
-        return game.type.lower() == "classical"
-
-    def show_info(self):
-        return super().show_info() + f", Controls: {self._controls}"
-
-class ShootingMachine(ArcadeMachine):
-    """ Represents a retro arcade machine.
-    Args:
-        material (Material): The material of the arcade machine.
-        color (Color): The color of the arcade machine.
-        lights (Color): The color of the lights on the arcade machine.
-        sound (str): The sound of the arcade machine.
-    Attributes:
-        _controls (str): The additional attribute for retro controls.
-    Methods:
-        show_available_games(): Returns a list of available games.
-        is_game_valid(game): Checks if a game is valid for the arcade machine.
-        show_info(): Returns the information about the arcade machine. """
-    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, dimensions: str, weight: float, power_consumption: float, memory: str, processor: str, base_price: float, gun_color : Color):
-        """Initializes the retro arcade machine with material, color, lights, and sound system."""
-        # Llamar al constructor de la clase base (ArcadeMachine)
-        super().__init__(material, color, lights, sound, controls="Shooting Controls",
-                         dimensions=dimensions, weight=weight, power_consumption= power_consumption, 
-                         memory=memory, processor=processor, base_price=base_price)
-        self._gun_color = gun_color
-        
-        
-    def show_available_games(self):
-        """
-        Returns a list of available modern games that can be played on the modern arcade machine.
-        Automatically filters the available games from the Game class by type 'modern'.
+        Parameters:
+        -----------
+        pricing : PricingEngine, optional
+            Prices the lines of the cart; without it a unit costs its base
+            price plus its accessories.
+        orders_path : str, optional
+            A file where every completed order is appended as a JSON line.
+        customers : CustomerDirectory, optional
+            Keeps one customer per person and their orders; without it every
+            purchase creates a new Customer.
         """
-        # Filter type games 'modern'
-        retro_games = [game.title for game in Game.available_games if game.type.lower() == "shooter"]
-        return retro_games
-
-    def is_game_valid(self, game):
-        return game.type.lower() == "shooter"
-
-    def show_info(self):
-        return super().show_info() + f", Controls: {self._controls}"
+        self._cart = None  # The machine being configured
+        self._lines = {}  # Configuration key -> CartLine
+        self._customer = None
+        self._machine_type = None  # Added this attribute to know the machine type
+        self._line_listeners = []  # Callables notified of every line of a completed purchase
+        self._purchase_listeners = []  # Callables notified once per completed purchase
+        self._pricing = pricing
+        self._orders_path = orders_path
+        self._customers = customers
 
+    def add_to_cart(self, machine_type):
+       pass
 
-class RacingMachine(ArcadeMachine):
-    """ Represents a retro arcade machine.
-    Args:
-        material (Material): The material of the arcade machine.
-        color (Color): The color of the arcade machine.
-        lights (Color): The color of the lights on the arcade machine.
-        sound (str): The sound of the arcade machine.
-    Attributes:
-        _controls (str): The additional attribute for retro controls.
-    Methods:
-        show_available_games(): Returns a list of available games.
-        is_game_valid(game): Checks if a game is valid for the arcade machine.
-        show_info(): Returns the information about the arcade machine. """
-    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, dimensions: str, weight: float, power_consumption: float, memory: str, processor: str, base_price: float, type_sim_racing: SimRacing, add_gearbox: bool):
-        """Initializes the retro arcade machine with material, color, lights, and sound system."""
-        # Llamar al constructor de la clase base (ArcadeMachine)
-        super().__init__(material, color, lights, sound, controls="SimRacing Controls", 
-                         dimensions=dimensions, weight=weight, power_consumption=power_consumption, 
-                         memory=memory, processor=processor, base_price=base_price)
-        self._type_sim_racing = type_sim_racing
-        self._add_gearbox = add_gearbox
-        
-        
-    def show_available_games(self):
-        """
-        Returns a list of available modern games that can be played on the modern arcade machine.
-        Automatically filters the available games from the Game class by type 'modern'.
+    def add_machine(self, machine=None, quantity=1):
         """
-        # Filter type games 'modern'
-        retro_games = [game.title for game in Game.available_games if game.type.lower() == "racing"]
-        return retro_games
+        Adds units of a configured machine to the cart (by default the machine
+        being configured, which is then cleared).
 
-    def is_game_valid(self, game):
-        return game.type.lower() == "racing"
+        Units identical to a line already in the cart increase its quantity,
+        so the cart has one line per distinct configuration.
 
-    def show_info(self):
-        return super().show_info() + f", Controls: {self._controls}"
-    
-class VirtualRealityMachine(ArcadeMachine):
-    """ Represents a retro arcade machine.
-    Args:
-        material (Material): The material of the arcade machine.
-        color (Color): The color of the arcade machine.
-        lights (Color): The color of the lights on the arcade machine.
-        sound (str): The sound of the arcade machine.
-    Attributes:
-        _controls (str): The additional attribute for retro controls.
-    Methods:
-        show_available_games(): Returns a list of available games.
-        is_game_valid(game): Checks if a game is valid for the arcade machine.
-        show_info(): Returns the information about the arcade machine. """
-    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, dimensions: str, weight: float, power_consumption: float, memory: str, processor: str, base_price: float, glasses_type: Glasses, glasses_resolution: Resolution, glasses_price: float):
-        """Initializes the retro arcade machine with material, color, lights, and sound system."""
-        # Llamar al constructor de la clase base (ArcadeMachine)
-        super().__init__(material, color, lights, sound, controls="VR Glasses", 
-                         dimensions=dimensions, weight=weight, power_consumption=power_consumption, 
-                         memory=memory, processor=processor, base_price=base_price)
-        self._glasses_type = glasses_type
-        self._glasses_resolution = glasses_resolution
-        self._glasses_price = glasses_price
-        
-        
-    def show_available_games(self):
-        """
-        Returns a list of available modern games that can be played on the modern arcade machine.
-        Automatically filters the available games from the Game class by type 'modern'.
+        Returns:
+        --------
+        CartLine : The line of the machine.
         """
-        # Filter type games 'modern'
-        retro_games = [game.title for game in Game.available_games if game.type.lower() == "vr"]
-        return retro_games
-
-    def is_game_valid(self, game):
-        return game.type.lower() == "vr"
-
-    def show_info(self):
-        return super().show_info() + f", Controls: {self._controls}"
-    
-class ArcadeMachineBuilder:
-    def __init__(self):
-        self._material = Material.WOOD
-        self._color = Color.DEFAULT
-        self._lights = Color.DEFAULT
-        self._sound = Sound.MONO
-        
-        # Inicializar atributos de la máquina
-        self._dimensions = ""
-        self._weight = 0
-        self._power_consumption = 0
-        self._memory = ""
-        self._processor = ""
-        self._base_price = 0
-        
-    def set_attributes(self, defaults):
-        """Configura los atributos de la máquina con los valores predeterminados."""
-        self._dimensions = defaults['dimensions']
-        self._weight = defaults['weight']
-        self._power_consumption = defaults['power_consumption']
-        self._memory = defaults['memory']
-        self._processor = defaults['processor']
-        self._base_price = defaults['base_price']
-            
-    def set_increases(self, increase_weight: float, increase_power: float, increase_price: float):
-        """Configura los atributos de la máquina con los valores predeterminados."""
-        self._weight *= increase_weight  # Aumentar el peso
-        self._power_consumption *= increase_power  # Aumentar el consumo de energía
-        self._base_price *= increase_price  # Aumentar el precio
-        return
-
-
-    def set_material(self, material: Material):
-        self._material = material
-        return self
-
-    def set_color(self, color: Color):
-        self._color = color
-        return self
-
-    def set_lights(self, lights: Color):
-        self._lights = lights
-        return self
-
-    def set_sound(self, sound: Sound):
-        self._sound = sound
-        return self
-
-    def set_controls(self, controls: str):
-        self._controls = controls
-        return self
-
-    def set_dimensions(self, dimensions: str):
-        self._dimensions = dimensions
-        return self
-
-    def set_weight(self, weight: float):
-        self._weight = weight
-        return self
-
-    def set_power_consumption(self, power_comsumption: float):
-        self._power_consumption = power_comsumption
-        return self
-
-    def set_memory(self, memory: str):
-        self._memory = memory
-        return self
-
-    def set_processor(self, processor: str):
-        self._processor = processor
-        return self
-
-    def set_base_price(self, price: float):
-        self._base_price = price
-        return self
-    
-    def build_modern(self) -> ModernArcadeMachine:
-        return ModernArcadeMachine(self._material, self._color, self._lights,
-                                   self._sound, self._dimensions,
-                                   self._weight, self._power_consumption,
-                                   self._memory, self._processor, self._base_price)
-        
-    def build_retro(self) -> RetroArcadeMachine:
-        return RetroArcadeMachine(self._material, self._color, self._lights,
-                                   self._sound, self._dimensions,
-                                   self._weight, self._power_consumption,
-                                   self._memory, self._processor, self._base_price)
-    # Dance Revolution Machine setter
-    def set_difficulties(self, difficulties: str):
-        self._difficulties = difficulties
-        return self
-    
-    def set_arrow_cardinalities(self, arrow_cardinalities: str):
-        self._arrow_cardinalities = arrow_cardinalities
-        return self
-    
-    def set_controls_price(self, controls_price: float):
-        self._controls_price = controls_price
-        return self
-    
-    def build_dance(self) -> DanceRevolutionMachine:
-        return DanceRevolutionMachine(self._material, self._color, self._lights,
-                                   self._sound, self._dimensions,
-                                   self._weight, self._power_consumption,
-                                   self._memory, self._processor, self._base_price, self._difficulties, self._arrow_cardinalities , self._controls_price)
-    # Classical Machine Setter
-    def set_make_vibration(self, make_vibration: bool):
-        self._make_vibration = make_vibration
-        return self
-    def set_sound_record_alert(self, sound_record_alert: bool):
-        self._sound_record_alert = sound_record_alert
-        return self
-    
-    def build_classical(self) -> ClassicalArcadeMachine:
-        return ClassicalArcadeMachine(self._material, self._color, self._lights,
-                                   self._sound, self._dimensions,
-                                   self._weight, self._power_consumption,
-                                   self._memory, self._processor, self._base_price, self._make_vibration, self._sound_record_alert)
-    # Shooting Machine Setter
-    
-    def set_gun_color(self, gun_color: Color):
-        self._gun_color = gun_color
-        return self
-    
-    def build_shooting(self) -> ShootingMachine:
-        return ShootingMachine(self._material, self._color, self._lights,
-                                   self._sound, self._dimensions,
-                                   self._weight, self._power_consumption,
-                                   self._memory, self._processor, self._base_price, self._gun_color)
-    # Racing Machine Setter
-    
-    def set_type_sim_racing(self, type_sim_racing: SimRacing):
-        self._type_sim_racing = type_sim_racing
-        return self
-    
-    def set_add_gearbox(self, add_gearbox: bool):
-        self._add_gearbox = add_gearbox
-        return self
-    
-    def build_racing(self) -> RacingMachine:
-        return RacingMachine(self._material, self._color, self._lights,
-                                   self._sound, self._dimensions,
-                                   self._weight, self._power_consumption,
-                                   self._memory, self._processor, self._base_price, self._type_sim_racing, self._add_gearbox)
-    # Virtual Reality Machine Setter
-    def set_glasses_type(self, glasses_type: Glasses):
-        self._glasses_type = glasses_type
-        return self
-    
-    def set_glasses_resolution(self, glasses_resolution: Resolution):
-        self._glasses_resolution = glasses_resolution
-        return self
-    
-    def glasses_price(self, glasses_price: float):
-        self._glasses_price = glasses_price
-        return self
-    
-    def build_vr(self) -> VirtualRealityMachine:
-        return VirtualRealityMachine(self._material, self._color, self._lights,
-                                   self._sound, self._dimensions,
-                                   self._weight, self._power_consumption,
-                                   self._memory, self._processor, self._base_price, self._glasses_type, self._glasses_resolution, self._glasses_price)
-    
-class ArcadeMachineFactory:
-    """Clase Factory para crear máquinas arcade."""
-    @staticmethod
-    def create_arcade_machine(machine_type, builder):
-        if machine_type == "modern":
-            return builder.build_modern()
-        elif machine_type == "retro":
-            return builder.build_retro()
-        if machine_type == "classical":
-            return builder.build_modern()
-        elif machine_type == "dance":
-            return builder.build_retro()
+        if machine is None:
+            machine, self._cart = self._cart, None
+        if machine is None:
+            raise ValueError("There is no machine to add to the cart.")
+        if quantity < 1:
+            raise ValueError("The quantity must be at least 1.")
+        key = configuration_key(machine)
+        line = self._lines.get(key)
+        if line is None:
+            line = self._lines[key] = CartLine(machine, quantity)
         else:
-            raise ValueError("Tipo de máquina no válido.")
-class Game:
-    """Represents a game in the arcade catalog
-    
-    Represents a game in the arcade catalog.
-
-    Class Attributes:
-    ------------------
-    available_games : list
-        A class-level list that stores all available games in the catalog.
-
-    Instance Attributes:
-    ----------------------
-    title : str
-        The title of the game.
-    code : str
-        A unique code associated with the game.
-    type : str
-        The type of the game, either "modern" or "retro".
-    """
-    available_games = []  # Available games in the catalog (Class attribute)
-
-    def __init__(self, title, code, type:str,storytelling_creator:str, graphics_creator:str, category:str, price_game: float, year:str ):
-        """Initializes a new game instance and adds it to the class-level 
-        list of available games.
+            line.quantity += quantity
+        return line
+
+    def cart_lines(self):
+        """Returns the lines of the cart (with the machine being configured, if any), priced."""
+        if self._cart is not None:
+            self.add_machine()
+        lines = list(self._lines.values())
+        for line in lines:
+            line.unit_price = self._unit_price(line)
+        return lines
+
+    def _unit_price(self, line):
+        if self._pricing is not None:
+            return self._pricing.quote(line.machine, line.quantity).unit_price
+        from analytics import order_price
+        return order_price(line.machine)
+
+    def cart_total(self):
+        """Returns the total of the cart; every distinct configuration is priced once."""
+        return sum(line.total for line in self.cart_lines())
+
+    def subscribe(self, listener):
         """
-        self._title = title
-        self._code = code
-        self._type = type 
-        self._storytelling_creator = storytelling_creator
-        self.graphics_creator = graphics_creator
-        self._category = category
-        self._price_game = price_game
-        self._year = year
-        Game.available_games.append(self)
-
-    @staticmethod
-    def show_available_games(machine_type):
-        """Show games compatible with the selected machine type."""
-        print(f"\nAvailable games for {machine_type.capitalize()} Machines:")
-        for game in Game.available_games:
-            if game._type.lower() == machine_type.lower():
-                print(f"- Code: {game._code}, Title: {game._title}")
-    
-    
-
-# Client Class
-class Customer:
-    """
-    Represents a customer with their personal information.
-
-    Attributes:
-    -----------
-    name : str
-        The name of the customer.
-    address : str
-        The address of the customer.
-    phone : str
-        The phone number of the customer.
-
-    """
-    def __init__(self, name, address, phone):
-        """Initializes a new customer with the specified name, address, and phone number."""
-        self.name = name
-        self.address = address
-        self.phone = phone
-
-
-    def __str__(self):
-        """Returns a string representation of the customer, including their name,
-        address, and phone number.
+        Registers a callable that receives (machine, customer, quantity,
+        unit_price) for every line of a completed purchase, for example a
+        recommendation module. unit_price is the price charged for each
+        machine of the line. A purchase of several lines calls it several
+        times; use subscribe_purchases to count purchases.
         """
-        return f"Customer: {self.name}, Address: {self.address}, Phone: {self.phone}"
-
+        self._line_listeners.append(listener)
 
-# Class that manages the arcade catalog
-class ArcadeCatalog:
-    """ Manages the arcade machine catalog and handles customer interactions."""
-    def __init__(self):
+    def subscribe_purchases(self, listener):
         """
-        Initializes the catalog with no selected machine, customer, or machine type.
+        Registers a callable that receives (customer, lines, order) once per
+        completed purchase, after the line listeners: lines are the priced
+        CartLines of the purchase and order is the dict returned by
+        complete_purchase.
         """
-        self._cart = None
-        self._customer = None
-        self._machine_type = None  # Added this attribute to know the machine type
-
-    def add_to_cart(self, machine_type):
-       pass
+        self._purchase_listeners.append(listener)
 
     def choose_machine(self, machine_type):
         """
@@ -715,14 +208,7 @@ class ArcadeCatalog:
 
     def customize_material(self, material_option):
         """Customizes the material of the arcade machine based on the selected option."""
-        if material_option == "wood":
-            return Material.WOOD
-        elif material_option == "aluminum":
-            return Material.ALUMINUM
-        elif material_option == "fiber":
-            return Material.CARBON_FIBER
-        else:
-            return "Invalid material"
+        return MATERIAL_OPTIONS.get(material_option, "Invalid material")
     def color_options(self):
         color_option = self.get_option(
             "Colors",
@@ -734,17 +220,7 @@ class ArcadeCatalog:
         """
         Customizes the color of the arcade machine based on the selected option.
         """
-        colors = {
-            1: Color.MULTICOLOR,
-            2: Color.WHITE,
-            3: Color.RED,
-            4: Color.BLUE,
-            5: Color.GREEN,
-            6: Color.YELLOW,
-            7: Color.PURPLE
-            
-        }
-        return colors.get(color_option, "Invalid color")
+        return COLOR_OPTIONS.get(color_option, "Invalid color")
     def light_options(self):
         lights_option = self.get_option(
             "Light Colors",
@@ -755,16 +231,7 @@ class ArcadeCatalog:
         """
         Customizes the color of the arcade machine's lights based on the selected option.
         """
-        light_colors = {
-            1: Color.MULTICOLOR,
-            2: Color.RED,
-            3: Color.BLUE,
-            4: Color.GREEN,
-            5: Color.YELLOW,
-            6: Color.PURPLE,
-            8: Color.DEFAULT
-        }
-        return light_colors.get(lights_option, "Invalid light color")
+        return LIGHT_OPTIONS.get(lights_option, "Invalid light color")
 
     def get_option(self, category, options):
         """
@@ -804,22 +271,67 @@ class ArcadeCatalog:
 
     
     def add_game_by_code(self, game_code):
-        """Adds a game to the arcade machine by game code, ensuring compatibility with machine type."""
+        """
+        Adds a game to the arcade machine by game code, ensuring compatibility with machine type.
+
+        The game can also be given by its title or the start of it; when no
+        game matches, the closest titles of the machine type are suggested.
+        """
         if not self._cart:
             print("\nYou need to add a machine to your cart first.")
             return
 
-        for game in Game.available_games:
-            if game._code == game_code and game._type == self._machine_type:
-                self._cart.add_game(game)
-                print(f"\nGame '{game._title}' added to your {self._machine_type} machine.")
-                return
+        from arcade_common.autocomplete import titles, did_you_mean
+        machine_type = self._machine_type or machine_type_of(self._cart)
+        game = titles().resolve(machine_type, str(game_code))
+        if game is not None:
+            self._cart.add_game(game)
+            print(f"\nGame '{game._title}' added to your {machine_type} machine.")
+            return
         print("\nInvalid game code or incompatible game for this machine type.")
+        suggestions = did_you_mean(machine_type, str(game_code))
+        if suggestions:
+            print(suggestions)
 
     def complete_purchase(self, name, address, phone):
-        """Completes the purchase by saving customer information and displaying final details."""
-        self._customer = Customer(name, address, phone)
-        print("\nPurchase completed. Machine information:")
-        print(self._cart.show_info())
-        print("\nCustomer information:")
-        print(self._customer)
+        """
+        Completes the purchase of every line of the cart by saving customer
+        information and displaying final details, and empties the cart.
+
+        Returns:
+        --------
+        dict : The order, as appended to the orders file.
+        """
+        lines = self.cart_lines()
+        if not lines:
+            raise ValueError("The cart is empty.")
+        if self._customers is not None:
+            self._customer = self._customers.add(name, address, phone)
+        else:
+            self._customer = Customer(name, address, phone)
+        total = sum(line.total for line in lines)
+        output = ["\nPurchase completed. Machine information:"]
+        for line in lines:  # Rendered once per distinct configuration
+            output.append(line.machine.show_info())
+            output.append(f"Quantity: {line.quantity}, Unit price: ${line.unit_price:.2f}, "
+                          f"Line total: ${line.total:.2f}\n")
+        output.append(f"Total: ${total:.2f}")
+        output.append("\nCustomer information:")
+        output.append(str(self._customer))
+        print("\n".join(output))
+
+        from serialization import to_json_value
+        order = {"customer": to_json_value(self._customer), "total": total,
+                 "lines": [[to_json_value(line.machine), line.quantity, line.unit_price] for line in lines]}
+        if self._orders_path is not None:
+            with open(self._orders_path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(order, separators=(",", ":")) + "\n")
+        if self._customers is not None:
+            self._customers.record_order(self._customer, order)
+        for line in lines:
+            for listener in self._line_listeners:
+                listener(line.machine, self._customer, line.quantity, line.unit_price)
+        for listener in self._purchase_listeners:
+            listener(self._customer, lines, order)
+        self._lines = {}
+        return order
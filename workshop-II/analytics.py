@@ -0,0 +1,304 @@
+"""
+This module contains the sales analytics of the arcade catalog. SalesAnalytics
+receives the completed purchases (it can be subscribed to an ArcadeCatalog)
+and keeps streaming aggregates that can be queried at any time: revenue by
+machine type, material and color, the most installed games, price percentiles
+and the number of distinct customers. The structures use constant memory, so
+millions of orders can be ingested without keeping the history.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import heapq
+import math
+from hashlib import blake2b
+
+from ArcadeMachine import machine_type_of
+
+
+class TDigest:
+    """
+    Approximate quantiles of a stream of numbers (merging t-digest).
+
+    The values are buffered and merged into at most about `compression`
+    centroids; centroids near the extremes are kept small, so the tails
+    of the distribution stay accurate.
+    """
+    def __init__(self, compression=100):
+        self._compression = compression
+        self._centroids = []  # Sorted list of [mean, weight]
+        self._buffer = []
+        self._count = 0
+        self._min = math.inf
+        self._max = -math.inf
+
+    def __len__(self):
+        return self._count + len(self._buffer)
+
+    def add(self, value, weight=1):
+        """Adds a value to the digest."""
+        self._buffer.append((value, weight))
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+        if len(self._buffer) >= 5 * self._compression:
+            self._merge()
+
+    def _merge(self):
+        if not self._buffer:
+            return
+        points = sorted(self._centroids + [[value, weight] for value, weight in self._buffer])
+        self._buffer = []
+        total = sum(weight for _, weight in points)
+        merged = [list(points[0])]
+        seen = 0.0
+        for mean, weight in points[1:]:
+            current = merged[-1]
+            q = (seen + current[1] + weight / 2) / total
+            limit = 4 * total * q * (1 - q) / self._compression
+            if current[1] + weight <= max(limit, 1):
+                current[0] += (mean - current[0]) * weight / (current[1] + weight)
+                current[1] += weight
+            else:
+                seen += current[1]
+                merged.append([mean, weight])
+        self._centroids = merged
+        self._count = total
+
+    def quantile(self, q):
+        """Returns the approximate value below which a fraction q of the values lie."""
+        self._merge()
+        if not self._centroids:
+            return None
+        if q <= 0:
+            return self._min
+        if q >= 1:
+            return self._max
+        target = q * self._count
+        seen = 0.0
+        previous_mean, previous_position = self._min, 0.0
+        for mean, weight in self._centroids:
+            position = seen + weight / 2
+            if target < position:
+                fraction = (target - previous_position) / (position - previous_position)
+                return previous_mean + fraction * (mean - previous_mean)
+            previous_mean, previous_position = mean, position
+            seen += weight
+        fraction = (target - previous_position) / max(self._count - previous_position, 1e-12)
+        return previous_mean + fraction * (self._max - previous_mean)
+
+
+class SpaceSaving:
+    """
+    Approximate most frequent items of a stream with at most `capacity` counters.
+
+    When a new item arrives and every counter is taken, it replaces the item
+    with the lowest count and inherits that count, so frequent items are
+    never lost and their counts are overestimated by at most the minimum.
+
+    The lowest counter is found with a lazy min-heap of one (count, item)
+    entry per counter: increments do not touch the heap, and an eviction
+    pushes the outdated entries it meets on top back with their current
+    count until the top is up to date. Every entry pushed back stands for
+    increments since its last push, so an add costs O(log capacity)
+    amortized instead of a scan of all the counters.
+    """
+    def __init__(self, capacity=100):
+        self._capacity = capacity
+        self._counts = {}
+        self._heap = []  # [count when pushed, sequence, item], one per counter
+        self._sequence = 0  # Breaks ties, so items are never compared
+
+    def add(self, item, count=1):
+        """Counts an occurrence of the item."""
+        counts = self._counts
+        if item in counts:
+            counts[item] += count
+            return
+        heap = self._heap
+        self._sequence += 1
+        if len(counts) < self._capacity:
+            counts[item] = count
+            heapq.heappush(heap, (count, self._sequence, item))
+            return
+        while True:
+            smallest, sequence, victim = heap[0]
+            current = counts[victim]
+            if current == smallest:
+                break
+            heapq.heapreplace(heap, (current, sequence, victim))
+        del counts[victim]
+        counts[item] = smallest + count
+        heapq.heapreplace(heap, (smallest + count, self._sequence, item))
+
+    def top(self, n=10):
+        """Returns the n most frequent items as (item, count) tuples."""
+        return sorted(self._counts.items(), key=lambda pair: pair[1], reverse=True)[:n]
+
+
+class HyperLogLog:
+    """Approximate number of distinct items of a stream, using 2**precision registers."""
+    def __init__(self, precision=12):
+        self._precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, item):
+        """Adds an item (a string) to the estimate."""
+        value = int.from_bytes(blake2b(item.encode(), digest_size=8).digest(), "big")
+        index = value >> (64 - self._precision)
+        rest = value & ((1 << (64 - self._precision)) - 1)
+        rank = (64 - self._precision) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def count(self):
+        """Returns the estimated number of distinct items."""
+        m = len(self._registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))  # Linear counting for small cardinalities
+        return round(estimate)
+
+
+def order_price(machine):
+    """Returns the price paid for a machine: the base price plus its accessories."""
+    return (machine._base_price
+            + getattr(machine, "_controls_price", 0)
+            + getattr(machine, "_glasses_price", 0))
+
+
+class SalesAnalytics:
+    """
+    Streaming aggregates over the completed purchases.
+
+    An instance can be subscribed to an ArcadeCatalog, which calls it once
+    per completed purchase:
+
+        analytics = SalesAnalytics()
+        catalog.subscribe_purchases(analytics.ingest_purchase)
+
+    Attributes:
+    -----------
+    _revenue : dict
+        Revenue and number of machines by "type", "material" and "color".
+    _games : SpaceSaving
+        Install counts of the games.
+    _prices : TDigest
+        Distribution of the price of the machines sold.
+    _customers : HyperLogLog
+        Distinct customers (by name and phone).
+    """
+    def __init__(self, top_games_capacity=1000, compression=100):
+        self._revenue = {"type": {}, "material": {}, "color": {}}
+        self._games = SpaceSaving(top_games_capacity)
+        self._prices = TDigest(compression)
+        self._customers = HyperLogLog()
+        self._orders = 0
+        self._machines = 0
+        self._total = 0.0
+
+    def _add_revenue(self, dimension, key, price, quantity):
+        totals = self._revenue[dimension].get(key)
+        if totals is None:
+            self._revenue[dimension][key] = [price * quantity, quantity]
+        else:
+            totals[0] += price * quantity
+            totals[1] += quantity
+
+    def ingest_purchase(self, customer, lines, order=None):
+        """
+        Adds a completed purchase: counts one order and ingests every line
+        (CartLines, with their machine, quantity and unit price).
+        """
+        self._orders += 1
+        for line in lines:
+            self.ingest(line.machine, customer, line.quantity, line.unit_price)
+
+    def ingest(self, machine, customer, quantity=1, unit_price=None):
+        """
+        Adds a line of a completed purchase to the aggregates. The order is
+        counted by ingest_purchase, not here, since a purchase may have
+        several lines.
+
+        Parameters:
+        -----------
+        machine : ArcadeMachine
+            The machine sold, with its installed games.
+        customer : Customer
+            The customer of the purchase.
+        quantity : int
+            The number of identical machines sold.
+        unit_price : float, optional
+            The price charged for each machine; order_price(machine) when
+            it is not known.
+        """
+        price = order_price(machine) if unit_price is None else unit_price
+        self._machines += quantity
+        self._total += price * quantity
+        self._add_revenue("type", machine_type_of(machine), price, quantity)
+        self._add_revenue("material", machine._material.value, price, quantity)
+        self._add_revenue("color", machine._color.value, price, quantity)
+        for game in machine._games:
+            self._games.add(game._code, quantity)
+        self._prices.add(price, quantity)
+        self._customers.add(f"{customer.name}|{customer.phone}")
+
+    def order_count(self):
+        """Returns the number of purchases ingested (with ingest_purchase)."""
+        return self._orders
+
+    def total_revenue(self):
+        """Returns the revenue of every purchase ingested."""
+        return self._total
+
+    def revenue_by(self, dimension):
+        """Returns the revenue by "type", "material" or "color"."""
+        return {key: totals[0] for key, totals in self._revenue[dimension].items()}
+
+    def units_by(self, dimension):
+        """Returns the number of machines sold by "type", "material" or "color"."""
+        return {key: totals[1] for key, totals in self._revenue[dimension].items()}
+
+    def top_games(self, n=10):
+        """Returns the n most installed games as (game code, installs) tuples."""
+        return self._games.top(n)
+
+    def price_percentile(self, percentile):
+        """Returns the approximate price percentile (0 to 100) of the machines sold."""
+        return self._prices.quantile(percentile / 100)
+
+    def distinct_customers(self):
+        """Returns the approximate number of distinct customers."""
+        return self._customers.count()
+
+    def summary(self):
+        """Returns a text report of the aggregates."""
+        lines = [f"Orders: {self._orders}, Machines: {self._machines}, Revenue: ${self._total:.2f}"]
+        for dimension in ("type", "material"):
+            lines.append(f"Revenue by {dimension}:")
+            for key, revenue in sorted(self.revenue_by(dimension).items()):
+                lines.append(f"- {key}: ${revenue:.2f}")
+        lines.append("Top games: " + ", ".join(f"{code} ({count})" for code, count in self.top_games(5)))
+        lines.append("Price p50/p90/p99: " + "/".join(
+            f"${self.price_percentile(p):.2f}" for p in (50, 90, 99)))
+        lines.append(f"Distinct customers: {self.distinct_customers()}")
+        return "\n".join(lines)
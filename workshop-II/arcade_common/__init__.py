@@ -0,0 +1,32 @@
+"""
+This package contains the code shared by workshop-II and the original
+ArcadeMachine package (v1): the Game class and its indexed GameCatalog
+(game_catalog), the machine classes, their builder and factory (machines),
+the prefix trie of the names (search), the title index of the games
+(autocomplete) and the resumable sessions of the clis (session).
+
+Both packages have a top level module named ArcadeMachine, so the shared code
+lives in this package, with names of its own. workshop-II imports it from its
+folder; v1 imports it once installed (pip install -e . from the root of the
+repository), and never imports a module of workshop-II by its bare name.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
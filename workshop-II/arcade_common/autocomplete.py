@@ -0,0 +1,298 @@
+"""
+This module contains the title autocomplete of the games. Operators adding
+games to a machine used to need the numeric code of every game, and a typo
+only printed "Invalid game code"; with this index a game can be chosen by
+typing the start of its title (or of any word of it), and a misspelled title
+gets the closest titles as suggestions.
+
+Titles are indexed per machine type, so only the games compatible with the
+machine are suggested: a prefix trie for completions and a trigram index for
+fuzzy matches. The index follows the GameCatalog, so games registered later
+are suggested without rebuilding it, and removed games leave the tries at
+once: the searches never rebuild the index.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import heapq
+import re
+from collections import Counter
+from itertools import chain
+
+from .search import TOP_K, PrefixTrie, normalize_name
+from .game_catalog import Game
+
+MIN_SIMILARITY = 0.3  # Trigram similarity (Dice coefficient) of a fuzzy match
+SCAN_BUDGET = 1536  # Ids of the trigram lists counted by a fuzzy search
+CANDIDATES = 16  # Titles scored with all their trigrams by a fuzzy search
+
+_SEPARATORS = re.compile(r"[^\w]+")
+
+
+def normalize_title(title):
+    """Returns a title without accents, in lower case, with punctuation as single spaces."""
+    return " ".join(_SEPARATORS.sub(" ", normalize_name(title)).split())
+
+
+def trigrams(text):
+    """Returns the set of trigrams of a normalized text, padded so short texts and word starts count."""
+    padded = f"  {text} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class _TypeIndex:
+    """The indexes of the titles of one machine type."""
+    __slots__ = ("trie", "grams", "sizes")
+
+    def __init__(self, rank):
+        self.trie = PrefixTrie(rank)
+        self.grams = {}  # Trigram -> ids
+        self.sizes = {}  # Id -> number of trigrams of its title
+
+
+class TitleIndex:
+    """
+    Autocomplete of game titles per machine type.
+
+    Parameters:
+    -----------
+    catalog : GameCatalog
+        The games indexed (Game.available_games by default). The index
+        subscribes to it: added games are indexed as they are registered,
+        removed games are dropped, games whose title or type changed are
+        indexed again, and a reset of the catalog rebuilds the index.
+    """
+    def __init__(self, catalog=None):
+        self._catalog = Game.available_games if catalog is None else catalog
+        self.rebuild()
+        self._catalog.subscribe(self._changed)
+
+    def _changed(self, event, game, previous):
+        if event == "reset":
+            self.rebuild()
+        elif event == "add":
+            self.add_game(game)
+        elif event == "remove":
+            self.drop_game(game)
+        elif "_title" in previous or "_type" in previous:
+            self.drop_game(game, previous)
+            self.add_game(game)
+
+    def _rank(self, id):
+        return self._titles[id], id  # Completions in alphabetical order
+
+    def rebuild(self):
+        """Indexes the games of the catalog again."""
+        self._games = []  # Id -> Game (None once dropped)
+        self._ids = {}  # Game -> Id
+        self._dead = 0  # Ids dropped, left in the trigram lists until they are compacted
+        self._titles = []  # Id -> normalized title (None once dropped)
+        self._types = {}  # Machine type -> _TypeIndex
+        self._by_title = {}  # (machine type, normalized title) -> Game
+        for game in self._catalog:
+            self.add_game(game)
+
+    def add_game(self, game):
+        """Indexes a game."""
+        machine_type = game._type.lower()
+        title = normalize_title(game._title)
+        id = len(self._games)
+        self._games.append(game)
+        self._ids[game] = id
+        self._titles.append(title)
+        self._by_title.setdefault((machine_type, title), game)
+        index = self._types.get(machine_type)
+        if index is None:
+            index = self._types[machine_type] = _TypeIndex(self._rank)
+        words = title.split()
+        for start in range(len(words)):
+            index.trie.insert(" ".join(words[start:]), id)
+        grams = trigrams(title)
+        index.sizes[id] = len(grams)
+        for gram in grams:
+            index.grams.setdefault(gram, []).append(id)
+
+    def drop_game(self, game, previous=None):
+        """
+        Stops suggesting a game; previous holds its old title or type if
+        they changed since it was indexed. Its keys leave the trie at once;
+        its id is skipped in the trigram lists, which are compacted once
+        the dropped ids are many, so no search ever rebuilds the index.
+        """
+        id = self._ids.pop(game, None)
+        if id is None:
+            return
+        previous = previous or {}
+        machine_type = previous.get("_type", game._type).lower()
+        title = self._titles[id]
+        index = self._types[machine_type]
+        words = title.split()
+        for start in range(len(words)):
+            index.trie.remove(" ".join(words[start:]), id)
+        del index.sizes[id]
+        self._games[id] = self._titles[id] = None
+        self._dead += 1
+        key = (machine_type, title)
+        if self._by_title.get(key) is game:
+            del self._by_title[key]
+            # Another game with the same title takes its place
+            for other in index.trie.suggest(title, TOP_K):
+                if self._titles[other] == title:
+                    self._by_title[key] = self._games[other]
+                    break
+        if self._dead > max(64, len(self._ids) // 4):
+            self._compact()
+
+    def _compact(self):
+        """Clears the dropped ids from the trigram lists."""
+        games = self._games
+        for index in self._types.values():
+            grams = index.grams
+            for gram, ids in list(grams.items()):
+                ids[:] = [id for id in ids if games[id] is not None]
+                if not ids:
+                    del grams[gram]
+        self._dead = 0
+
+    def by_title(self, machine_type, title):
+        """Returns the game of a machine type with a title (however it is typed), or None."""
+        return self._by_title.get((machine_type.lower(), normalize_title(title)))
+
+    def complete(self, machine_type, prefix, k=5):
+        """Returns up to k games of a machine type whose title, or a word of it onwards, starts with prefix."""
+        index = self._types.get(machine_type.lower())
+        prefix = normalize_title(prefix)
+        if index is None or not prefix:
+            return []
+        games = self._games
+        return [games[id] for id in index.trie.suggest(prefix, k)]
+
+    def fuzzy(self, machine_type, text, k=5):
+        """
+        Returns up to k games of a machine type with the titles most similar
+        to text (by shared trigrams), for misspelled titles.
+        """
+        index = self._types.get(machine_type.lower())
+        text = normalize_title(text)
+        if index is None or not text:
+            return []
+        # Trigrams shared by many titles say little about the title meant, so
+        # only the rarest trigrams of the query are counted, up to SCAN_BUDGET
+        # ids; the best candidates are then scored with all their trigrams.
+        query = trigrams(text)
+        counted = []
+        scanned = 0
+        for ids in sorted((index.grams.get(gram, ()) for gram in query), key=len):
+            if scanned + len(ids) > SCAN_BUDGET:
+                if scanned:
+                    break
+                ids = ids[:SCAN_BUDGET]  # Even the rarest trigram is common: its first titles only
+            scanned += len(ids)
+            counted.append(ids)
+        shared = Counter(chain.from_iterable(counted))  # Counted in C, not id by id
+        if self._dead:
+            games = self._games
+            for id in [id for id in shared if games[id] is None]:
+                del shared[id]
+        sizes, titles = index.sizes, self._titles
+        size = len(query)
+        scored = []
+        for id, _ in shared.most_common(CANDIDATES):
+            # A trigram of the query is one of the title if it is a substring
+            # of the padded title, so no set is built per candidate
+            padded = f"  {titles[id]} "
+            common = sum(gram in padded for gram in query)
+            similarity = 2 * common / (size + sizes[id])
+            if similarity >= MIN_SIMILARITY:
+                scored.append((similarity, id))
+        return [self._games[id] for _, id in heapq.nlargest(k, scored)]
+
+    def suggest(self, machine_type, text, k=5):
+        """Returns up to k games for text: the completions of the title, then the fuzzy matches."""
+        games = self.complete(machine_type, text, k)
+        if len(games) < k:
+            games += [game for game in self.fuzzy(machine_type, text, k) if game not in games][:k - len(games)]
+        return games
+
+    def resolve(self, machine_type, text):
+        """
+        Returns the game of a machine type chosen with text: its code, its
+        full title, or a prefix that completes to a single title. None if
+        text does not choose one game.
+        """
+        game = self._catalog.by_code(text.strip())
+        if game is not None:
+            return game if game._type.lower() == machine_type.lower() else None
+        game = self.by_title(machine_type, text)
+        if game is not None:
+            return game
+        games = self.complete(machine_type, text, 2)
+        return games[0] if len(games) == 1 else None
+
+
+_default = None
+
+
+def titles():
+    """Returns the TitleIndex of Game.available_games, shared by the catalogs and the clis."""
+    global _default
+    if _default is None:
+        _default = TitleIndex()
+    return _default
+
+
+def did_you_mean(machine_type, text, k=3, index=None):
+    """
+    Returns the lines suggesting the games of a machine type for a text, or an
+    empty string. index is the TitleIndex searched (titles() by default).
+    """
+    games = (titles() if index is None else index).suggest(machine_type, text, k)
+    if not games:
+        return ""
+    return "\n".join(["Did you mean:"] + [f"- Code: {game._code}, Title: {game._title}" for game in games])
+
+
+if __name__ == "__main__":
+    # Suggestions over 100k titles of one machine type
+    import time
+    from .game_catalog import GameCatalog
+    from synthetic import games as synthetic_games
+
+    catalog = GameCatalog()
+    index = TitleIndex(catalog)
+    start = time.perf_counter()
+    catalog.extend(synthetic_games(700_000, seed=1))  # About 100k per machine type, indexed as they are appended
+    print(f"Indexed {len(catalog)} titles in {time.perf_counter() - start:.1f}s")
+    sample = catalog[12345]
+    machine_type = sample._type
+    assert index.resolve(machine_type, sample._title) is sample
+    assert index.resolve(machine_type, sample._code) is sample
+    typo = sample._title[:3] + sample._title[4:]
+    assert sample in index.fuzzy(machine_type, typo, 10), typo
+
+    queries = [game._title for game in catalog[:2000:2]]
+    for label, lookup in (("completion", lambda title: index.complete(machine_type, title[:6])),
+                          ("word completion", lambda title: index.complete(machine_type, title.split()[1][:4])),
+                          ("fuzzy (short typo)", lambda title: index.fuzzy(machine_type, "Dragn Kng")),
+                          ("fuzzy (full title)", lambda title: index.fuzzy(machine_type, title[:3] + title[4:]))):
+        start = time.perf_counter()
+        for title in queries:
+            lookup(title)
+        print(f"{label}: {(time.perf_counter() - start) / len(queries) * 1e6:.1f}us")
@@ -0,0 +1,239 @@
+"""
+This module contains the Game class and GameCatalog, the indexed registry of
+the games available in the catalog, which keeps indexes by code and by
+machine type. The code is shared by workshop-II and the original ArcadeMachine
+package (v1), and so is the catalog: the games of both are registered in
+Game.available_games, by their code as a string.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+from types import MappingProxyType
+
+
+class GameCatalog(list):
+    """
+    List of games with indexes by code and by machine type.
+
+    It is a list, so the code that iterates Game.available_games keeps
+    working, but lookups by code or machine type use the indexes. Every
+    change updates the indexes for the games it touches; only slice
+    assignments rebuild them. Attributes of a game are changed with update,
+    so the indexes and the listeners see the change.
+
+    Attributes:
+    -----------
+    version : int
+        Incremented on every change, so caches built over the catalog know
+        when they are stale.
+    """
+    def __init__(self, games=()):
+        super().__init__()
+        self._by_code = {}
+        self._by_type = {}
+        self._listeners = []
+        self.version = 0
+        self.extend(games)
+
+    def _index(self, game):
+        self._by_code[str(game._code)] = game
+        self._by_type.setdefault(game._type.lower(), []).append(game)
+
+    def _unindex(self, game):
+        code = str(game._code)
+        if self._by_code.get(code) is game:
+            del self._by_code[code]
+        machine_type = game._type.lower()
+        games = self._by_type.get(machine_type, [])
+        for index, other in enumerate(games):
+            if other is game:
+                del games[index]
+                break
+        if not games:
+            self._by_type.pop(machine_type, None)
+
+    def _notify(self, event, game=None, previous=None):
+        self.version += 1
+        for listener in self._listeners:
+            listener(event, game, previous)
+
+    def subscribe(self, listener):
+        """
+        Registers a callable notified of every change:
+        listener(event, game, previous), where event is "add", "update"
+        (previous holds the old values of the attributes changed), "remove"
+        or "reset" (game is None: the whole catalog may have changed).
+        """
+        self._listeners.append(listener)
+
+    def reindex(self):
+        """Rebuilds the indexes and notifies a reset."""
+        self._by_code = {}
+        self._by_type = {}
+        for game in self:
+            self._index(game)
+        self._notify("reset")
+
+    def update(self, game, changes):
+        """
+        Changes attributes of a game of the catalog (attribute name, such as
+        "_price_game", -> value), updating its indexes.
+
+        Returns:
+        --------
+        dict : The previous values of the attributes that changed.
+        """
+        previous = {attribute: getattr(game, attribute, None) for attribute, value in changes.items()
+                    if getattr(game, attribute, None) != value}
+        if not previous:
+            return previous
+        indexed = "_code" in previous or "_type" in previous
+        if indexed:
+            self._unindex(game)
+        for attribute in previous:
+            setattr(game, attribute, changes[attribute])
+        if indexed:
+            self._index(game)
+        self._notify("update", game, previous)
+        return previous
+
+    def append(self, game):
+        super().append(game)
+        self._index(game)
+        self._notify("add", game)
+
+    def extend(self, games):
+        for game in games:
+            self.append(game)
+
+    def __iadd__(self, games):
+        self.extend(games)
+        return self
+
+    def insert(self, index, game):
+        super().insert(index, game)
+        self._index(game)
+        self._notify("add", game)
+
+    def _removed(self, game):
+        self._unindex(game)
+        self._notify("remove", game)
+
+    def remove(self, game):
+        super().remove(game)
+        self._removed(game)
+
+    def pop(self, index=-1):
+        game = super().pop(index)
+        self._removed(game)
+        return game
+
+    def clear(self):
+        super().clear()
+        self.reindex()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            super().__setitem__(index, value)
+            self.reindex()
+            return
+        old = self[index]
+        super().__setitem__(index, value)
+        self._removed(old)
+        self._index(value)
+        self._notify("add", value)
+
+    def __delitem__(self, index):
+        games = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for game in games:
+            self._removed(game)
+
+    def by_code(self, code):
+        """Returns the game with the given code (str or int), or None."""
+        return self._by_code.get(str(code))
+
+    def codes(self):
+        """Returns a read-only mapping of code (str) -> game, the index itself: it follows every change."""
+        return MappingProxyType(self._by_code)
+
+    def by_type(self, machine_type):
+        """Returns the games of a machine type, in registration order. The list must not be modified."""
+        return self._by_type.get(machine_type.lower(), [])
+
+    def machine_types(self):
+        """Returns the machine types that have games."""
+        return list(self._by_type)
+
+
+class Game:
+    """Represents a game in the arcade catalog
+
+    Represents a game in the arcade catalog.
+
+    Class Attributes:
+    ------------------
+    available_games : GameCatalog
+        A class-level list that stores all available games in the catalog,
+        indexed by code and machine type.
+
+    Instance Attributes:
+    ----------------------
+    title : str
+        The title of the game.
+    code : str
+        A unique code associated with the game.
+    type : str
+        The type of the game, either "modern" or "retro".
+    """
+    available_games = GameCatalog()  # Available games in the catalog (Class attribute)
+
+    def __init__(self, title, code, type:str,storytelling_creator:str, graphics_creator:str, category:str, price_game: float, year:str ):
+        """Initializes a new game instance and adds it to the class-level
+        list of available games.
+        """
+        self._title = title
+        self._code = code
+        self._type = type
+        self._storytelling_creator = storytelling_creator
+        self.graphics_creator = graphics_creator
+        self._category = category
+        self._price_game = price_game
+        self._year = year
+        self.available_games.append(self)
+
+    @property
+    def title(self):
+        return self._title
+
+    @property
+    def code(self):
+        return self._code
+
+    @property
+    def type(self):
+        return self._type
+
+    @staticmethod
+    def show_available_games(machine_type):
+        """Show games compatible with the selected machine type."""
+        lines = [f"\nAvailable games for {machine_type.capitalize()} Machines:"]
+        lines += [f"- Code: {game._code}, Title: {game._title}" for game in Game.available_games.by_type(machine_type)]
+        print("\n".join(lines))  # One write for the whole listing
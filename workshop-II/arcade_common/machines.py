@@ -0,0 +1,721 @@
+"""
+This module contains the core shared by workshop-II and the original
+ArcadeMachine package (v1): the enums of the machine options, the abstract
+ArcadeMachine and its concrete machines, the builder and the factory that
+create them, and the Customer of a purchase. Both ArcadeMachine modules import
+these classes from here, so a machine built by either catalog is the same
+class and sees the same Game.available_games.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+from abc import ABC, abstractmethod
+from enum import Enum
+
+from .game_catalog import Game
+
+
+class Material(Enum):
+    """
+    Enum for arcade machine materials.
+
+    This enum defines the different types of materials available
+    for the construction of arcade machines.
+
+    """
+
+    WOOD = "Wood"
+    ALUMINUM = "Aluminum"
+    CARBON_FIBER = "Carbon Fiber"
+    
+class Glasses(Enum):
+    """
+    Enum for glasses of VirtualRealityMachine.
+
+    This enum defines the different types of glasses available
+    for glasses of VirtualRealityMachine.
+
+    """
+
+    OCULUS_RIFT = "Oculus Rift"
+    HTC_Vive = "HTC Vive"
+    VALVE_INDEX = "Valve Index"
+
+class Resolution(Enum):
+    """
+    Enum for arcade machine materials.
+
+    This enum defines the different types of materials available
+    for the construction of arcade machines.
+
+    """
+
+    FULLHD = "1920x1080"
+    QHD = "2560x1440"
+    UHD = "3840x2160"
+
+class Sound(Enum):
+    """
+    Enum for arcade machine materials.
+
+    This enum defines the different types of materials available
+    for the construction of arcade machines.
+
+    """
+
+    MONO = "mono"
+    ESTEREO = "Estereo"
+    SURROUND = "Surround"
+    
+class SimRacing(Enum):
+    """
+    Enum for arcade machine materials.
+
+    This enum defines the different types of simRacing available
+    for the construction of Racing machines.
+
+    """
+
+    PROFESIONAL = "forcefeedback steering wheel and pedals"
+    AMATEUR = "digital stering wheel and pedals"
+    STARTER = "analog stering wheel and pedals"
+
+
+class Color(Enum):
+    """
+    Enum for arcade machine colors.
+
+    This enum defines the different colors that can be applied to arcade machines.
+    applied to arcade machines and their lights.
+    """
+    MULTICOLOR = "Multicolor"
+    WHITE = "White"
+    RED = "Red"
+    BLUE = "Blue"
+    GREEN = "Green"
+    YELLOW = "Yellow"
+    PURPLE = "Purple"
+    DEFAULT = "Default"
+    BLACK = "Black"  # Colors of the v1 catalog
+    NONE = "No color"
+
+
+class ArcadeMachine(ABC):
+    """This class represents the behavior of an Arcade Machine"""
+    # Callable (dimensions, memory, processor) -> specs, set by the application
+    # that parses the spec texts (workshop-II: specs.machine_specs)
+    specs_parser = None
+
+    def __init__(self, material: Material, color: Color, lights: Color,
+                 sound: Sound, controls: str, dimensions: str,
+                 weight: float, power_consumption: float,
+                 memory: str, processor: str, base_price: float):
+        self._material = material  # Encapsulation (protected attribute)
+        self._color = color
+        self._lights = lights
+        self._sound = sound
+        self._games = []  # List for the games added to the machine
+        self._controls = controls
+        self._dimensions = dimensions
+        self._weight = weight
+        self._power_consumption = power_consumption
+        self._memory = memory
+        self._processor = processor
+        self._base_price = base_price
+        parser = self.specs_parser
+        self._specs = parser(dimensions, memory, processor) if parser else None  # Parsed once, when the machine is built
+
+    @property
+    def specs(self):
+        """The parsed MachineSpecs: volume, footprint, memory in bytes and processor tier (None without specs_parser)."""
+        return self._specs
+
+    @abstractmethod
+    def show_available_games(self):
+        """ Abstract method to display the available games for the arcade machine. """
+
+    @abstractmethod
+    def is_game_valid(self, game):
+        """ Abstract method to verify if a game is valid for this type of arcade machine. """
+
+    def add_game(self, game):
+        """ Adds a game to the list of games installed on the arcade machine. """
+        self._games.append(game)
+
+    def show_info(self):
+        return (f"Máquina Arcade:\n"
+                f"Material: {self._material.value}\n"
+                f"Color: {self._color.value}\n"
+                f"Luces: {self._lights.value}\n"
+                f"Sonido: {self._sound}\n"
+                f"Controles: {self._controls}\n"
+                f"Dimensiones: {self._dimensions}\n"
+                f"Peso: {self._weight}\n"
+                f"Consumo de energía: {self._power_consumption}\n"
+                f"Memoria: {self._memory}\n"
+                f"Procesador: {self._processor}\n"
+                f"Precio base: ${self._base_price:.2f}")
+
+class ModernArcadeMachine(ArcadeMachine):
+    """Concrete class representing a modern arcade machine.
+    
+    Inherits from:
+    --------------
+    ArcadeMachine : Abstract base class representing the general behavior of an arcade machine.
+    """
+    def __init__(self, material: Material, color: Color, lights: Color,
+                 sound: Sound, dimensions: str, weight: float,
+                 power_consumption: float, memory: str, processor: str,
+                 base_price: float):
+        """Initializes the modern arcade machine with material, color, lights, and sound system."""
+        
+        # Llamar al constructor de la clase base (ArcadeMachine)
+        super().__init__(material, color, lights, sound, controls="Modern Controls",
+                         dimensions=dimensions, weight=weight,
+                         power_consumption=power_consumption,
+                         memory=memory, processor=processor, base_price=base_price)
+
+    def show_available_games(self):
+        """
+        Returns a list of available modern games that can be played on the modern arcade machine.
+        Automatically filters the available games from the Game class by type 'modern'.
+        """
+        # Filter type games 'modern'
+        modern_games = [game.title for game in Game.available_games.by_type("modern")]
+        return modern_games
+
+    def is_game_valid(self, game):
+        """This method checks if a game is valid for this arcade machine based on its type.
+        and return true if the game is modern"""
+        return game.type.lower() == "modern"
+
+    def show_info(self):
+        """
+        Returns a string representation of the object's information, including the controls.
+        Returns:
+            str: A string representation of the object's information, including the controls.
+        """
+        return super().show_info() + f", Controls: {self._controls}"
+    
+    def __str__(self):
+        return (f"Modern Arcade Machine:\n"
+                f"Material: {self._material.value}\n"
+                f"controls: {self._controls}\n"
+                f"Color: {self._color.value}\n"
+                f"Lights: {self._lights.value}\n"
+                f"Sound: {self._sound.value}\n"
+                f"Dimensions: {self._dimensions}\n"
+                f"Weight: {self._weight}\n"
+                f"Power Consumption: {self._power_consumption}\n"
+                f"Memory: {self._memory}\n"
+                f"Processor: {self._processor}\n"
+                f"Base Price: ${self._base_price:.2f}")
+
+# Concrete class: RetroArcadeMachine (Inheritance)
+class RetroArcadeMachine(ArcadeMachine):
+    """ Represents a retro arcade machine.
+    Args:
+        material (Material): The material of the arcade machine.
+        color (Color): The color of the arcade machine.
+        lights (Color): The color of the lights on the arcade machine.
+        sound (str): The sound of the arcade machine.
+    Attributes:
+        _controls (str): The additional attribute for retro controls.
+    Methods:
+        show_available_games(): Returns a list of available games.
+        is_game_valid(game): Checks if a game is valid for the arcade machine.
+        show_info(): Returns the information about the arcade machine. """
+    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, power_consumption: float,dimensions: str, weight: float, memory: str, processor: str, base_price: float):
+        """Initializes the retro arcade machine with material, color, lights, and sound system."""
+        # Llamar al constructor de la clase base (ArcadeMachine)
+        super().__init__(material, color, lights, sound, controls="Retro Controls", 
+                         dimensions=dimensions, weight=weight, power_consumption=power_consumption, 
+                         memory=memory, processor=processor, base_price=base_price)
+    def show_available_games(self):
+        """
+        Returns a list of available modern games that can be played on the modern arcade machine.
+        Automatically filters the available games from the Game class by type 'modern'.
+        """
+        # Filter type games 'modern'
+        retro_games = [game.title for game in Game.available_games.by_type("retro")]
+        return retro_games
+
+    def is_game_valid(self, game):
+        return game.type.lower() == "retro"
+
+    def show_info(self):
+        return super().show_info() + f", Controls: {self._controls}"
+    
+class DanceRevolutionMachine(ArcadeMachine):
+    """Represents a Dance Revolution arcade machine."""
+
+    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, 
+                 dimensions: str, weight: float, power_consumption: float, 
+                 memory: str, processor: str, base_price: float, difficulties: str, 
+                 arrow_cardinalities: str, controls_price: float):
+        
+        super().__init__(material, color, lights, sound, controls="Dance Revolution Controls", 
+                         dimensions=dimensions, weight=weight, power_consumption=power_consumption, 
+                        memory=memory, processor=processor, 
+                         base_price=base_price)
+
+        self._difficulties = difficulties
+        self._arrow_cardinalities = arrow_cardinalities
+        self._controls_price = controls_price
+        
+    def show_available_games(self):
+        """
+        Returns a list of available modern games that can be played on the modern arcade machine.
+        Automatically filters the available games from the Game class by type 'modern'.
+        """
+        # Filter type games 'modern'
+        retro_games = [game.title for game in Game.available_games.by_type("dance")]
+        return retro_games
+
+    def is_game_valid(self, game):
+        return game.type.lower() == "dance"
+
+    def show_info(self):
+        return super().show_info() + f", Controls: {self._controls}"
+
+class ClassicalArcadeMachine(ArcadeMachine):
+    """ Represents a retro arcade machine.
+    Args:
+        material (Material): The material of the arcade machine.
+        color (Color): The color of the arcade machine.
+        lights (Color): The color of the lights on the arcade machine.
+        sound (str): The sound of the arcade machine.
+    Attributes:
+        _controls (str): The additional attribute for retro controls.
+    Methods:
+        show_available_games(): Returns a list of available games.
+        is_game_valid(game): Checks if a game is valid for the arcade machine.
+        show_info(): Returns the information about the arcade machine. """
+    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, dimensions: str, weight: float, power_consumption: float, memory: str, processor: str, base_price: float, make_vibration: bool, sound_record_alert:bool):
+        """Initializes the retro arcade machine with material, color, lights, and sound system."""
+        # Llamar al constructor de la clase base (ArcadeMachine)
+        super().__init__(material, color, lights, sound, controls="Classical Controls", 
+                         dimensions=dimensions, weight=weight, power_consumption= power_consumption, 
+                         memory=memory, processor=processor, base_price=base_price)
+        
+        self._make_vibration = make_vibration
+        self._sound_record_alert = sound_record_alert
+        
+    def show_available_games(self):
+        """
+        Returns a list of available modern games that can be played on the modern arcade machine.
+        Automatically filters the available games from the Game class by type 'modern'.
+        """
+        # Filter type games 'modern'
+        retro_games = [game.title for game in Game.available_games.by_type("classical")]
+        return retro_games
+
+    def is_game_valid(self, game):
+        return game.type.lower() == "classical"
+
+    def show_info(self):
+        return super().show_info() + f", Controls: {self._controls}"
+
+class ShootingMachine(ArcadeMachine):
+    """ Represents a retro arcade machine.
+    Args:
+        material (Material): The material of the arcade machine.
+        color (Color): The color of the arcade machine.
+        lights (Color): The color of the lights on the arcade machine.
+        sound (str): The sound of the arcade machine.
+    Attributes:
+        _controls (str): The additional attribute for retro controls.
+    Methods:
+        show_available_games(): Returns a list of available games.
+        is_game_valid(game): Checks if a game is valid for the arcade machine.
+        show_info(): Returns the information about the arcade machine. """
+    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, dimensions: str, weight: float, power_consumption: float, memory: str, processor: str, base_price: float, gun_color : Color):
+        """Initializes the retro arcade machine with material, color, lights, and sound system."""
+        # Llamar al constructor de la clase base (ArcadeMachine)
+        super().__init__(material, color, lights, sound, controls="Shooting Controls",
+                         dimensions=dimensions, weight=weight, power_consumption= power_consumption, 
+                         memory=memory, processor=processor, base_price=base_price)
+        self._gun_color = gun_color
+        
+        
+    def show_available_games(self):
+        """
+        Returns a list of available modern games that can be played on the modern arcade machine.
+        Automatically filters the available games from the Game class by type 'modern'.
+        """
+        # Filter type games 'modern'
+        retro_games = [game.title for game in Game.available_games.by_type("shooter")]
+        return retro_games
+
+    def is_game_valid(self, game):
+        return game.type.lower() == "shooter"
+
+    def show_info(self):
+        return super().show_info() + f", Controls: {self._controls}"
+
+
+class RacingMachine(ArcadeMachine):
+    """ Represents a retro arcade machine.
+    Args:
+        material (Material): The material of the arcade machine.
+        color (Color): The color of the arcade machine.
+        lights (Color): The color of the lights on the arcade machine.
+        sound (str): The sound of the arcade machine.
+    Attributes:
+        _controls (str): The additional attribute for retro controls.
+    Methods:
+        show_available_games(): Returns a list of available games.
+        is_game_valid(game): Checks if a game is valid for the arcade machine.
+        show_info(): Returns the information about the arcade machine. """
+    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, dimensions: str, weight: float, power_consumption: float, memory: str, processor: str, base_price: float, type_sim_racing: SimRacing, add_gearbox: bool):
+        """Initializes the retro arcade machine with material, color, lights, and sound system."""
+        # Llamar al constructor de la clase base (ArcadeMachine)
+        super().__init__(material, color, lights, sound, controls="SimRacing Controls", 
+                         dimensions=dimensions, weight=weight, power_consumption=power_consumption, 
+                         memory=memory, processor=processor, base_price=base_price)
+        self._type_sim_racing = type_sim_racing
+        self._add_gearbox = add_gearbox
+        
+        
+    def show_available_games(self):
+        """
+        Returns a list of available modern games that can be played on the modern arcade machine.
+        Automatically filters the available games from the Game class by type 'modern'.
+        """
+        # Filter type games 'modern'
+        retro_games = [game.title for game in Game.available_games.by_type("racing")]
+        return retro_games
+
+    def is_game_valid(self, game):
+        return game.type.lower() == "racing"
+
+    def show_info(self):
+        return super().show_info() + f", Controls: {self._controls}"
+    
+class VirtualRealityMachine(ArcadeMachine):
+    """ Represents a retro arcade machine.
+    Args:
+        material (Material): The material of the arcade machine.
+        color (Color): The color of the arcade machine.
+        lights (Color): The color of the lights on the arcade machine.
+        sound (str): The sound of the arcade machine.
+    Attributes:
+        _controls (str): The additional attribute for retro controls.
+    Methods:
+        show_available_games(): Returns a list of available games.
+        is_game_valid(game): Checks if a game is valid for the arcade machine.
+        show_info(): Returns the information about the arcade machine. """
+    def __init__(self, material: Material, color: Color, lights: Color, sound: Sound, dimensions: str, weight: float, power_consumption: float, memory: str, processor: str, base_price: float, glasses_type: Glasses, glasses_resolution: Resolution, glasses_price: float):
+        """Initializes the retro arcade machine with material, color, lights, and sound system."""
+        # Llamar al constructor de la clase base (ArcadeMachine)
+        super().__init__(material, color, lights, sound, controls="VR Glasses", 
+                         dimensions=dimensions, weight=weight, power_consumption=power_consumption, 
+                         memory=memory, processor=processor, base_price=base_price)
+        self._glasses_type = glasses_type
+        self._glasses_resolution = glasses_resolution
+        self._glasses_price = glasses_price
+        
+        
+    def show_available_games(self):
+        """
+        Returns a list of available modern games that can be played on the modern arcade machine.
+        Automatically filters the available games from the Game class by type 'modern'.
+        """
+        # Filter type games 'modern'
+        retro_games = [game.title for game in Game.available_games.by_type("vr")]
+        return retro_games
+
+    def is_game_valid(self, game):
+        return game.type.lower() == "vr"
+
+    def show_info(self):
+        return super().show_info() + f", Controls: {self._controls}"
+
+
+# Machine type names used by the cli and the catalog, mapped to their classes
+MACHINE_TYPES = {
+    "modern": ModernArcadeMachine,
+    "retro": RetroArcadeMachine,
+    "dance": DanceRevolutionMachine,
+    "classical": ClassicalArcadeMachine,
+    "shooter": ShootingMachine,
+    "racing": RacingMachine,
+    "vr": VirtualRealityMachine
+}
+
+
+# Multipliers of each material over (weight, power consumption, price)
+MATERIAL_INCREASES = {
+    Material.WOOD: (1.1, 1.15, 1.05),
+    Material.ALUMINUM: (0.95, 1.0, 1.10),
+    Material.CARBON_FIBER: (0.85, 0.9, 1.20)
+}
+
+
+def machine_type_of(machine):
+    """Returns the machine type name (as used in MACHINE_TYPES) of a machine instance."""
+    for name, machine_class in MACHINE_TYPES.items():
+        if type(machine) is machine_class:
+            return name
+    raise ValueError("Tipo de máquina no válido.")
+
+
+class ArcadeMachineBuilder:
+    # Initial attributes; those set only for some machine types are not in it, so reset removes them
+    _INITIAL = {
+        "_material": Material.WOOD,
+        "_color": Color.DEFAULT,
+        "_lights": Color.DEFAULT,
+        "_sound": Sound.MONO,
+        # Inicializar atributos de la máquina
+        "_dimensions": "",
+        "_weight": 0,
+        "_power_consumption": 0,
+        "_memory": "",
+        "_processor": "",
+        "_base_price": 0,
+        "_increase_weight": 1.0,
+        "_increase_power": 1.0,
+        "_increase_price": 1.0
+    }
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Returns the builder to its initial state, removing the attributes set
+        only for some machine types.
+        """
+        attributes = self.__dict__
+        attributes.clear()
+        attributes.update(self._INITIAL)
+        return self
+
+    def set_attributes(self, defaults):
+        """Configura los atributos de la máquina con los valores predeterminados."""
+        self._dimensions = defaults['dimensions']
+        self._weight = defaults['weight']
+        self._power_consumption = defaults['power_consumption']
+        self._memory = defaults['memory']
+        self._processor = defaults['processor']
+        self._base_price = defaults['base_price']
+            
+    def set_increases(self, increase_weight: float, increase_power: float, increase_price: float):
+        """Configura los multiplicadores del material sobre el peso, el consumo y el precio.
+
+        The multipliers are kept apart from the base values and applied when the
+        machine is built, so calling this method again, or before set_attributes,
+        does not compound them.
+        """
+        self._increase_weight = increase_weight  # Aumentar el peso
+        self._increase_power = increase_power  # Aumentar el consumo de energía
+        self._increase_price = increase_price  # Aumentar el precio
+        return self
+
+    @classmethod
+    def from_config(cls, config):
+        """Creates a builder loaded with the values of a MachineConfig."""
+        builder = cls()
+        for field, value in config.values().items():
+            setattr(builder, "_" + field, value)
+        return builder
+
+
+    def set_material(self, material: Material):
+        self._material = material
+        return self
+
+    def set_color(self, color: Color):
+        self._color = color
+        return self
+
+    def set_lights(self, lights: Color):
+        self._lights = lights
+        return self
+
+    def set_sound(self, sound: Sound):
+        self._sound = sound
+        return self
+
+    def set_controls(self, controls: str):
+        self._controls = controls
+        return self
+
+    def set_dimensions(self, dimensions: str):
+        self._dimensions = dimensions
+        return self
+
+    def set_weight(self, weight: float):
+        self._weight = weight
+        return self
+
+    def set_power_consumption(self, power_comsumption: float):
+        self._power_consumption = power_comsumption
+        return self
+
+    def set_memory(self, memory: str):
+        self._memory = memory
+        return self
+
+    def set_processor(self, processor: str):
+        self._processor = processor
+        return self
+
+    def set_base_price(self, price: float):
+        self._base_price = price
+        return self
+    
+    def build_modern(self) -> ModernArcadeMachine:
+        return ModernArcadeMachine(self._material, self._color, self._lights,
+                                   self._sound, self._dimensions,
+                                   self._weight * self._increase_weight, self._power_consumption * self._increase_power,
+                                   self._memory, self._processor, self._base_price * self._increase_price)
+        
+    def build_retro(self) -> RetroArcadeMachine:
+        return RetroArcadeMachine(self._material, self._color, self._lights,
+                                   self._sound, dimensions=self._dimensions,
+                                   weight=self._weight * self._increase_weight,
+                                   power_consumption=self._power_consumption * self._increase_power,
+                                   memory=self._memory, processor=self._processor,
+                                   base_price=self._base_price * self._increase_price)
+    # Dance Revolution Machine setter
+    def set_difficulties(self, difficulties: str):
+        self._difficulties = difficulties
+        return self
+    
+    def set_arrow_cardinalities(self, arrow_cardinalities: str):
+        self._arrow_cardinalities = arrow_cardinalities
+        return self
+    
+    def set_controls_price(self, controls_price: float):
+        self._controls_price = controls_price
+        return self
+    
+    def build_dance(self) -> DanceRevolutionMachine:
+        return DanceRevolutionMachine(self._material, self._color, self._lights,
+                                   self._sound, self._dimensions,
+                                   self._weight * self._increase_weight, self._power_consumption * self._increase_power,
+                                   self._memory, self._processor, self._base_price * self._increase_price, self._difficulties, self._arrow_cardinalities , self._controls_price)
+    # Classical Machine Setter
+    def set_make_vibration(self, make_vibration: bool):
+        self._make_vibration = make_vibration
+        return self
+    def set_sound_record_alert(self, sound_record_alert: bool):
+        self._sound_record_alert = sound_record_alert
+        return self
+    
+    def build_classical(self) -> ClassicalArcadeMachine:
+        return ClassicalArcadeMachine(self._material, self._color, self._lights,
+                                   self._sound, self._dimensions,
+                                   self._weight * self._increase_weight, self._power_consumption * self._increase_power,
+                                   self._memory, self._processor, self._base_price * self._increase_price, self._make_vibration, self._sound_record_alert)
+    # Shooting Machine Setter
+    
+    def set_gun_color(self, gun_color: Color):
+        self._gun_color = gun_color
+        return self
+    
+    def build_shooting(self) -> ShootingMachine:
+        return ShootingMachine(self._material, self._color, self._lights,
+                                   self._sound, self._dimensions,
+                                   self._weight * self._increase_weight, self._power_consumption * self._increase_power,
+                                   self._memory, self._processor, self._base_price * self._increase_price, self._gun_color)
+    # Racing Machine Setter
+    
+    def set_type_sim_racing(self, type_sim_racing: SimRacing):
+        self._type_sim_racing = type_sim_racing
+        return self
+    
+    def set_add_gearbox(self, add_gearbox: bool):
+        self._add_gearbox = add_gearbox
+        return self
+    
+    def build_racing(self) -> RacingMachine:
+        return RacingMachine(self._material, self._color, self._lights,
+                                   self._sound, self._dimensions,
+                                   self._weight * self._increase_weight, self._power_consumption * self._increase_power,
+                                   self._memory, self._processor, self._base_price * self._increase_price, self._type_sim_racing, self._add_gearbox)
+    # Virtual Reality Machine Setter
+    def set_glasses_type(self, glasses_type: Glasses):
+        self._glasses_type = glasses_type
+        return self
+    
+    def set_glasses_resolution(self, glasses_resolution: Resolution):
+        self._glasses_resolution = glasses_resolution
+        return self
+    
+    def glasses_price(self, glasses_price: float):
+        self._glasses_price = glasses_price
+        return self
+    
+    def build_vr(self) -> VirtualRealityMachine:
+        return VirtualRealityMachine(self._material, self._color, self._lights,
+                                   self._sound, self._dimensions,
+                                   self._weight * self._increase_weight, self._power_consumption * self._increase_power,
+                                   self._memory, self._processor, self._base_price * self._increase_price, self._glasses_type, self._glasses_resolution, self._glasses_price)
+    
+class ArcadeMachineFactory:
+    """Clase Factory para crear máquinas arcade."""
+    @staticmethod
+    def create_arcade_machine(machine_type, builder):
+        if machine_type == "modern":
+            return builder.build_modern()
+        elif machine_type == "retro":
+            return builder.build_retro()
+        elif machine_type == "classical":
+            return builder.build_classical()
+        elif machine_type == "dance":
+            return builder.build_dance()
+        elif machine_type == "shooter":
+            return builder.build_shooting()
+        elif machine_type == "racing":
+            return builder.build_racing()
+        elif machine_type == "vr":
+            return builder.build_vr()
+        else:
+            raise ValueError("Tipo de máquina no válido.")
+# Client Class
+class Customer:
+    """
+    Represents a customer with their personal information.
+
+    Attributes:
+    -----------
+    name : str
+        The name of the customer.
+    address : str
+        The address of the customer.
+    phone : str
+        The phone number of the customer.
+
+    """
+    def __init__(self, name, address, phone):
+        """Initializes a new customer with the specified name, address, and phone number."""
+        self.name = name
+        self.address = address
+        self.phone = phone
+
+
+    def __str__(self):
+        """Returns a string representation of the customer, including their name,
+        address, and phone number.
+        """
+        return f"Customer: {self.name}, Address: {self.address}, Phone: {self.phone}"
@@ -0,0 +1,185 @@
+"""
+This module contains the text search shared by the searches of the catalog:
+the normalization of names and titles, so accents, case and spacing do not
+matter, and the burst prefix trie behind the type-ahead suggestions of
+customers and game titles.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import heapq
+import unicodedata
+
+TOP_K = 10  # Suggestions kept at every node of the tries
+BURST = 64  # Keys of a leaf of the tries before it is split
+
+
+def normalize_name(name):
+    """Returns a name without accents, in lower case and with single spaces."""
+    text = unicodedata.normalize("NFKD", name or "")
+    if not text.isascii():
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.casefold().split())
+
+
+class _Node:
+    """
+    Node of a PrefixTrie. A leaf keeps the (key, id) of its whole subtree in
+    entries; an inner node has children by character, keeps in entries only
+    the keys that end at it, and keeps in top the (rank, id) of the best ids
+    of its subtree. Only the rank of the id updated changes, so the ranks in
+    top are never stale.
+    """
+    __slots__ = ("children", "entries", "top")
+
+    def __init__(self):
+        self.children = None
+        self.entries = []
+        self.top = []
+
+
+class PrefixTrie:
+    """
+    Burst trie of keys for type-ahead suggestions.
+
+    Leaves hold up to BURST keys and are split into children when they grow
+    beyond it, so the trie has few nodes even with millions of keys. Inner
+    nodes keep the TOP_K best ids of their subtree, so a suggestion is a walk
+    down the prefix and either a copy of that list or a scan of one leaf.
+
+    Parameters:
+    -----------
+    rank : callable
+        Returns the rank of an id (smaller is better). Ranks may only improve;
+        call update when they do.
+    """
+    def __init__(self, rank, top_k=TOP_K, burst=BURST):
+        self._rank = rank
+        self._top_k = top_k
+        self._burst = burst
+        self._root = _Node()
+
+    def insert(self, key, id):
+        """Adds a key of an id."""
+        node, depth, length = self._root, 0, len(key)
+        top_k = self._top_k
+        rank = self._rank(id)
+        children = node.children
+        while children is not None:
+            top = node.top
+            if len(top) < top_k or rank < top[-1][0]:
+                self._offer(node, id, rank)
+            if depth == length:
+                break
+            char = key[depth]
+            node = children.get(char)
+            if node is None:
+                node = children[char] = _Node()
+            children, depth = node.children, depth + 1
+        node.entries.append((key, id))
+        if node.children is None and len(node.entries) > self._burst:
+            self._split(node, depth)
+
+    def update(self, key, id):
+        """Updates the suggestions after the rank of the id of a key improved."""
+        node, depth = self._root, 0
+        rank = self._rank(id)
+        while node is not None and node.children is not None:
+            self._offer(node, id, rank)
+            if depth == len(key):
+                break
+            node, depth = node.children.get(key[depth]), depth + 1
+
+    def remove(self, key, id):
+        """
+        Removes a key of an id. The nodes whose suggestions kept the id are
+        filled again from their children, from the deepest up, so the
+        suggestions never hold removed ids.
+        """
+        path = []
+        node, depth = self._root, 0
+        while node.children is not None:
+            path.append(node)
+            if depth == len(key):
+                break
+            node, depth = node.children.get(key[depth]), depth + 1
+            if node is None:
+                return
+        try:
+            node.entries.remove((key, id))
+        except ValueError:
+            return
+        for node in reversed(path):
+            if all(other != id for _, other in node.top):
+                break  # Nor do the nodes above keep it
+            node.top = self._best(node)
+
+    def _best(self, node):
+        ids = {id for _, id in node.entries}
+        for child in node.children.values():
+            ids.update(id for _, id in (child.entries if child.children is None else child.top))
+        rank = self._rank
+        return heapq.nsmallest(self._top_k, [(rank(id), id) for id in ids])
+
+    def suggest(self, prefix, k=5):
+        """Returns up to k ids (at most TOP_K) of keys starting with prefix, best ranked first."""
+        k = min(k, self._top_k)
+        node, depth = self._root, 0
+        while node.children is not None and depth < len(prefix):
+            node = node.children.get(prefix[depth])
+            if node is None:
+                return []
+            depth += 1
+        if node.children is not None:  # Every key below the node starts with prefix
+            return [id for _, id in node.top[:k]]
+        return heapq.nsmallest(k, {id for key, id in node.entries if key.startswith(prefix)}, key=self._rank)
+
+    def _offer(self, node, id, rank):
+        top = node.top
+        for index, (_, other) in enumerate(top):
+            if other == id:
+                top[index] = rank, id
+                break
+        else:
+            if len(top) < self._top_k:
+                top.append((rank, id))
+            elif rank < top[-1][0]:
+                top[-1] = rank, id
+            else:
+                return
+        top.sort()
+
+    def _split(self, node, depth):
+        entries = node.entries
+        node.entries = []
+        node.children = {}
+        for entry in entries:
+            key = entry[0]
+            if len(key) == depth:
+                node.entries.append(entry)
+                continue
+            child = node.children.get(key[depth])
+            if child is None:
+                child = node.children[key[depth]] = _Node()
+            child.entries.append(entry)
+        node.top = heapq.nsmallest(self._top_k, {(self._rank(id), id) for _, id in entries})
+        for child in node.children.values():
+            if len(child.entries) > self._burst:
+                self._split(child, depth + 1)
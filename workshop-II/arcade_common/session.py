@@ -0,0 +1,377 @@
+"""
+This module contains the resumable sessions of the interactive catalogs. A
+flow is a list of steps (machine type, material, colors, games, customer...);
+a Session records the current step and the answers given, and is saved
+compactly to disk after every answer. Sessions idle for longer than a timeout
+are abandoned and evicted, so a kiosk process can serve the next customer
+instead of waiting forever on an abandoned terminal.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import json
+import os
+import sys
+import tempfile
+import time
+
+DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), "arcade_sessions")  # A directory per app inside it
+
+STAY = object()  # Returned by a parse function that handled the answer without storing a value
+
+
+class Step:
+    """
+    A step of an interactive flow.
+
+    Attributes:
+    -----------
+    name : str
+        The key of the answer in the session data.
+    prompt : str or callable
+        The text shown to the user, or a function of the session data that returns it.
+    parse : callable
+        Receives (text, data) and returns the value stored, or raises
+        ValueError with the message shown to the user. It returns STAY when
+        the answer only changed the session data (for example the page shown).
+    repeat : bool
+        The step collects a list of values until the user gives an empty answer.
+    when : callable, optional
+        Receives the session data; the step is skipped when it returns False.
+    """
+    def __init__(self, name, prompt, parse, repeat=False, when=None):
+        self.name = name
+        self.prompt = prompt
+        self.parse = parse
+        self.repeat = repeat
+        self.when = when
+
+
+class Session:
+    """
+    State of an interactive flow: the index of the current step and the answers.
+
+    Attributes:
+    -----------
+    id : str
+        The name of the session (for a kiosk, the name of the kiosk).
+    step : int
+        The index of the current step.
+    data : dict
+        The answers given so far (JSON values).
+    updated : float
+        The time of the last answer.
+    app : str
+        The name of the flow that wrote the session (its steps), so a flow
+        never resumes the answers of another one.
+    """
+    def __init__(self, id, step=0, data=None, updated=None, app=None):
+        self.id = id
+        self.step = step
+        self.data = data if data is not None else {}
+        self.updated = updated if updated is not None else time.time()
+        self.app = app
+
+    def dumps(self):
+        """Returns the compact JSON text of the session."""
+        return json.dumps({"i": self.id, "a": self.app, "s": self.step, "d": self.data,
+                           "u": round(self.updated, 3)}, separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, text):
+        """Creates a session from the text written by dumps."""
+        value = json.loads(text)
+        return cls(value["i"], value["s"], value["d"], value["u"], value.get("a"))
+
+
+class SessionStore:
+    """
+    Saves sessions as small JSON files in a directory.
+
+    Attributes:
+    -----------
+    directory : str
+        The directory of the session files (by default DEFAULT_DIRECTORY/app).
+    idle_timeout : float
+        Seconds without answers after which a session is abandoned.
+    app : str
+        The name of the flow of the sessions. Sessions are saved with it, and
+        a saved session of another app is deleted instead of being loaded.
+    """
+    def __init__(self, directory=None, idle_timeout=300, app=None):
+        self.app = app
+        self.directory = directory or (os.path.join(DEFAULT_DIRECTORY, app) if app else DEFAULT_DIRECTORY)
+        self.idle_timeout = idle_timeout
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, session_id):
+        return os.path.join(self.directory, f"{session_id}.json")
+
+    def save(self, session):
+        """Writes a session; the file is replaced atomically."""
+        session.app = self.app
+        path = self._path(session.id)
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(session.dumps())
+        os.replace(temporary, path)
+
+    def load(self, session_id, now=None):
+        """
+        Returns the saved session, or None if there is none, it expired or it
+        was written by another app (it is then deleted).
+        """
+        try:
+            with open(self._path(session_id), encoding="utf-8") as file:
+                session = Session.loads(file.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            self.delete(session_id)  # Unreadable: it would fail again on every start
+            return None
+        if session.app != self.app or self.expired(session, now):
+            self.delete(session_id)
+            return None
+        return session
+
+    def delete(self, session_id):
+        """Deletes a saved session."""
+        try:
+            os.remove(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def expired(self, session, now=None):
+        """Checks if a session has been idle for longer than the timeout."""
+        return (now if now is not None else time.time()) - session.updated > self.idle_timeout
+
+    def evict_idle(self, now=None):
+        """Deletes every saved session idle for longer than the timeout and returns how many."""
+        now = now if now is not None else time.time()
+        evicted = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if now - os.path.getmtime(path) > self.idle_timeout:
+                    os.remove(path)
+                    evicted += 1
+            except OSError:
+                continue
+        return evicted
+
+
+class SessionMachine:
+    """
+    Runs a flow of steps over a session.
+
+    The machine does no input or output itself: prompt() returns the text of
+    the current step and answer() applies the user's answer, so the same flow
+    can be driven by a terminal, a kiosk loop or a test.
+    """
+    def __init__(self, steps):
+        self.steps = steps
+
+    def _skip(self, session):
+        while session.step < len(self.steps):
+            step = self.steps[session.step]
+            if step.when is None or step.when(session.data):
+                return
+            session.step += 1
+
+    def finished(self, session):
+        """Checks if every step of the session has been answered."""
+        self._skip(session)
+        return session.step >= len(self.steps)
+
+    def valid(self, session):
+        """
+        Checks if a saved session can be resumed by this flow: every answer
+        stored is accepted again by the parse function of its step (bools as
+        'y'/'n', other values as their text) and gives the same value.
+        """
+        data = session.data
+        if not isinstance(data, dict) or not isinstance(session.step, int) or \
+                not 0 <= session.step <= len(self.steps):
+            return False
+        try:
+            for step in self.steps:
+                if step.name not in data:
+                    continue
+                values = data[step.name]
+                if step.repeat:
+                    if not isinstance(values, list):
+                        return False
+                else:
+                    values = [values]
+                for value in values:
+                    text = ("y" if value else "n") if isinstance(value, bool) else str(value)
+                    if step.parse(text, data) != value:
+                        return False
+        except (ValueError, TypeError, AttributeError, KeyError, IndexError):
+            return False
+        return True
+
+    def resume(self, store, session_id):
+        """
+        Returns the saved session of session_id when this flow can resume
+        it, otherwise a new session (an invalid saved one is deleted).
+        """
+        session = store.load(session_id)
+        if session is not None and self.valid(session):
+            return session
+        if session is not None:
+            store.delete(session_id)
+        return Session(session_id)
+
+    def current(self, session):
+        """Returns the current Step, or None when the flow is finished."""
+        return None if self.finished(session) else self.steps[session.step]
+
+    def prompt(self, session):
+        """Returns the text of the current step."""
+        step = self.current(session)
+        if step is None:
+            return ""
+        return step.prompt(session.data) if callable(step.prompt) else step.prompt
+
+    def answer(self, session, text):
+        """
+        Applies an answer to the current step.
+
+        Returns:
+        --------
+        str : The error message when the answer is not valid, otherwise None.
+        """
+        step = self.current(session)
+        if step is None:
+            return None
+        session.updated = time.time()
+        text = text.strip()
+        if step.repeat and not text:
+            session.data.setdefault(step.name, [])
+            session.step += 1
+            return None
+        try:
+            value = step.parse(text, session.data)
+        except ValueError as error:
+            return str(error)
+        if value is STAY:
+            return None
+        if step.repeat:
+            session.data.setdefault(step.name, []).append(value)
+        else:
+            session.data[step.name] = value
+            session.step += 1
+        return None
+
+    def run(self, session, store, read=None, write=print):
+        """
+        Runs the flow until it is finished or the user is idle for too long.
+
+        The session is saved after every answer, so a restarted process can
+        resume it while it has not expired.
+
+        Parameters:
+        -----------
+        read : callable
+            Receives (prompt, timeout) and returns the answer, or None on timeout.
+        write : callable
+            Shows messages to the user.
+
+        Returns:
+        --------
+        bool : True when the flow was finished, False when the session was abandoned.
+        """
+        read = read or timed_input
+        while not self.finished(session):
+            text = read(self.prompt(session), store.idle_timeout)
+            if text is None:
+                store.delete(session.id)
+                return False
+            message = self.answer(session, text)
+            if message:
+                write(message)
+            store.save(session)
+        store.delete(session.id)
+        return True
+
+
+def timed_input(prompt, timeout):
+    """
+    Reads a line from standard input, waiting at most timeout seconds.
+
+    Returns None on timeout and raises EOFError at the end of the input. On
+    platforms where standard input cannot be polled it waits without limit.
+    """
+    print(prompt, end="", flush=True)
+    try:
+        import select
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+    except (ImportError, OSError, ValueError):
+        ready = [sys.stdin]  # select does not support consoles on Windows
+    if not ready:
+        print()
+        return None
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+
+def choice(options, message):
+    """Returns a parse function that accepts one of the options (case-insensitive)."""
+    def parse(text, data):
+        value = text.lower()
+        if value not in options:
+            raise ValueError(message)
+        return value
+    return parse
+
+
+def number(options, message):
+    """Returns a parse function that accepts the number of one of the options."""
+    def parse(text, data):
+        try:
+            value = int(text)
+        except ValueError:
+            raise ValueError(message) from None
+        if value not in options:
+            raise ValueError(message)
+        return value
+    return parse
+
+
+def yes_no(text, data):
+    """Parses a y/n answer."""
+    value = text.lower()
+    if value not in ("y", "n"):
+        raise ValueError("Invalid input. Please enter 'y' or 'n'.")
+    return value == "y"
+
+
+def text(message):
+    """Returns a parse function that accepts any non-empty text."""
+    def parse(value, data):
+        if not value:
+            raise ValueError(message)
+        return value
+    return parse
@@ -0,0 +1,326 @@
+"""
+This module contains the change feed of the game catalog. A CatalogFeed is
+the publisher: it listens to its GameCatalog, so every game added, updated or
+removed (through the feed, Game() or the catalog itself) becomes a delta with
+a monotonically increasing version. A CatalogReplica, on every storefront node,
+pulls the deltas after the version it has and applies them to its running
+GameCatalog without reloading it. A FeedLog file can be used as the transport
+between processes.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import json
+import os
+
+from arcade_common.game_catalog import Game
+
+# Short names of the Game attributes in the deltas
+FIELDS = {
+    "t": "_title", "c": "_code", "y": "_type", "s": "_storytelling_creator",
+    "g": "graphics_creator", "k": "_category", "p": "_price_game", "a": "_year"
+}
+_SHORT = {attribute: short for short, attribute in FIELDS.items()}
+
+
+def _game_fields(game):
+    return {short: getattr(game, attribute) for short, attribute in FIELDS.items()}
+
+
+def _new_game(fields):
+    """Creates a game from delta fields without registering it in Game.available_games."""
+    game = Game.__new__(Game)
+    for short, attribute in FIELDS.items():
+        setattr(game, attribute, fields.get(short))
+    return game
+
+
+class CatalogFeed:
+    """
+    Publishes the changes of a game catalog as versioned deltas.
+
+    A delta is a small dictionary: {"v": version, "op": "add" | "update" |
+    "remove" | "reset", "c": game code, "f": fields}. Updates only carry the
+    fields that changed, and the code of the game before the update. The
+    last `log_limit` deltas are kept; a replica that is further behind
+    receives a single "reset" delta with the whole catalog.
+
+    The feed subscribes to the catalog and publishes its changes, whoever
+    makes them. A feed created over a catalog that already has games
+    publishes them first as a "reset". With a FeedLog, the versions continue
+    from the last one in the file, so a restarted publisher never reissues
+    versions the replicas already applied.
+
+    Attributes:
+    -----------
+    version : int
+        The version of the last change.
+    """
+    def __init__(self, catalog=None, log_limit=100_000, log=None):
+        """
+        Initializes the feed.
+
+        Parameters:
+        -----------
+        catalog : GameCatalog
+            The catalog published (Game.available_games by default).
+        log_limit : int
+            The number of deltas kept in memory.
+        log : FeedLog, optional
+            A file where every delta is also written.
+        """
+        self._catalog = Game.available_games if catalog is None else catalog
+        self._log_limit = log_limit
+        self._deltas = []
+        self._file = log
+        self.version = log.last_version() if log is not None else 0
+        self._catalog.subscribe(self._changed)
+        if self._catalog:
+            self._changed("reset")
+
+    def _changed(self, event, game=None, previous=None):
+        if event == "add":
+            self._publish({"op": "add", "c": game._code, "f": _game_fields(game)})
+        elif event == "update":
+            fields = {_SHORT[attribute]: getattr(game, attribute) for attribute in previous if attribute in _SHORT}
+            if fields:
+                self._publish({"op": "update", "c": previous.get("_code", game._code), "f": fields})
+        elif event == "remove":
+            self._publish({"op": "remove", "c": game._code})
+        else:
+            self._publish({"op": "reset", "games": [_game_fields(game) for game in self._catalog]})
+
+    def _publish(self, delta):
+        self.version += 1
+        delta["v"] = self.version
+        self._deltas.append(delta)
+        if len(self._deltas) > self._log_limit:
+            del self._deltas[:len(self._deltas) - self._log_limit]
+        if self._file is not None:
+            self._file.append([delta])
+        return delta
+
+    def add_game(self, game):
+        """
+        Adds a game to the catalog, which publishes it, and returns its delta
+        (None if the game was already in the catalog, and so published).
+        """
+        if game in self._catalog:
+            return None
+        self._catalog.append(game)
+        return self._deltas[-1]
+
+    def update_game(self, code, /, **changes):
+        """
+        Changes attributes of a game (for example price_game=0.5) and publishes them.
+
+        The keyword names are the Game attribute names without the underscore.
+        """
+        game = self._catalog.by_code(code)
+        if game is None:
+            raise KeyError(code)
+        attributes = {}
+        for name, value in changes.items():
+            attribute = name if name == "graphics_creator" else "_" + name
+            if attribute not in _SHORT:
+                raise ValueError(f"Unknown game attribute: {name}")
+            attributes[attribute] = value
+        if not self._catalog.update(game, attributes):
+            return None
+        return self._deltas[-1]  # Published by _changed
+
+    def remove_game(self, code):
+        """Removes a game from the catalog, which publishes it, and returns its delta."""
+        game = self._catalog.by_code(code)
+        if game is None:
+            raise KeyError(code)
+        self._catalog.remove(game)
+        return self._deltas[-1]
+
+    def changes_since(self, version):
+        """
+        Returns the deltas after the given version, oldest first.
+
+        When the deltas after that version are no longer kept, a single
+        "reset" delta with every game of the catalog is returned instead.
+        """
+        if version >= self.version:
+            return []
+        first = self._deltas[0]["v"] if self._deltas else self.version + 1
+        if version + 1 < first:
+            return [{"v": self.version, "op": "reset",
+                     "games": [_game_fields(game) for game in self._catalog]}]
+        return self._deltas[version + 1 - first:]
+
+
+class CatalogReplica:
+    """
+    Applies the deltas of a CatalogFeed to a running catalog.
+
+    Games are updated in place, so machines that already have a game
+    installed see its new title or price.
+
+    Attributes:
+    -----------
+    version : int
+        The version of the last delta applied.
+    """
+    def __init__(self, catalog=None, version=0):
+        self._catalog = Game.available_games if catalog is None else catalog
+        self.version = version
+
+    def apply(self, deltas):
+        """
+        Applies deltas in order, skipping those already applied.
+
+        Returns:
+        --------
+        int : The number of deltas applied.
+
+        Raises:
+        -------
+        ValueError : If a delta is missing between the replica version and the deltas.
+        """
+        applied = 0
+        catalog = self._catalog
+        for delta in deltas:
+            version = delta["v"]
+            if version <= self.version:
+                continue
+            op = delta["op"]
+            if op == "reset":
+                catalog.clear()
+                catalog.extend(_new_game(fields) for fields in delta["games"])
+            elif version != self.version + 1:
+                raise ValueError(f"Missing catalog changes between {self.version} and {version}")
+            elif op == "add":
+                catalog.append(_new_game(delta["f"]))
+            elif op == "update":
+                game = catalog.by_code(delta["c"])
+                if game is not None:
+                    catalog.update(game, {FIELDS[short]: value for short, value in delta["f"].items()})
+            elif op == "remove":
+                game = catalog.by_code(delta["c"])
+                if game is not None:
+                    catalog.remove(game)
+            self.version = version
+            applied += 1
+        return applied
+
+    def pull(self, feed):
+        """Pulls and applies the changes of a feed in the same process."""
+        return self.apply(feed.changes_since(self.version))
+
+
+class FeedLog:
+    """
+    File transport for the deltas: one compact JSON delta per line.
+
+    The publisher appends; every node remembers the byte offset it has read,
+    so polling only reads the new deltas.
+    """
+    def __init__(self, path):
+        self._path = path
+
+    def append(self, deltas):
+        """Writes deltas at the end of the file."""
+        text = "".join(json.dumps(delta, separators=(",", ":")) + "\n" for delta in deltas)
+        with open(self._path, "a", encoding="utf-8") as file:
+            file.write(text)
+            file.flush()
+
+    def last_version(self):
+        """Returns the version of the last complete delta of the file (0 if it has none)."""
+        try:
+            file = open(self._path, "rb")
+        except FileNotFoundError:
+            return 0
+        with file:
+            position = file.seek(0, os.SEEK_END)
+            tail = b""
+            while position > 0:  # Blocks from the end until the last complete line is read whole
+                size = min(65536, position)
+                position -= size
+                file.seek(position)
+                tail = file.read(size) + tail
+                end = tail.rfind(b"\n")
+                if end == -1:
+                    continue
+                start = tail.rfind(b"\n", 0, end) + 1
+                if start > 0 or position == 0:
+                    return json.loads(tail[start:end])["v"]
+        return 0
+
+    def read(self, offset=0):
+        """
+        Reads the complete deltas written after a byte offset.
+
+        Returns:
+        --------
+        tuple : (list of deltas, new offset)
+        """
+        if not os.path.exists(self._path):
+            return [], offset
+        with open(self._path, "rb") as file:
+            file.seek(offset)
+            data = file.read()
+        end = data.rfind(b"\n") + 1  # Ignore a line that is still being written
+        deltas = [json.loads(line) for line in data[:end].splitlines() if line]
+        return deltas, offset + end
+
+
+class FileReplica(CatalogReplica):
+    """A CatalogReplica that polls a FeedLog file."""
+    def __init__(self, path, catalog=None):
+        super().__init__(catalog)
+        self._log = FeedLog(path)
+        self._offset = 0
+
+    def poll(self):
+        """Applies the deltas written since the last poll and returns how many were applied."""
+        deltas, self._offset = self._log.read(self._offset)
+        return self.apply(deltas)
+
+
+if __name__ == "__main__":
+    # Convergence of a replica through a log file
+    import tempfile
+    import time
+    from arcade_common.game_catalog import GameCatalog
+
+    path = os.path.join(tempfile.mkdtemp(), "catalog.log")
+    source, target = GameCatalog(), GameCatalog()
+    feed = CatalogFeed(source, log=FeedLog(path))
+    replica = FileReplica(path, target)
+    for i in range(10_000):
+        game = _new_game({"t": f"Game {i}", "c": str(i), "y": "retro", "s": "-", "g": "-",
+                          "k": "puzzle", "p": 0.25, "a": "1990"})
+        feed.add_game(game)
+    replica.poll()
+    start = time.perf_counter()
+    for i in range(1000):
+        feed.update_game(str(i), price_game=0.5)
+    published = time.perf_counter()
+    replica.poll()
+    converged = time.perf_counter()
+    assert all(target.by_code(str(i))._price_game == 0.5 for i in range(1000))
+    print(f"1000 price changes: published in {(published - start) * 1000:.1f}ms, "
+          f"applied in {(converged - published) * 1000:.1f}ms, "
+          f"{os.path.getsize(path) / feed.version:.0f} bytes per delta on average")
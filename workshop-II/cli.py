@@ -28,143 +28,201 @@ along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
 
 # Google Doc Python: python documentation style guide
 # Doc String
-from ArcadeMachine import ArcadeMachineBuilder, ArcadeCatalog, Game, ArcadeMachineFactory
+from ArcadeMachine import ArcadeCatalog, Game, SimRacing, Glasses, Resolution, COLOR_OPTIONS, LIGHT_OPTIONS
+from arcade_common.autocomplete import titles, did_you_mean
+from customers import CustomerDirectory
+from pricing import PricingEngine, DEFAULT_RULES
+from recommender import GameRecommender
+from listing import ListingRenderer
+from memory_budget import default_budget
+from arcade_common.session import STAY, SessionMachine, SessionStore, Step, choice, number, yes_no, text
+from spec_catalog import current, reload_on_signal
+from validation import build_order
 
 
-def main():
+# Options of every enumerated step: number -> enum member (COLOR_OPTIONS and LIGHT_OPTIONS come from ArcadeMachine)
+SIM_RACING_OPTIONS = dict(enumerate(SimRacing, start=1))
+GLASSES_OPTIONS = dict(enumerate(Glasses, start=1))
+RESOLUTION_OPTIONS = dict(enumerate(Resolution, start=1))
+
+LISTING = ListingRenderer(page_size=10, columns=2)
+
+
+def _options(category, options):
+    """Returns the prompt of a numbered list of enum options."""
+    lines = [f"\n{category}:"] + [f"{number}. {member.value}" for number, member in options.items()]
+    lines.append(f"Select an option for {category}: ")
+    return "\n".join(lines)
+
+
+def _is(*machine_types):
+    return lambda data: data["machine_type"] in machine_types
+
+
+def _last(data):
+    """Checks if the machine of the session is the last one of the order."""
+    return not data["another"]
+
+
+def _quantity(answer, data):
+    try:
+        quantity = int(answer)
+    except ValueError:
+        raise ValueError("Invalid input. Please enter a number.") from None
+    if quantity < 1:
+        raise ValueError("Please enter at least 1.")
+    return quantity
+
+
+def _game_code(answer, data):
+    """
+    Accepts the code or the title (or the start of it) of a game compatible
+    with the selected machine type, or '>' / '<' to change the page.
+    """
+    if answer in (">", "<"):
+        page = data.get("page", 0) + (1 if answer == ">" else -1)
+        data["page"] = min(max(page, 0), LISTING.page_count(data["machine_type"]) - 1)
+        return STAY
+    game = titles().resolve(data["machine_type"], answer)
+    if game is None:
+        message = "Invalid game code or incompatible game for this machine type."
+        suggestions = did_you_mean(data["machine_type"], answer)
+        raise ValueError(f"{message}\n{suggestions}" if suggestions else message)
+    return game._code
+
+
+def _games_prompt(recommender):
+    def prompt(data):
+        machine_type = data["machine_type"]
+        lines = [LISTING.render_page(machine_type, data.get("page", 0)).rstrip("\n")]
+        lines.append("\nRecommended games:")
+        recommended = recommender.recommend(machine_type, k=3, installed=data.get("games", ()))
+        lines += [f"- Code: {game._code}, Title: {game._title}" for game in recommended]
+        if data.get("games"):
+            lines.append(f"\nGames added: {', '.join(data['games'])}")
+        lines.append("Enter the code or title of a game to add, '<' or '>' to change the page (empty to finish): ")
+        return "\n".join(lines)
+    return prompt
+
+
+def steps(recommender):
+    """Returns the steps of the purchase flow: machine, options of its type, games and customer."""
+    machine_types = list(current())
+    return [
+        Step("machine_type", f"Enter the type of machine you want to build ({', '.join(machine_types)}): ",
+             choice(machine_types, "Invalid machine type. Please try again.")),
+        Step("material", "Choose the material for the machine (wood/aluminum/fiber): ",
+             choice(("wood", "aluminum", "fiber"), "Invalid material. Please enter a valid material.")),
+        Step("color", _options("Colors", COLOR_OPTIONS), number(COLOR_OPTIONS, "Please select a valid option.")),
+        Step("lights", _options("Light Colors", LIGHT_OPTIONS), number(LIGHT_OPTIONS, "Please select a valid option.")),
+        Step("difficulties", "Enter the difficulties of the dance machine: ",
+             text("Please enter the difficulties."), when=_is("dance")),
+        Step("arrow_cardinalities", "Enter the arrow cardinalities of the dance machine: ",
+             text("Please enter the arrow cardinalities."), when=_is("dance")),
+        Step("make_vibration", "Would you like vibration? (y/n): ", yes_no, when=_is("classical")),
+        Step("sound_record_alert", "Would you like a sound alert on new records? (y/n): ", yes_no,
+             when=_is("classical")),
+        Step("gun_color", _options("Gun Colors", COLOR_OPTIONS), number(COLOR_OPTIONS, "Please select a valid option."),
+             when=_is("shooter")),
+        Step("type_sim_racing", _options("Sim Racing", SIM_RACING_OPTIONS),
+             number(SIM_RACING_OPTIONS, "Please select a valid option."), when=_is("racing")),
+        Step("add_gearbox", "Would you like a gearbox? (y/n): ", yes_no, when=_is("racing")),
+        Step("glasses_type", _options("Glasses", GLASSES_OPTIONS),
+             number(GLASSES_OPTIONS, "Please select a valid option."), when=_is("vr")),
+        Step("glasses_resolution", _options("Glasses Resolution", RESOLUTION_OPTIONS),
+             number(RESOLUTION_OPTIONS, "Please select a valid option."), when=_is("vr")),
+        Step("games", _games_prompt(recommender), _game_code, repeat=True),
+        Step("quantity", "How many units of this machine? ", _quantity),
+        Step("another", "Would you like to add another machine to the order? (y/n): ", yes_no),
+        Step("name", "\nEnter your name: ", text("Please enter your name."), when=_last),
+        Step("address", "Enter your address: ", text("Please enter your address."), when=_last),
+        Step("phone", "Enter your phone number: ", text("Please enter your phone number."), when=_last)
+    ]
+
+
+# Answers of a session that are not part of the order spec of a machine
+SESSION_FIELDS = ("name", "address", "phone", "page", "quantity", "another", "lines")
+
+
+def order_spec(data):
+    """Converts the answers of a machine of a session into an order spec (see validation.build_order)."""
+    spec = {key: value for key, value in data.items() if key not in SESSION_FIELDS}
+    spec["color"] = COLOR_OPTIONS[data["color"]]
+    spec["lights"] = LIGHT_OPTIONS[data["lights"]]
+    if "gun_color" in data:
+        spec["gun_color"] = COLOR_OPTIONS[data["gun_color"]]
+    if "type_sim_racing" in data:
+        spec["type_sim_racing"] = SIM_RACING_OPTIONS[data["type_sim_racing"]]
+    if "glasses_type" in data:
+        spec["glasses_type"] = GLASSES_OPTIONS[data["glasses_type"]]
+        spec["glasses_resolution"] = RESOLUTION_OPTIONS[data["glasses_resolution"]]
+        spec["glasses_price"] = 0.0  # The glasses surcharges are added by the pricing rules
+    if data["machine_type"] == "dance":
+        spec["controls_price"] = 0.0
+    return spec
+
+
+def main(kiosk="kiosk", idle_timeout=300, memory_limit=None):
     """
     Main function to interact with the arcade catalog.
     This function allows the user to select a machine type,
     view available games, add games to the machine,
     and complete the purchase by entering customer details.
+
+    Every answer is saved in a session, so the flow of a customer is resumed
+    if the process restarts, and a customer idle for longer than idle_timeout
+    seconds is abandoned so the kiosk serves the next one. It runs until the
+    end of the input.
+
+    With memory_limit (bytes), the caches of the process are evicted when the
+    catalog, the customers, the title index and the caches go over it.
     """
-    
-    catalog = ArcadeCatalog()
-    
-    # Default attributes for various machine types
-    defaults = {
-        "modern": {
-            'base_price': 1600,
-            'dimensions': '1.70mx0.8mx0.8m',
-            'weight': 80.0,  # kg as float
-            'power_consumption': 600,  # W as int
-            'memory': '8GB',
-            'processor': 'Intel Core i5'
-        },
-        "retro": {
-            'base_price': 1200,
-            'dimensions': '1.60mx0.7mx0.7m',
-            'weight': 70.0,
-            'power_consumption': 500,
-            'memory': '4GB',
-            'processor': 'Intel Core i3'
-        },
-        "dance": {
-            'base_price': 1800,
-            'dimensions': '1.80mx0.9mx0.9m',
-            'weight': 90.0,
-            'power_consumption': 700,
-            'memory': '16GB',
-            'processor': 'Intel Core i7'
-        },
-        "classical": {
-            'base_price': 1400,
-            'dimensions': '1.65mx0.75mx0.75m',
-            'weight': 75.0,
-            'power_consumption': 550,
-            'memory': '6GB',
-            'processor': 'Intel Core i4'
-        },
-        "shooter": {
-            'base_price': 2000,
-            'dimensions': '1.85mx0.95mx0.95m',
-            'weight': 95.0,
-            'power_consumption': 750,
-            'memory': '12GB',
-            'processor': 'Intel Core i7'
-        },
-        "racing": {
-            'base_price': 2200,
-            'dimensions': '2.00mx1.00mx1.00m',
-            'weight': 100.0,
-            'power_consumption': 800,
-            'memory': '16GB',
-            'processor': 'Intel Core i9'
-        },
-        "vr": {
-            'base_price': 2500,
-            'dimensions': '2.10mx1.10mx1.10m',
-            'weight': 110.0,
-            'power_consumption': 900,
-            'memory': '32GB',
-            'processor': 'Intel Core i9'
-        }
-    }
-
-    builder = ArcadeMachineBuilder()
+    customers = CustomerDirectory()
+    catalog = ArcadeCatalog(pricing=PricingEngine(DEFAULT_RULES), customers=customers)
+    budget = default_budget()
+    budget.limit = memory_limit
+    budget.track("games", Game.available_games)
+    budget.track("customers", customers)
+    budget.track("title index", titles())
+    recommender = GameRecommender(Game.available_games)
+    catalog.subscribe(recommender.record_order)
+    store = SessionStore(idle_timeout=idle_timeout, app="workshop-II")
+    store.evict_idle()
+    flow = SessionMachine(steps(recommender))
+    reload_on_signal()  # The machine specs can be changed without restarting the kiosk
 
     print("Welcome to the Arcade Machine Catalog.")
-
     while True:
+        session = flow.resume(store, kiosk)
+        try:
+            finished = flow.run(session, store)
+        except EOFError:
+            break
+        if not finished:
+            print("\nSession expired. Welcome to the Arcade Machine Catalog.")
+            continue
+
+        data = session.data
+        if data["another"]:
+            # Keep the machine as a line of the order and configure the next one
+            line = {key: value for key, value in data.items() if key not in ("lines", "another", "page")}
+            session.data = {"lines": data.get("lines", []) + [line]}
+            session.step = 0
+            store.save(session)
+            print("\nYour machine has been customized and added to your cart!")
+            continue
+
+        lines = data.get("lines", []) + [data]
         try:
-            # Prompt for machine type selection
-            machine_type = input("Enter the type of machine you want to build (modern, retro, dance, classical, shooter, racing, vr): ").lower()
-            if machine_type in defaults:
-                builder.set_attributes(defaults[machine_type])
-
-                while True:
-                    # Prompt for material selection
-                    material_option = input("Choose the material for the machine (wood/aluminum/fiber): ").lower()
-                    if material_option in ["wood", "aluminum", "fiber"]:
-                        break
-                    else:
-                        print("Invalid material. Please enter a valid material.")
-
-                # Customize material
-                material = catalog.customize_material(material_option)
-                builder.set_material(material)
-
-                # Adjust attributes based on material
-                if material.value.lower() == "wood":
-                    increase_weight = 1.1
-                    increase_price = 1.05
-                    increase_power = 1.15
-                elif material.value.lower() == "aluminum":
-                    increase_weight = 0.95
-                    increase_price = 1.10
-                    increase_power = 1.0
-                elif material.value.lower() == "fiber":
-                    increase_weight = 0.85
-                    increase_price = 1.20
-                    increase_power = 0.9
-                else:
-                    raise ValueError("Invalid material selected.")
-
-                # Set increases for the machine attributes
-                builder.set_increases(increase_weight, increase_power, increase_price)
-
-                # Customize color and lights
-                builder.set_color(catalog.customize_color(catalog.color_options()))
-                builder.set_lights(catalog.customize_light_color(catalog.light_options()))
-
-                # Create the arcade machine
-                arcade_machine = ArcadeMachineFactory.create_arcade_machine(machine_type, builder)
-                catalog._cart = arcade_machine  # Add the machine to the cart
-
-                print("\nYour machine has been customized and added to your cart!")
-                print(arcade_machine)
-                Game.show_available_games(machine_type)
-                
-
-        except ValueError:
-            print("Invalid input. Please try again.")
-
-    # Complete the purchase
-    name = input("\nEnter your name: ")
-    address = input("Enter your address: ")
-    phone = input("Enter your phone number: ")
-
-    catalog.complete_purchase(name, address, phone)
+            defaults = current()  # The same defaults for every line, even if they are reloaded meanwhile
+            machines = [build_order(order_spec(line), defaults) for line in lines]
+        except ValueError as error:  # The catalog changed while the session was saved
+            print(f"\n{error}")
+            continue
+        for machine, line in zip(machines, lines):
+            catalog.add_machine(machine, line["quantity"])
+        print("\nYour machines have been customized and added to your cart!")
+        catalog.complete_purchase(data["name"], data["address"], data["phone"])
 
 
 # Games available in the catalog (Added directly)
@@ -0,0 +1,199 @@
+"""
+This module contains MachineConfig, an immutable snapshot of the state of an
+ArcadeMachineBuilder. Configurations are persistent: a variant of a template
+only stores the fields that changed and points to its parent, so thousands of
+variants share the template instead of copying it, and two configurations can
+be compared by looking only at the fields changed since their common ancestor.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+from types import MappingProxyType
+
+from ArcadeMachine import ArcadeMachineBuilder, ArcadeMachineFactory
+
+# Builder fields stored in a configuration (builder attribute names without "_")
+FIELDS = (
+    "material", "color", "lights", "sound", "controls", "dimensions", "weight",
+    "power_consumption", "memory", "processor", "base_price",
+    "increase_weight", "increase_power", "increase_price",
+    "difficulties", "arrow_cardinalities", "controls_price",
+    "make_vibration", "sound_record_alert", "gun_color",
+    "type_sim_racing", "add_gearbox",
+    "glasses_type", "glasses_resolution", "glasses_price"
+)
+
+_MISSING = object()
+
+
+class MachineConfig:
+    """
+    Immutable configuration of an arcade machine.
+
+    A configuration is a chain of small deltas. The root holds every field
+    and each variant holds only the fields it changes. When a chain becomes
+    longer than MAX_DEPTH the new variant is flattened into a new root, so
+    lookups stay cheap.
+
+    Attributes:
+    -----------
+    _parent : MachineConfig
+        The configuration this one was derived from (None for a root).
+    _delta : dict
+        The fields set by this configuration.
+    _depth : int
+        The number of parents above this configuration.
+    """
+    MAX_DEPTH = 16
+    __slots__ = ("_parent", "_delta", "_depth", "_values")
+
+    def __init__(self, parent=None, delta=None):
+        """Initializes a configuration. Use root, from_builder or with_changes instead."""
+        unknown = set(delta or ()) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown configuration fields: {', '.join(sorted(unknown))}")
+        self._parent = parent
+        self._delta = dict(delta or {})
+        self._depth = 0 if parent is None else parent._depth + 1
+        self._values = None
+
+    def __setattr__(self, name, value):
+        if name in MachineConfig.__slots__ and getattr(self, "_values", _MISSING) is _MISSING:
+            object.__setattr__(self, name, value)
+        elif name == "_values" and getattr(self, "_values", None) is None:
+            object.__setattr__(self, name, value)  # Cache of the merged values
+        else:
+            raise AttributeError("MachineConfig is immutable")
+
+    @classmethod
+    def root(cls, **fields):
+        """Creates a configuration without parent from the given fields."""
+        return cls(None, fields)
+
+    @classmethod
+    def from_builder(cls, builder):
+        """Creates a configuration with the fields that are set on a builder."""
+        fields = {}
+        for field in FIELDS:
+            value = getattr(builder, "_" + field, _MISSING)
+            if value is not _MISSING:
+                fields[field] = value
+        return cls(None, fields)
+
+    def with_changes(self, **changes):
+        """
+        Returns a variant of this configuration with the given fields changed.
+
+        Only the changes are stored; the rest of the fields are shared with
+        this configuration.
+        """
+        if self._depth + 1 >= self.MAX_DEPTH:
+            merged = dict(self.values())
+            merged.update(changes)
+            return MachineConfig(None, merged)
+        return MachineConfig(self, changes)
+
+    def get(self, field, default=None):
+        """Returns the value of a field, looking up the chain of parents."""
+        config = self
+        while config is not None:
+            if field in config._delta:
+                return config._delta[field]
+            config = config._parent
+        return default
+
+    def values(self):
+        """Returns a read-only mapping with every field of the configuration."""
+        if self._values is None:
+            merged = dict(self._parent.values()) if self._parent is not None else {}
+            merged.update(self._delta)
+            self._values = MappingProxyType(merged)
+        return self._values
+
+    def delta(self):
+        """Returns a copy of the fields stored by this configuration itself."""
+        return dict(self._delta)
+
+    def __eq__(self, other):
+        if not isinstance(other, MachineConfig):
+            return NotImplemented
+        return self is other or not self.diff(other)
+
+    def __hash__(self):
+        return hash(tuple(sorted((field, repr(value)) for field, value in self.values().items())))
+
+    def _ancestors(self):
+        config = self
+        while config is not None:
+            yield config
+            config = config._parent
+
+    def _common_ancestor(self, other):
+        mine, theirs = self, other
+        while mine is not None and mine._depth > theirs._depth:
+            mine = mine._parent
+        while theirs is not None and theirs._depth > mine._depth:
+            theirs = theirs._parent
+        while mine is not None and mine is not theirs:
+            mine, theirs = mine._parent, theirs._parent
+        return mine
+
+    def diff(self, other):
+        """
+        Compares two configurations.
+
+        When both share an ancestor only the fields changed since that
+        ancestor are compared, so the cost depends on the size of the deltas
+        and not on the size of the configurations.
+
+        Returns:
+        --------
+        dict : Maps every different field to a tuple (value in self, value in other).
+            Fields missing in one configuration appear as None.
+        """
+        ancestor = self._common_ancestor(other)
+        if ancestor is None:
+            fields = set(self.values()) | set(other.values())
+        else:
+            fields = set()
+            for start in (self, other):
+                for config in start._ancestors():
+                    if config is ancestor:
+                        break
+                    fields.update(config._delta)
+        changes = {}
+        for field in fields:
+            mine = self.get(field, _MISSING)
+            theirs = other.get(field, _MISSING)
+            if mine is not theirs and mine != theirs:
+                changes[field] = (None if mine is _MISSING else mine,
+                                  None if theirs is _MISSING else theirs)
+        return changes
+
+    def builder(self):
+        """Returns a new ArcadeMachineBuilder loaded with this configuration."""
+        return ArcadeMachineBuilder.from_config(self)
+
+    def build(self, machine_type):
+        """Builds a machine of the given type with this configuration."""
+        return ArcadeMachineFactory.create_arcade_machine(machine_type, self.builder())
+
+    def __repr__(self):
+        return f"MachineConfig(depth={self._depth}, delta={self._delta!r})"
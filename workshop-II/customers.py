@@ -0,0 +1,204 @@
+"""
+This module contains the customer directory. The catalog used to create a new
+Customer for every purchase and forget it; the directory keeps one Customer
+per person, found by their phone number or name however they were typed
+('+57 300 123 4567' and '3001234567' are the same phone, 'José  Pérez' and
+'jose perez' the same name), and keeps the history of their orders.
+
+Names and phones are indexed in hash tables for exact lookups and in prefix
+tries for type-ahead suggestions, which rank the customers with more orders
+first.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import re
+
+from ArcadeMachine import Customer
+from arcade_common.search import PrefixTrie, normalize_name
+
+COUNTRY_CODE = "57"  # Removed from international numbers
+LOCAL_LENGTH = 10  # Digits of a local phone number
+
+_NOT_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(phone):
+    """
+    Returns the digits of a phone number, without the international prefix
+    ('+57 300-123 4567' -> '3001234567'). Also used for partial numbers typed
+    for suggestions.
+    """
+    phone = (phone or "").strip()
+    digits = _NOT_DIGITS.sub("", phone)
+    international = phone.startswith(("+", "00"))
+    if digits.startswith("00"):
+        digits = digits[2:]
+    if (international or len(digits) > LOCAL_LENGTH) and digits.startswith(COUNTRY_CODE):
+        digits = digits[len(COUNTRY_CODE):]
+    return digits
+
+
+class CustomerDirectory:
+    """
+    The customers of the catalog, deduplicated and indexed by phone and name.
+
+    A customer is the same person when the normalized phone and name match
+    (or, without a phone, the normalized name and address). Adding a repeat
+    customer returns the Customer already in the directory, with the address
+    updated to the last one given.
+    """
+    def __init__(self):
+        self._customers = []  # Id -> Customer
+        self._names = []  # Id -> normalized name
+        self._order_counts = []  # Id -> number of orders
+        self._ids = {}  # Customer -> id
+        self._by_key = {}  # Deduplication key -> id
+        self._by_phone = {}  # Normalized phone -> ids
+        self._by_name = {}  # Normalized name -> ids
+        self._orders = {}  # Id -> orders, for the customers with orders
+        self._name_trie = PrefixTrie(self._rank)
+        self._phone_trie = PrefixTrie(self._rank)
+
+    def __len__(self):
+        return len(self._customers)
+
+    def __iter__(self):
+        return iter(self._customers)
+
+    def _rank(self, id):
+        return -self._order_counts[id], self._names[id]
+
+    @staticmethod
+    def _name_keys(name):
+        """The name and the name from every later word, so 'garc' suggests 'Maria Garcia'."""
+        words = name.split()
+        return {" ".join(words[start:]) for start in range(len(words))} or {""}
+
+    def add(self, name, address, phone):
+        """
+        Adds a customer, or returns the customer already in the directory.
+
+        Returns:
+        --------
+        Customer : The customer of the directory.
+        """
+        name_key, phone_key = normalize_name(name), normalize_phone(phone)
+        key = (phone_key, name_key) if phone_key else ("", name_key, normalize_name(address))
+        id = self._by_key.get(key)
+        if id is not None:
+            customer = self._customers[id]
+            customer.address = address
+            return customer
+
+        id = len(self._customers)
+        customer = Customer(name, address, phone)
+        self._customers.append(customer)
+        self._names.append(name_key)
+        self._order_counts.append(0)
+        self._ids[customer] = id
+        self._by_key[key] = id
+        self._by_name.setdefault(name_key, []).append(id)
+        for name_prefix in self._name_keys(name_key):
+            self._name_trie.insert(name_prefix, id)
+        if phone_key:
+            self._by_phone.setdefault(phone_key, []).append(id)
+            self._phone_trie.insert(phone_key, id)
+        return customer
+
+    def _id(self, customer):
+        try:
+            return self._ids[customer]
+        except KeyError:
+            raise ValueError("The customer is not in the directory.") from None
+
+    def record_order(self, customer, order):
+        """Attaches an order (as returned by ArcadeCatalog.complete_purchase) to a customer of the directory."""
+        id = self._id(customer)
+        self._orders.setdefault(id, []).append(order)
+        self._order_counts[id] += 1
+        for name_prefix in self._name_keys(self._names[id]):
+            self._name_trie.update(name_prefix, id)
+        phone_key = normalize_phone(customer.phone)
+        if phone_key:
+            self._phone_trie.update(phone_key, id)
+
+    def history(self, customer):
+        """Returns the orders of a customer, oldest first."""
+        return list(self._orders.get(self._id(customer), ()))
+
+    def by_phone(self, phone):
+        """Returns the customers with a phone number."""
+        return [self._customers[id] for id in self._by_phone.get(normalize_phone(phone), ())]
+
+    def by_name(self, name):
+        """Returns the customers with a name."""
+        return [self._customers[id] for id in self._by_name.get(normalize_name(name), ())]
+
+    def suggest(self, text, k=5):
+        """
+        Returns up to k customers whose phone (when text has only digits and
+        phone symbols) or name (or a word of it onwards) starts with text,
+        customers with more orders first.
+        """
+        if _NOT_DIGITS.sub("", text) and not re.search(r"[^\d\s()+.-]", text):
+            ids = self._phone_trie.suggest(normalize_phone(text), k)
+        else:
+            ids = self._name_trie.suggest(normalize_name(text), k)
+        return [self._customers[id] for id in ids]
+
+
+if __name__ == "__main__":
+    # Lookups and suggestions over a million customers
+    import random
+    import time
+
+    rng = random.Random(3)
+    syllables = ["ca", "ro", "mi", "lu", "pe", "dro", "sa", "ga", "ti", "na", "ja", "vi", "mar", "gon", "ber"]
+    first_names = ["Ana", "Andrés", "Camila", "Carlos", "Daniela", "David", "Juan", "Julián", "Laura", "Luis",
+                   "María", "Mateo", "Paula", "Santiago", "Sofía", "Valentina"]
+    last_names = ["García", "Rodríguez", "Martínez", "López", "Gómez", "Pérez", "Celis", "Giraldo",
+                  "Sánchez", "Ramírez"] + ["".join(rng.choices(syllables, k=3)).title() for _ in range(5000)]
+    count = 1_000_000
+    people = [(f"{rng.choice(first_names)} {rng.choice(last_names)}", f"Calle {rng.randrange(200)} # {n}",
+               f"3{rng.randrange(10 ** 9):09d}") for n in range(count)]
+    directory = CustomerDirectory()
+    start = time.perf_counter()
+    for name, address, phone in people:
+        directory.add(name, address, phone)
+    print(f"{count} customers added in {time.perf_counter() - start:.1f}s")
+
+    name, address, phone = people[1234]
+    repeat = directory.add(name.upper(), address, "+57 " + phone[:3] + " " + phone[3:])
+    assert repeat is directory.by_phone(phone)[0] and len(directory) == count
+    for _ in range(3):
+        directory.record_order(repeat, {"total": 100.0})
+    assert directory.suggest(name.split()[0][:2])[0] is repeat
+
+    queries = [rng.choice(people) for _ in range(10_000)]
+    for label, lookup in (("phone lookup", lambda person: directory.by_phone(person[2])),
+                          ("name lookup", lambda person: directory.by_name(person[0])),
+                          ("name type-ahead", lambda person: directory.suggest(person[0][:4])),
+                          ("surname type-ahead", lambda person: directory.suggest(person[0].split()[1][:3])),
+                          ("phone type-ahead", lambda person: directory.suggest(person[2][:6]))):
+        start = time.perf_counter()
+        for person in queries:
+            lookup(person)
+        print(f"{label}: {(time.perf_counter() - start) / len(queries) * 1e6:.1f}us")
@@ -0,0 +1,327 @@
+"""
+This module contains the differential harness of the machine builders. It
+generates random valid orders for every machine type, builds them through the
+reference path (an ArcadeMachineBuilder configured setter by setter and the
+ArcadeMachineFactory) and through every other path that builds machines, and
+checks that all of them give the same fields and prices. It also times every
+path and fails when a path becomes slower than its recorded baseline. A path
+that optimizes another one doing the same work (FASTER_THAN) must not be
+slower than it; the paths that do more work than the reference (validation,
+serialization) are only noted when they are slower than it.
+
+Run it with: python differential.py [--count N] [--seed S] [--update-baseline]
+The timings are relative to the reference path, so the baseline committed
+with the module (differential_baseline.json) holds on other computers; record
+it again with --update-baseline after a deliberate change. Without a
+baseline the timings are not checked, with a warning (or a failure with
+--require-baseline). An optimization slower than the path it optimizes is
+flagged, or fails with --fail-slower. With ARCADE_STRICT_TIMINGS=1 in the
+environment, as set by CI, both failures are on by default; the tests run the
+equivalence check on a small batch, and the timings too in strict mode
+(tests/test_differential.py).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import gc
+import json
+import os
+import sys
+import time
+
+from ArcadeMachine import ArcadeMachineBuilder, ArcadeMachineFactory, MATERIAL_INCREASES
+from analytics import order_price
+from config import MachineConfig
+from pooling import replay_orders
+from pricing import PricingEngine, DEFAULT_RULES
+from serialization import dumps_binary, loads_binary, dumps_json, loads_json
+from synthetic import games as synthetic_games, orders as synthetic_orders
+from validation import build_order
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "differential_baseline.json")
+STRICT = os.environ.get("ARCADE_STRICT_TIMINGS") == "1"  # Set by CI: timing problems fail the run
+
+# Setters of the fields of every machine type, as a user of the builder calls them
+_SETTERS = {
+    "difficulties": ArcadeMachineBuilder.set_difficulties,
+    "arrow_cardinalities": ArcadeMachineBuilder.set_arrow_cardinalities,
+    "controls_price": ArcadeMachineBuilder.set_controls_price,
+    "make_vibration": ArcadeMachineBuilder.set_make_vibration,
+    "sound_record_alert": ArcadeMachineBuilder.set_sound_record_alert,
+    "gun_color": ArcadeMachineBuilder.set_gun_color,
+    "type_sim_racing": ArcadeMachineBuilder.set_type_sim_racing,
+    "add_gearbox": ArcadeMachineBuilder.set_add_gearbox,
+    "glasses_type": ArcadeMachineBuilder.set_glasses_type,
+    "glasses_resolution": ArcadeMachineBuilder.set_glasses_resolution,
+    "glasses_price": ArcadeMachineBuilder.glasses_price
+}
+
+
+def reference_build(spec, defaults, games):
+    """Builds the machine of an order spec the way the cli does: one builder and its setters."""
+    builder = ArcadeMachineBuilder()
+    builder.set_attributes(defaults[spec["machine_type"]])
+    builder.set_material(spec["material"])
+    builder.set_increases(*MATERIAL_INCREASES[spec["material"]])
+    builder.set_color(spec["color"])
+    builder.set_lights(spec["lights"])
+    builder.set_sound(spec["sound"])
+    for field, setter in _SETTERS.items():
+        if field in spec:
+            setter(builder, spec[field])
+    machine = ArcadeMachineFactory.create_arcade_machine(spec["machine_type"], builder)
+    for code in spec.get("games", ()):
+        machine.add_game(games[code])
+    return machine
+
+
+def _build_order_path(specs, defaults, games, reference):
+    return [build_order(spec, defaults, games) for spec in specs]
+
+
+def _config_path(specs, defaults, games, reference):
+    roots = {machine_type: MachineConfig.from_builder(_defaults_builder(values))
+             for machine_type, values in defaults.items()}
+    machines = []
+    for spec in specs:
+        changes = {field: value for field, value in spec.items() if field not in ("machine_type", "games")}
+        changes.update(zip(("increase_weight", "increase_power", "increase_price"),
+                           MATERIAL_INCREASES[spec["material"]]))
+        machine = roots[spec["machine_type"]].with_changes(**changes).build(spec["machine_type"])
+        for code in spec.get("games", ()):
+            machine.add_game(games[code])
+        machines.append(machine)
+    return machines
+
+
+def _defaults_builder(values):
+    builder = ArcadeMachineBuilder()
+    builder.set_attributes(values)
+    return builder
+
+
+def _frozen_path(specs, defaults, games, reference):
+    return replay_orders(specs, defaults, games)  # build_order with the catalog frozen
+
+
+def _binary_path(specs, defaults, games, reference):
+    return loads_binary(dumps_binary(reference), games)
+
+
+def _json_path(specs, defaults, games, reference):
+    return loads_json(dumps_json(reference), games)
+
+
+# Paths compared with the reference: name -> function(specs, defaults, games, reference machines)
+PATHS = {
+    "build_order": _build_order_path,
+    "frozen catalog": _frozen_path,
+    "config": _config_path,
+    "binary round trip": _binary_path,
+    "json round trip": _json_path
+}
+
+
+# Paths that optimize another path doing the same work -> that path, which they must not be slower than
+FASTER_THAN = {
+    "frozen catalog": "build_order"
+}
+
+
+def register_path(name, function, faster_than=None):
+    """
+    Adds a path to the harness; function receives (specs, defaults, games,
+    reference machines). faster_than names the path (or "reference") doing
+    the same work that this one optimizes.
+    """
+    PATHS[name] = function
+    if faster_than is not None:
+        FASTER_THAN[name] = faster_than
+
+
+def machine_fields(machine):
+    """Returns the fields of a machine, with its class and the codes of its installed games."""
+    fields = {name: value for name, value in vars(machine).items() if name != "_games"}
+    fields["class"] = type(machine).__name__
+    fields["games"] = [game._code for game in machine._games]
+    return fields
+
+
+def compare(reference, machines, engine):
+    """
+    Compares the machines of a path with the reference machines.
+
+    Returns:
+    --------
+    list : (index, field, reference value, path value) of every difference.
+    """
+    differences = []
+    if len(machines) != len(reference):
+        return [(None, "count", len(reference), len(machines))]
+    for index, (expected, actual) in enumerate(zip(reference, machines)):
+        expected_fields, actual_fields = machine_fields(expected), machine_fields(actual)
+        for field in expected_fields.keys() | actual_fields.keys():
+            if expected_fields.get(field) != actual_fields.get(field):
+                differences.append((index, field, expected_fields.get(field), actual_fields.get(field)))
+        for name, price in (("order price", order_price), ("quote", lambda m: engine.quote(m).unit_price)):
+            if price(expected) != price(actual):
+                differences.append((index, name, price(expected), price(actual)))
+    return differences
+
+
+def _timed(functions, repeat):
+    """
+    Returns the results of the first call of every function (name ->
+    function) and the best time of its repeat calls. The functions are run
+    in turns, so a change of the speed of the computer during the run
+    affects all of them alike.
+    """
+    results = {}
+    best = {}
+    for _ in range(repeat):
+        for name, function in functions.items():
+            gc.collect()  # Every run starts with the same collector state
+            start = time.perf_counter()
+            value = function()
+            elapsed = time.perf_counter() - start
+            results.setdefault(name, value)
+            best[name] = min(best.get(name, elapsed), elapsed)
+    return results, best
+
+
+def run(count=2000, seed=0, defaults=None, baseline=None, threshold=0.25, update_baseline=False, repeat=5,
+        output=print, require_baseline=None, fail_slower=None):
+    """
+    Runs the harness.
+
+    Parameters:
+    -----------
+    count : int
+        The number of random orders.
+    seed : int
+        The seed of the orders (see synthetic.orders).
+    defaults : dict
+        The default attributes of every machine type (the machine spec catalog).
+    baseline : str
+        The JSON file with the baseline timings.
+    threshold : float
+        The slowdown accepted, relative to the baseline (0.25 is 25%).
+    update_baseline : bool
+        Writes the timings of this run as the new baseline.
+    repeat : int
+        Every path is timed this number of times and the best time is kept.
+    require_baseline : bool
+        Fails when there is no baseline to check the timings against (by
+        default only with ARCADE_STRICT_TIMINGS=1).
+    fail_slower : bool
+        Fails when a path of FASTER_THAN is slower than the path it
+        optimizes, beyond threshold (by default only with
+        ARCADE_STRICT_TIMINGS=1; otherwise it is flagged).
+
+    Returns:
+    --------
+    bool : True when every path matches the reference and none regressed.
+    """
+    if defaults is None:
+        from spec_catalog import current
+        defaults = current()
+    baseline = baseline or DEFAULT_BASELINE
+    require_baseline = STRICT if require_baseline is None else require_baseline
+    fail_slower = STRICT if fail_slower is None else fail_slower
+    game_count = 5000
+    games = {game._code: game for game in synthetic_games(game_count, seed)}
+    specs = list(synthetic_orders(count, seed, game_count))
+    engine = PricingEngine(DEFAULT_RULES)
+    ok = True
+
+    def build_reference():
+        return [reference_build(spec, defaults, games) for spec in specs]
+
+    reference = build_reference()
+    functions = {"reference": build_reference}
+    for name, path in PATHS.items():
+        functions[name] = lambda path=path: path(specs, defaults, games, reference)
+    results, times = _timed(functions, repeat)
+    timings = {name: seconds / count for name, seconds in times.items()}
+    for name in PATHS:
+        machines = results[name]
+        differences = compare(reference, machines, engine)
+        if differences:
+            ok = False
+            output(f"FAIL {name}: {len(differences)} differences")
+            for index, field, expected, actual in differences[:5]:
+                output(f"  order {index}: {field}: reference {expected!r}, {name} {actual!r}")
+        else:
+            output(f"ok   {name}: {count} machines identical")
+
+    # Timings are compared relative to the reference path, so a baseline
+    # recorded on another computer is still meaningful.
+    recorded = {}
+    if os.path.exists(baseline):
+        with open(baseline, encoding="utf-8") as file:
+            recorded = json.load(file)
+    elif not update_baseline:
+        output(f"WARNING: no baseline at {baseline}, timings not checked (record one with --update-baseline)")
+        ok = ok and not require_baseline
+    for name, seconds in timings.items():
+        relative = seconds / timings["reference"]
+        line = f"{name}: {seconds * 1e6:.1f}us per machine ({relative:.2f}x reference)"
+        previous = recorded.get(name)
+        if previous is not None and name != "reference":
+            line += f", baseline {previous:.2f}x"
+            if relative > previous * (1 + threshold):
+                ok = False
+                line += f" REGRESSION (more than {threshold:.0%} slower)"
+        elif recorded and name != "reference":
+            line += ", not in the baseline"
+        optimized = FASTER_THAN.get(name)
+        if optimized is not None:
+            if seconds > timings[optimized] * (1 + threshold):
+                line += f" SLOWER than {optimized}, which it optimizes"
+                ok = ok and not fail_slower
+        elif relative > 1 and name != "reference":
+            line += " (slower than the reference)"
+        output(line)
+    if update_baseline:
+        with open(baseline, "w", encoding="utf-8") as file:
+            json.dump({name: round(seconds / timings["reference"], 3) for name, seconds in timings.items()}, file,
+                      indent=2)
+            file.write("\n")
+        output(f"Baseline written to {baseline}")
+    return ok
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Differential harness of the machine builders")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--require-baseline", action="store_true", default=None, help="fail when there is no baseline")
+    parser.add_argument("--fail-slower", action="store_true", default=None,
+                        help="fail when an optimization is slower than the path it optimizes")
+    arguments = parser.parse_args()
+    sys.exit(0 if run(arguments.count, arguments.seed, baseline=arguments.baseline, threshold=arguments.threshold,
+                      update_baseline=arguments.update_baseline, repeat=arguments.repeat,
+                      require_baseline=arguments.require_baseline, fail_slower=arguments.fail_slower) else 1)
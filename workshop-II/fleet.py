@@ -0,0 +1,414 @@
+"""
+This module contains the Fleet class, a container for the arcade machines an
+operator has deployed. The fleet keeps indexes by machine type, material,
+location, truck and installed game, and stores the numeric attributes of the
+machines (power consumption, weight and base price) in columns, so aggregate
+queries over many thousands of cabinets do not have to walk the machine objects.
+The parsed specs (volume, footprint, memory and processor tier) have sorted
+range indexes, so queries such as "footprint under 0.7 m² with at least 16GB"
+are index lookups.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+from array import array
+from bisect import bisect_left
+
+from ArcadeMachine import machine_type_of
+from specs import RANGE_FIELDS
+
+
+class _Dimension:
+    """
+    Index of the fleet over one attribute (type, material, location or truck).
+
+    Attributes:
+    -----------
+    members : dict
+        Maps every value of the attribute to the set of machine ids that have it.
+    totals : dict
+        Maps every value of the attribute to a list [count, power, weight, price]
+        that is updated whenever a machine enters or leaves the group.
+    """
+    def __init__(self):
+        self.members = {}
+        self.totals = {}
+
+    def add(self, key, machine_id, power, weight, price):
+        """Adds a machine to the group of the given key."""
+        self.members.setdefault(key, set()).add(machine_id)
+        totals = self.totals.get(key)
+        if totals is None:
+            self.totals[key] = [1, power, weight, price]
+        else:
+            totals[0] += 1
+            totals[1] += power
+            totals[2] += weight
+            totals[3] += price
+
+    def discard(self, key, machine_id, power, weight, price):
+        """Removes a machine from the group of the given key."""
+        members = self.members[key]
+        members.discard(machine_id)
+        totals = self.totals[key]
+        if not members:
+            del self.members[key]
+            del self.totals[key]
+            return
+        totals[0] -= 1
+        totals[1] -= power
+        totals[2] -= weight
+        totals[3] -= price
+
+
+class _RangeIndex:
+    """
+    Sorted index of the fleet over a numeric spec.
+
+    Machines are appended unsorted and the entries are sorted again before the
+    next lookup, so adding many machines does not shift the list every time.
+
+    Attributes:
+    -----------
+    entries : list
+        (value, machine id) pairs, sorted by value when not dirty.
+    """
+    def __init__(self):
+        self.entries = []
+        self.dirty = False
+
+    def add(self, value, machine_id):
+        self.entries.append((value, machine_id))
+        self.dirty = True
+
+    def _sorted(self):
+        if self.dirty:
+            self.entries.sort()
+            self.dirty = False
+        return self.entries
+
+    def discard(self, value, machine_id):
+        entries = self._sorted()
+        position = bisect_left(entries, (value, machine_id))
+        if position < len(entries) and entries[position] == (value, machine_id):
+            del entries[position]
+
+    def bounds(self, low=None, high=None):
+        """Returns the slice of the entries with low <= value < high (None is unbounded)."""
+        entries = self._sorted()
+        start = 0 if low is None else bisect_left(entries, (low, -1))
+        end = len(entries) if high is None else bisect_left(entries, (high, -1))
+        return start, max(start, end)
+
+    def ids(self, low=None, high=None):
+        """Returns the ids of the machines with low <= value < high."""
+        start, end = self.bounds(low, high)
+        return {machine_id for _, machine_id in self.entries[start:end]}
+
+
+class Fleet:
+    """
+    Manages the arcade machines deployed by an operator.
+
+    Every machine receives an integer id when it is added. Numeric attributes
+    are kept in columns indexed by that id, and every indexed attribute keeps
+    running totals, so sums per site or per truck are dictionary lookups.
+
+    Attributes:
+    -----------
+    _machines : list
+        The machine objects by id (None for removed machines).
+    _power, _weight, _price : array
+        Columns with the power consumption, weight and base price by id.
+    _dimensions : dict
+        The indexes of the fleet by "type", "material", "location" and "truck".
+    _by_game : dict
+        Maps every game code to the set of machine ids that have it installed.
+    _spec_columns, _ranges : dict
+        Column and range index of every parsed spec (see specs.RANGE_FIELDS).
+    """
+    COLUMNS = ("power", "weight", "price")
+
+    def __init__(self):
+        """Initializes an empty fleet."""
+        self._machines = []
+        self._power = array('d')
+        self._weight = array('d')
+        self._price = array('d')
+        self._keys = []  # Per machine id: {"type": ..., "material": ..., ...}
+        self._dimensions = {
+            "type": _Dimension(),
+            "material": _Dimension(),
+            "location": _Dimension(),
+            "truck": _Dimension()
+        }
+        self._by_game = {}
+        self._spec_columns = {name: array('d') for name in RANGE_FIELDS}
+        self._ranges = {name: _RangeIndex() for name in RANGE_FIELDS}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _values(self, machine_id):
+        return (self._power[machine_id], self._weight[machine_id], self._price[machine_id])
+
+    def add(self, machine, location, truck=None):
+        """
+        Adds a deployed machine to the fleet.
+
+        Parameters:
+        -----------
+        machine : ArcadeMachine
+            The machine to add.
+        location : str
+            The site where the machine is installed.
+        truck : str, optional
+            The truck that carries the machine, if it is in transit.
+
+        Returns:
+        --------
+        int : The id of the machine inside the fleet.
+        """
+        machine_id = len(self._machines)
+        self._machines.append(machine)
+        self._power.append(machine._power_consumption)
+        self._weight.append(machine._weight)
+        self._price.append(machine._base_price)
+        keys = {
+            "type": machine_type_of(machine),
+            "material": machine._material,
+            "location": location,
+            "truck": truck
+        }
+        self._keys.append(keys)
+        values = self._values(machine_id)
+        for name, key in keys.items():
+            if key is not None:
+                self._dimensions[name].add(key, machine_id, *values)
+        for game in machine._games:
+            self._by_game.setdefault(game._code, set()).add(machine_id)
+        specs = machine._specs
+        for name in RANGE_FIELDS:
+            value = getattr(specs, name)
+            self._spec_columns[name].append(value)
+            self._ranges[name].add(value, machine_id)
+        self._size += 1
+        return machine_id
+
+    def add_many(self, machines, location, truck=None):
+        """Adds several machines to the same location and returns their ids."""
+        return [self.add(machine, location, truck) for machine in machines]
+
+    def get(self, machine_id):
+        """Returns the machine with the given id."""
+        machine = self._machines[machine_id]
+        if machine is None:
+            raise KeyError(machine_id)
+        return machine
+
+    def remove(self, machine_id):
+        """Removes a machine from the fleet, for example when it is sold or scrapped."""
+        machine = self.get(machine_id)
+        values = self._values(machine_id)
+        for name, key in self._keys[machine_id].items():
+            if key is not None:
+                self._dimensions[name].discard(key, machine_id, *values)
+        for game in machine._games:
+            codes = self._by_game.get(game._code)
+            if codes is not None:
+                codes.discard(machine_id)
+                if not codes:
+                    del self._by_game[game._code]
+        for name in RANGE_FIELDS:
+            column = self._spec_columns[name]
+            self._ranges[name].discard(column[machine_id], machine_id)
+            column[machine_id] = 0.0
+        self._machines[machine_id] = None
+        self._power[machine_id] = self._weight[machine_id] = self._price[machine_id] = 0.0
+        self._keys[machine_id] = {}
+        self._size -= 1
+
+    def _reassign(self, machine_id, name, key):
+        self.get(machine_id)
+        keys = self._keys[machine_id]
+        values = self._values(machine_id)
+        dimension = self._dimensions[name]
+        if keys[name] is not None:
+            dimension.discard(keys[name], machine_id, *values)
+        keys[name] = key
+        if key is not None:
+            dimension.add(key, machine_id, *values)
+
+    def move(self, machine_id, location):
+        """Moves a machine to another site."""
+        self._reassign(machine_id, "location", location)
+
+    def load_on_truck(self, machine_id, truck):
+        """Assigns a machine to a truck, or unloads it when truck is None."""
+        self._reassign(machine_id, "truck", truck)
+
+    def install_game(self, machine_id, game):
+        """Installs a game on a machine of the fleet and updates the game index."""
+        self.get(machine_id).add_game(game)
+        self._by_game.setdefault(game._code, set()).add(machine_id)
+
+    def ids(self, machine_type=None, material=None, location=None, truck=None, game_code=None,
+            volume=None, footprint=None, memory_bytes=None, processor_tier=None):
+        """
+        Returns the ids of the machines that match every given filter.
+
+        The filters are resolved with the indexes, starting with the smallest
+        group, so the cost depends on the size of the answer and not on the
+        size of the fleet.
+
+        The spec filters are ranges (low, high), with low <= value < high and
+        None for an open end; for example footprint=(None, 0.7) and
+        memory_bytes=(16 * 1024 ** 3, None). When the machines already
+        selected are fewer than those in a range, their values are checked in
+        the spec column instead of reading the range.
+        """
+        groups = []
+        filters = (("type", machine_type), ("material", material),
+                   ("location", location), ("truck", truck))
+        for name, key in filters:
+            if key is not None:
+                groups.append(self._dimensions[name].members.get(key, set()))
+        if game_code is not None:
+            groups.append(self._by_game.get(game_code, set()))
+        ranges = []
+        for name, bounds in (("volume", volume), ("footprint", footprint),
+                             ("memory_bytes", memory_bytes), ("processor_tier", processor_tier)):
+            if bounds is not None:
+                low, high = bounds
+                start, end = self._ranges[name].bounds(low, high)
+                ranges.append((end - start, name, low, high))
+        if not groups and not ranges:
+            return {i for i, machine in enumerate(self._machines) if machine is not None}
+        result = None
+        if groups:
+            groups.sort(key=len)
+            result = set(groups[0]).intersection(*groups[1:])
+        for size, name, low, high in sorted(ranges):
+            if result is None:
+                result = self._ranges[name].ids(low, high)
+            elif len(result) <= size:
+                column = self._spec_columns[name]
+                result = {i for i in result
+                          if (low is None or column[i] >= low) and (high is None or column[i] < high)}
+            else:
+                result &= self._ranges[name].ids(low, high)
+        return result
+
+    def machines(self, **filters):
+        """Returns the machines that match the given filters (see ids)."""
+        return [self._machines[i] for i in sorted(self.ids(**filters))]
+
+    def machines_running(self, game_code):
+        """Returns the ids of the machines that have the game installed."""
+        return set(self._by_game.get(game_code, ()))
+
+    def count(self, **filters):
+        """Returns the number of machines that match the given filters."""
+        return len(self.ids(**filters))
+
+    def totals_by(self, dimension, column):
+        """
+        Returns a dictionary with the total of a column for every value of a dimension.
+
+        Parameters:
+        -----------
+        dimension : str
+            "type", "material", "location" or "truck".
+        column : str
+            "count", "power", "weight" or "price".
+        """
+        position = ("count",) + self.COLUMNS
+        index = position.index(column)
+        return {key: totals[index] for key, totals in self._dimensions[dimension].totals.items()}
+
+    def power_by_location(self):
+        """Returns the total power consumption (W) of every site."""
+        return self.totals_by("location", "power")
+
+    def weight_by_truck(self):
+        """Returns the total weight (kg) loaded on every truck."""
+        return self.totals_by("truck", "weight")
+
+    def total(self, column, **filters):
+        """
+        Returns the sum of a column over the machines that match the filters.
+
+        A single filter on an indexed attribute is answered from the running
+        totals; combined filters sum the column only over the matching ids.
+        """
+        column_index = self.COLUMNS.index(column) + 1
+        given = [(name, key) for name, key in filters.items() if key is not None]
+        if not given:
+            return sum(getattr(self, "_" + column))
+        if len(given) == 1 and given[0][0] in ("machine_type", "material", "location", "truck"):
+            name, key = given[0]
+            name = "type" if name == "machine_type" else name
+            totals = self._dimensions[name].totals.get(key)
+            return totals[column_index] if totals else 0.0
+        values = getattr(self, "_" + column)
+        return sum(map(values.__getitem__, self.ids(**filters)))
+
+
+if __name__ == "__main__":
+    # Quick benchmark of the fleet with 100k machines
+    import time
+    from ArcadeMachine import ArcadeMachineBuilder, Material, Game
+
+    games = [Game(f"Game {i}", str(i), "modern", "-", "-", "-", 1.0, "2024") for i in range(50)]
+    builder = ArcadeMachineBuilder()
+    builder.set_attributes({'base_price': 1600, 'dimensions': '1.70mx0.8mx0.8m', 'weight': 80.0,
+                            'power_consumption': 600, 'memory': '8GB', 'processor': 'Intel Core i5'})
+    materials = list(Material)
+    fleet = Fleet()
+    start = time.perf_counter()
+    for i in range(100_000):
+        builder.set_material(materials[i % 3])
+        machine = builder.build_modern()
+        machine.add_game(games[i % 50])
+        fleet.add(machine, f"site-{i % 500}", f"truck-{i % 40}")
+    print(f"Added {len(fleet)} machines in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        fleet.power_by_location()
+        fleet.weight_by_truck()
+        fleet.machines_running("7")
+        fleet.total("power", location="site-3")
+    print(f"1000 aggregate queries in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    builder.set_attributes({'base_price': 2200, 'dimensions': '2.00mx1.00mx1.00m', 'weight': 100.0,
+                            'power_consumption': 800, 'memory': '16GB', 'processor': 'Intel Core i9'})
+    for i in range(1000):
+        fleet.add(builder.build_modern(), f"site-{i % 500}")
+    builder.set_attributes({'base_price': 1900, 'dimensions': '1.60mx0.8mx0.8m', 'weight': 80.0,
+                            'power_consumption': 600, 'memory': '32GB', 'processor': 'Intel Core i7'})
+    for i in range(200):
+        fleet.add(builder.build_modern(), f"site-{i % 500}")
+    start = time.perf_counter()
+    for _ in range(1000):
+        small = fleet.ids(footprint=(None, 0.7), memory_bytes=(16 * 1024 ** 3, None))
+    print(f"Footprint under 0.7m2 with at least 16GB: {len(small)} machines, "
+          f"{(time.perf_counter() - start):.3f}ms per query")
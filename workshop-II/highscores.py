@@ -0,0 +1,372 @@
+"""
+This module contains the high-score service of the fleet. Every machine keeps
+the best scores of every game it runs (the records announced by classical
+machines with a sound record alert), and the service merges them into
+leaderboards of the whole fleet or of any group of machines, all time or for
+the current day or week.
+
+Boards are bounded: only the best BOARD_SIZE scores are kept, in a heap, so a
+score that does not enter a board costs one comparison. Cabinets post their
+scores through a ScoreSubmitter, which queues them and applies them in
+batches from a worker thread, so posting a score does not wait for the boards.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import heapq
+import queue
+import sys
+import threading
+import time
+from collections import namedtuple
+
+BOARD_SIZE = 10  # Scores kept by every board
+DAY = 86400
+WINDOWS = ("all", "daily", "weekly")
+RETAINED = {"daily": 8, "weekly": 5}  # Windows kept besides the current one
+
+# A score of a board. Boards order them by score and then by time, earlier first.
+Score = namedtuple("Score", ("score", "player", "machine_id", "timestamp"))
+
+
+def window_key(window, timestamp):
+    """Returns the key of the window of a timestamp: None for "all", else the day or the week (from Monday, UTC)."""
+    if window == "all":
+        return None
+    day = int(timestamp // DAY)
+    if window == "daily":
+        return day
+    if window == "weekly":
+        return (day + 3) // 7  # Day 0 (1970-01-01) was a Thursday
+    raise ValueError(f"Unknown window: {window}")
+
+
+class ScoreBoard:
+    """
+    The best scores of a board, kept in a min-heap of at most size entries.
+
+    Entries are (score, -sequence, Score): equal scores rank the earlier one
+    first, and the worst entry is at the top of the heap.
+    """
+    __slots__ = ("size", "_heap")
+
+    def __init__(self, size=BOARD_SIZE):
+        self.size = size
+        self._heap = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    def floor(self):
+        """Returns the score needed to enter a full board, or None if it is not full."""
+        return self._heap[0][0] if len(self._heap) >= self.size else None
+
+    def push(self, entry):
+        """Adds an entry (score, -sequence, Score); returns True if it entered the board."""
+        heap = self._heap
+        if len(heap) < self.size:
+            heapq.heappush(heap, entry)
+            return True
+        if entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+            return True
+        return False
+
+    def best(self):
+        """Returns the best entry, or None."""
+        return max(self._heap) if self._heap else None
+
+    def entries(self):
+        """Returns the entries of the board, in heap order."""
+        return self._heap
+
+    def top(self, k=None):
+        """Returns the Scores of the board, best first."""
+        return [entry[2] for entry in sorted(self._heap, reverse=True)[:k]]
+
+    @staticmethod
+    def merge(boards, size=BOARD_SIZE):
+        """Returns the best size Scores of several boards, best first."""
+        entries = heapq.nlargest(size, (entry for board in boards for entry in board.entries()))
+        return [entry[2] for entry in entries]
+
+
+class HighScoreService:
+    """
+    The leaderboards of every game, per machine and for the fleet.
+
+    Every score is added to the board of its machine and to the board of the
+    fleet, for every window (all time, its day and its week). Only the last
+    RETAINED days and weeks are kept.
+
+    Parameters:
+    -----------
+    fleet : Fleet, optional
+        The fleet of the machines; with it, a new record of a machine with a
+        sound record alert (ClassicalArcadeMachine) notifies the record listeners.
+    size : int
+        The scores kept by every board.
+    """
+    def __init__(self, fleet=None, size=BOARD_SIZE):
+        self._fleet = fleet
+        self._size = size
+        self._machine_boards = {}  # (game code, window, key, machine id) -> ScoreBoard
+        self._fleet_boards = {}  # (game code, window, key) -> ScoreBoard
+        self._machines_by_board = {}  # (game code, window, key) -> machine ids with a board
+        self._current = {window: None for window in WINDOWS if window != "all"}  # Last window key seen
+        self._sequence = 0
+        self._record_listeners = []
+        self._alerts = {}  # Machine id -> whether it has a sound record alert
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener):
+        """
+        Registers a callable notified of every new record of a machine with a
+        sound record alert: listener(machine, game code, Score).
+        """
+        self._record_listeners.append(listener)
+
+    def _alert(self, machine_id):
+        alert = self._alerts.get(machine_id)
+        if alert is None:
+            machine = None
+            if self._fleet is not None:
+                try:
+                    machine = self._fleet.get(machine_id)
+                except (KeyError, IndexError):
+                    machine = None
+            alert = self._alerts[machine_id] = bool(getattr(machine, "_sound_record_alert", False))
+        return alert
+
+    def _board(self, boards, key):
+        board = boards.get(key)
+        if board is None:
+            board = boards[key] = ScoreBoard(self._size)
+        return board
+
+    def _expire(self, window, key):
+        """Drops the boards of the windows older than the RETAINED last ones."""
+        current = self._current[window]
+        if current is not None and key <= current:
+            return
+        self._current[window] = key
+        oldest = key - RETAINED[window]
+        for board_key in [board_key for board_key in self._fleet_boards
+                          if board_key[1] == window and board_key[2] < oldest]:
+            del self._fleet_boards[board_key]
+            for machine_id in self._machines_by_board.pop(board_key, ()):
+                del self._machine_boards[board_key + (machine_id,)]
+
+    def submit(self, game_code, machine_id, player, score, timestamp=None):
+        """Adds a score; returns True if it is a new record of its machine (all time)."""
+        return self.submit_many([(game_code, machine_id, player, score, timestamp)]) == 1
+
+    def submit_many(self, scores):
+        """
+        Adds a batch of scores (game code, machine id, player, score, timestamp or None).
+
+        Returns:
+        --------
+        int : The number of new records of a machine (all time).
+        """
+        records = []
+        with self._lock:
+            now = time.time()
+            machine_boards, fleet_boards, machines_by_board = self._machine_boards, self._fleet_boards, \
+                self._machines_by_board
+            for game_code, machine_id, player, score, timestamp in scores:
+                timestamp = now if timestamp is None else timestamp
+                self._sequence += 1
+                entry = (score, -self._sequence, Score(score, player, machine_id, timestamp))
+                for window in WINDOWS:
+                    key = window_key(window, timestamp)
+                    if key is not None:
+                        current = self._current[window]
+                        if current is not None and key < current - RETAINED[window]:
+                            continue  # Too old to be kept
+                        self._expire(window, key)
+                    board_key = (game_code, window, key)
+                    machine_board = machine_boards.get(board_key + (machine_id,))
+                    if machine_board is None:
+                        machine_board = machine_boards[board_key + (machine_id,)] = ScoreBoard(self._size)
+                        machines_by_board.setdefault(board_key, []).append(machine_id)
+                    best = machine_board.best() if window == "all" else None
+                    if machine_board.push(entry):
+                        self._board(fleet_boards, board_key).push(entry)
+                        if window == "all" and (best is None or entry > best):
+                            records.append((machine_id, game_code, entry[2]))
+        for machine_id, game_code, record in records:
+            if self._record_listeners and self._alert(machine_id):
+                machine = self._fleet.get(machine_id)
+                for listener in self._record_listeners:
+                    listener(machine, game_code, record)
+        return len(records)
+
+    def leaderboard(self, game_code, window="all", timestamp=None, machine_ids=None, k=None):
+        """
+        Returns the best Scores of a game, best first.
+
+        Parameters:
+        -----------
+        window : str
+            "all", "daily" or "weekly".
+        timestamp : float, optional
+            A time in the window (now by default).
+        machine_ids : iterable, optional
+            The machines whose boards are merged; by default the whole fleet.
+        k : int, optional
+            The number of scores (at most the board size).
+        """
+        key = window_key(window, time.time() if timestamp is None else timestamp)
+        board_key = (game_code, window, key)
+        with self._lock:
+            if machine_ids is None:
+                board = self._fleet_boards.get(board_key)
+                return board.top(k) if board is not None else []
+            boards = [self._machine_boards[board_key + (machine_id,)] for machine_id in machine_ids
+                      if board_key + (machine_id,) in self._machine_boards]
+            return ScoreBoard.merge(boards, self._size)[:k]
+
+    def record(self, game_code, machine_id):
+        """Returns the all-time record of a game on a machine, or None."""
+        with self._lock:
+            board = self._machine_boards.get((game_code, "all", None, machine_id))
+            best = board.best() if board is not None else None
+        return best[2] if best is not None else None
+
+
+class ScoreSubmitter:
+    """
+    Posts scores to a HighScoreService asynchronously.
+
+    submit only puts the score in a queue; a worker thread takes the queued
+    scores in batches of up to batch_size and applies them with
+    HighScoreService.submit_many, so thousands of cabinets can post scores
+    without waiting for the boards.
+
+    Attributes:
+    -----------
+    failed : int
+        The number of scores of the batches that failed, some of which may
+        have been applied before the error (the worker reports the error on
+        stderr and goes on with the next batch).
+    """
+    def __init__(self, service, batch_size=4096):
+        self._service = service
+        self._batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self.failed = 0
+        self._worker = threading.Thread(target=self._run, name="score-submitter", daemon=True)
+        self._worker.start()
+
+    def submit(self, game_code, machine_id, player, score, timestamp=None):
+        """
+        Queues a score (the time of submission is used when timestamp is None).
+
+        Raises:
+        -------
+        ValueError : If the score or the timestamp is not a number.
+        """
+        if not isinstance(score, (int, float)) or isinstance(score, bool):
+            raise ValueError(f"Invalid score: {score!r}")
+        if timestamp is None:
+            timestamp = time.time()
+        elif not isinstance(timestamp, (int, float)) or isinstance(timestamp, bool):
+            raise ValueError(f"Invalid timestamp: {timestamp!r}")
+        self._queue.put((game_code, machine_id, player, score, timestamp))
+
+    def _apply(self, batch):
+        if not batch:
+            return
+        try:
+            self._service.submit_many(batch)
+        except Exception as error:  # The worker must outlive a bad batch, or flush would never return
+            self.failed += len(batch)
+            print(f"Scores not applied ({len(batch)}): {error!r}", file=sys.stderr)
+
+    def _run(self):
+        get, get_nowait = self._queue.get, self._queue.get_nowait
+        while True:
+            item = get()
+            batch = []
+            events = []
+            while True:
+                if item is None:
+                    self._apply(batch)
+                    for event in events:
+                        event.set()
+                    return
+                if isinstance(item, threading.Event):  # A flush
+                    events.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self._batch_size:
+                    break
+                try:
+                    item = get_nowait()
+                except queue.Empty:
+                    break
+            self._apply(batch)
+            for event in events:
+                event.set()
+
+    def flush(self, timeout=None):
+        """Waits until the scores queued so far are on the boards."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Applies the queued scores and stops the worker."""
+        self._queue.put(None)
+        self._worker.join()
+
+
+if __name__ == "__main__":
+    # A fleet of 10k cabinets posting one score each per minute, for 100 minutes
+    import random
+
+    rng = random.Random(11)
+    service = HighScoreService()
+    submitter = ScoreSubmitter(service)
+    codes = [str(code) for code in range(36, 41)]
+    start_time = 1_700_000_000
+    scores = [(rng.choice(codes), machine_id, f"P{rng.randrange(5000)}", rng.randrange(1_000_000),
+               start_time + minute * 60 + rng.random() * 60)
+              for minute in range(100) for machine_id in range(10_000)]
+    start = time.perf_counter()
+    for score in scores:
+        submitter.submit(*score)
+    posted = time.perf_counter()
+    submitter.flush()
+    applied = time.perf_counter()
+    submitter.close()
+    print(f"{len(scores)} scores: posting {(posted - start) / len(scores) * 1e6:.2f}us each, "
+          f"all applied after {applied - start:.2f}s ({len(scores) / (applied - start) / 1e3:.0f}k per second)")
+
+    best = max(scores, key=lambda score: score[3])
+    assert service.leaderboard(best[0], timestamp=best[4])[0].score == best[3]
+    merged = service.leaderboard(best[0], machine_ids=range(10_000), timestamp=best[4])
+    assert [score.score for score in merged] == [score.score for score in service.leaderboard(best[0],
+                                                                                                 timestamp=best[4])]
+    start = time.perf_counter()
+    for _ in range(100):
+        service.leaderboard(best[0], "daily", best[4], machine_ids=range(0, 10_000, 10))
+    print(f"Merged daily board of 1000 machines: {(time.perf_counter() - start) * 10:.2f}ms")
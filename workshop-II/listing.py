@@ -0,0 +1,156 @@
+"""
+This module contains the renderer of the game listings shown in the kiosks.
+Listings are paginated, laid out in columns and sorted by title, year or
+price; every page is built into a single string and written at once instead
+of one print per game. The sorted order of every machine type is computed
+once and reused until the catalog changes, so rendering a page only touches
+the games of that page.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import sys
+
+from arcade_common.game_catalog import Game
+from memory_budget import SizedCache
+
+
+def _year(game):
+    try:
+        return int(game._year)
+    except (TypeError, ValueError):
+        return 0
+
+
+# Sort keys of the listings
+SORT_KEYS = {
+    "title": lambda game: game._title.lower(),
+    "year": lambda game: (_year(game), game._title.lower()),
+    "price": lambda game: (game._price_game or 0.0, game._title.lower())
+}
+
+
+class ListingRenderer:
+    """
+    Renders pages of the games of a machine type.
+
+    Attributes:
+    -----------
+    page_size : int
+        The number of games of a page.
+    columns : int
+        The number of columns of a page.
+    width : int
+        The width of a line in characters.
+    """
+    def __init__(self, catalog=None, page_size=20, columns=1, width=80):
+        self._catalog = Game.available_games if catalog is None else catalog
+        self.page_size = page_size
+        self.columns = columns
+        self.width = width
+        self._orders = SizedCache("sorted listings")  # (machine type, sort) -> games sorted
+        self._version = None
+
+    def _ordered(self, machine_type, sort):
+        """Returns the games of a machine type sorted, computing the order once per catalog version."""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Invalid sort: {sort} (expected one of: {', '.join(SORT_KEYS)})")
+        if self._version != self._catalog.version:
+            self._orders.clear()
+            self._version = self._catalog.version
+        key = (machine_type.lower(), sort)
+        games = self._orders.get(key)
+        if games is None:
+            games = sorted(self._catalog.by_type(machine_type), key=SORT_KEYS[sort])
+            self._orders.put(key, games, sys.getsizeof(games))  # The games themselves belong to the catalog
+        return games
+
+    def page_count(self, machine_type):
+        """Returns the number of pages of the listing of a machine type."""
+        total = len(self._catalog.by_type(machine_type))
+        return max(1, -(-total // self.page_size))
+
+    def page(self, machine_type, page=0, sort="title", reverse=False):
+        """Returns the games of a page (pages start at 0)."""
+        games = self._ordered(machine_type, sort)
+        start = page * self.page_size
+        if not reverse:
+            return games[start:start + self.page_size]
+        end = len(games) - start
+        return games[max(0, end - self.page_size):max(0, end)][::-1]
+
+    def _cell(self, game, width):
+        text = f"{game._code:>4} {game._title} ({game._year}) ${game._price_game:.2f}"
+        return text[:width - 1].ljust(width - 1) if self.columns > 1 else text[:width]
+
+    def render_page(self, machine_type, page=0, sort="title", reverse=False):
+        """
+        Returns the text of a page: a header line and the games in columns.
+
+        Games fill the first column, then the second one, and so on.
+        """
+        games = self.page(machine_type, page, sort, reverse)
+        pages = self.page_count(machine_type)
+        lines = [f"\nAvailable games for {machine_type.capitalize()} Machines (page {page + 1} of {pages}, by {sort}):"]
+        if not games:
+            lines.append("No games.")
+            return "\n".join(lines) + "\n"
+        width = self.width // self.columns
+        rows = -(-len(games) // self.columns)
+        cells = [self._cell(game, width) for game in games]
+        for row in range(rows):
+            lines.append("".join(cells[row::rows]).rstrip())
+        return "\n".join(lines) + "\n"
+
+    def write_page(self, machine_type, page=0, sort="title", reverse=False, file=None):
+        """Writes a page with a single write call."""
+        (file or sys.stdout).write(self.render_page(machine_type, page, sort, reverse))
+
+    def write_all(self, machine_type, sort="title", file=None):
+        """Writes every page of a machine type, building the whole listing in one buffer."""
+        pages = [self.render_page(machine_type, page, sort) for page in range(self.page_count(machine_type))]
+        (file or sys.stdout).write("".join(pages))
+
+
+if __name__ == "__main__":
+    # One print per game against one write per page, 200k games
+    import os
+    import time
+    from arcade_common.game_catalog import GameCatalog
+
+    catalog = GameCatalog()
+    for i in range(200_000):
+        game = Game.__new__(Game)
+        game.__dict__.update(_title=f"Game {i:06d}", _code=str(i), _type="retro", _year=str(1970 + i % 50),
+                             _price_game=(i % 400) / 100)
+        catalog.append(game)
+    renderer = ListingRenderer(catalog, page_size=50, columns=2)
+    with open(os.devnull, "w") as devnull:
+        start = time.perf_counter()
+        for game in catalog.by_type("retro"):
+            print(f"- Code: {game._code}, Title: {game._title}", file=devnull)
+        printed = time.perf_counter()
+        renderer.write_page("retro", 0, "year", file=devnull)  # Sorts once
+        sorted_ = time.perf_counter()
+        for page in range(1000):
+            renderer.write_page("retro", page, "year", file=devnull)
+        paged = time.perf_counter()
+    print(f"print per game: {printed - start:.3f}s for the listing; first page {(sorted_ - printed) * 1000:.1f}ms "
+          f"(sort), then {(paged - sorted_):.3f}ms per page")
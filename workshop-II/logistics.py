@@ -0,0 +1,314 @@
+"""
+This module contains the shipment planner of the completed orders. Trucks
+were loaded by guesswork; the planner groups the cabinets of a batch of
+orders by the delivery region of the customer (the city at the end of
+Customer.address) and packs them on vehicles within their weight limit and
+their cargo space, using the weight and the parsed dimensions of every
+machine.
+
+Cabinets travel upright and are not stacked, so the 3D packing is a packing
+of their footprints on the floor of the vehicle, with the height only
+checked against the cargo height. Footprints are packed in shelves (rows
+across the vehicle, first fit by decreasing footprint), which is fast enough
+for thousands of cabinets per run and leaves little unused floor with the few
+distinct cabinet sizes of the catalog.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+from arcade_common.search import normalize_name
+from serialization import from_json_value, game_lookup
+
+UNKNOWN_REGION = "unknown"  # Region of the addresses without a city
+
+
+def region_of(address, regions=None):
+    """
+    Returns the delivery region of an address: its last comma separated part
+    (the city, as in 'Calle 10 # 5-20, Bogotá'), normalized, or mapped to a
+    region with regions (normalized city -> region).
+    """
+    parts = (address or "").rsplit(",", 1)
+    city = normalize_name(parts[1]) if len(parts) == 2 else ""
+    if not city:
+        return UNKNOWN_REGION
+    return regions.get(city, city) if regions is not None else city
+
+
+class Vehicle:
+    """
+    A type of vehicle used for the deliveries.
+
+    Attributes:
+    -----------
+    name : str
+        The name of the vehicle type.
+    max_weight : float
+        The payload (kg) the vehicle can carry.
+    length, width, height : float
+        The inner size (m) of its cargo space.
+    """
+    def __init__(self, name, max_weight, length, width, height):
+        self.name = name
+        self.max_weight = max_weight
+        self.length = length
+        self.width = width
+        self.height = height
+
+    @property
+    def floor(self):
+        return self.length * self.width
+
+    @property
+    def volume(self):
+        return self.length * self.width * self.height
+
+
+# A truck with a 7.2m x 2.45m x 2.5m box and 3.5t of payload
+TRUCK = Vehicle("Truck", 3500.0, 7.2, 2.45, 2.5)
+
+
+class Load:
+    """
+    The cabinets packed on one vehicle.
+
+    Attributes:
+    -----------
+    name : str
+        The name of the load ('Bogota 3' is the third vehicle to Bogota).
+    vehicle : Vehicle
+        The type of the vehicle.
+    region : str
+        The delivery region.
+    cabinets : list
+        The (item, x, y, rotated) of every cabinet: its position (m) on the
+        floor from the front left corner, and whether it was turned 90
+        degrees. item is what was given to the planner (a machine).
+    weight, floor, volume : float
+        The weight, footprint and volume of the cabinets.
+    """
+    def __init__(self, name, vehicle, region):
+        self.name = name
+        self.vehicle = vehicle
+        self.region = region
+        self.cabinets = []
+        self.weight = 0.0
+        self.floor = 0.0
+        self.volume = 0.0
+        self._shelves = []  # [start along the length, depth, width used]
+        self._length = 0.0  # Length used by the shelves
+
+    def place(self, item, width, depth, height, weight):
+        """Packs a cabinet if it fits (first fit in the shelves); returns True if it was packed."""
+        vehicle = self.vehicle
+        if self.weight + weight > vehicle.max_weight or height > vehicle.height:
+            return False
+        best = None
+        for shelf in self._shelves:
+            free = vehicle.width - shelf[2]
+            # Turned so it takes the least width of the shelf that can hold it
+            for across, along, rotated in ((width, depth, False), (depth, width, True)):
+                if across <= free and along <= shelf[1] and (best is None or across < best[1]):
+                    best = shelf, across, rotated
+            if best is not None:
+                break
+        if best is None:
+            # A new shelf, as shallow as possible: the longest side across the vehicle if it fits
+            for across, along, rotated in sorted(((width, depth, False), (depth, width, True)), reverse=True):
+                if across <= vehicle.width and self._length + along <= vehicle.length:
+                    shelf = [self._length, along, 0.0]
+                    self._shelves.append(shelf)
+                    self._length += along
+                    best = shelf, across, rotated
+                    break
+            else:
+                return False
+        shelf, across, rotated = best
+        self.cabinets.append((item, shelf[2], shelf[0], rotated))
+        shelf[2] += across
+        self.weight += weight
+        self.floor += width * depth
+        self.volume += width * depth * height
+        return True
+
+    def utilisation(self):
+        """Returns the fractions (weight, floor, volume) of the vehicle used."""
+        vehicle = self.vehicle
+        return self.weight / vehicle.max_weight, self.floor / vehicle.floor, self.volume / vehicle.volume
+
+
+class Shipment:
+    """
+    Result of the planner.
+
+    Attributes:
+    -----------
+    loads : list
+        The loaded vehicles, by region.
+    unpacked : dict
+        Number of cabinets of every region that fit in no vehicle (larger or
+        heavier than the vehicle, or without parseable dimensions).
+    """
+    def __init__(self, loads, unpacked):
+        self.loads = loads
+        self.unpacked = unpacked
+
+    def packed(self):
+        """Returns the number of cabinets packed on the vehicles."""
+        return sum(len(load.cabinets) for load in self.loads)
+
+    def vehicles_by_region(self):
+        """Returns the number of vehicles of every region."""
+        counts = {}
+        for load in self.loads:
+            counts[load.region] = counts.get(load.region, 0) + 1
+        return counts
+
+    def utilisation(self):
+        """Returns the (weight, floor, volume) fractions used of every vehicle."""
+        return {load.name: load.utilisation() for load in self.loads}
+
+    def mean_utilisation(self):
+        """Returns the mean (weight, floor, volume) fractions used of the vehicles."""
+        if not self.loads:
+            return 0.0, 0.0, 0.0
+        values = [load.utilisation() for load in self.loads]
+        return tuple(sum(value[index] for value in values) / len(values) for index in range(3))
+
+    def __str__(self):
+        weight, floor, volume = self.mean_utilisation()
+        lines = [f"Packed cabinets: {self.packed()} on {len(self.loads)} vehicles "
+                 f"(mean weight {weight:.0%}, floor {floor:.0%}, volume {volume:.0%})"]
+        for load in self.loads:
+            weight, floor, volume = load.utilisation()
+            lines.append(f"- {load.name} ({load.vehicle.name}): {len(load.cabinets)} cabinets, "
+                         f"{load.weight:.0f}kg, weight {weight:.0%}, floor {floor:.0%}, volume {volume:.0%}")
+        for region, count in self.unpacked.items():
+            lines.append(f"Unpacked to {region}: {count}")
+        return "\n".join(lines)
+
+
+class ShipmentPlanner:
+    """
+    Packs the cabinets of completed orders on vehicles, per delivery region.
+
+    Every region gets its own vehicles. The cabinets of a region are packed
+    from the largest to the smallest footprint (the heaviest first among
+    equal footprints), each one in the first vehicle where it fits, and a new
+    vehicle is used when none has room. Vehicles only fill up, so a cabinet
+    size that did not fit in a vehicle is not tried on it again.
+
+    Parameters:
+    -----------
+    vehicle : Vehicle
+        The vehicle type used for every load.
+    regions : dict, optional
+        Normalized city -> region, to group several cities on one route.
+    """
+    def __init__(self, vehicle=TRUCK, regions=None):
+        self._vehicle = vehicle
+        self._regions = regions
+
+    def plan(self, deliveries):
+        """
+        Packs machines given as (address, machine, quantity) deliveries.
+
+        Returns:
+        --------
+        Shipment : The loads of every region.
+        """
+        by_region = {}
+        for address, machine, quantity in deliveries:
+            height, width, depth = machine.specs[:3]
+            item = (width * depth, float(machine._weight), width, depth, height, machine)
+            by_region.setdefault(region_of(address, self._regions), []).extend([item] * quantity)
+        loads = []
+        unpacked = {}
+        for region, items in by_region.items():
+            items.sort(key=lambda item: item[:5], reverse=True)
+            region_loads = []
+            first = {}  # Cabinet size -> index of the first load it may still fit in
+            failed = set()  # Cabinet sizes that fit in no vehicle
+            for _, weight, width, depth, height, machine in items:
+                size = (width, depth, height, weight)
+                if size in failed or not width or not depth or not height:
+                    unpacked[region] = unpacked.get(region, 0) + 1
+                    continue
+                index = first.get(size, 0)
+                while index < len(region_loads) and not region_loads[index].place(machine, width, depth, height,
+                                                                                 weight):
+                    index += 1
+                if index == len(region_loads):
+                    load = Load(f"{region.title()} {index + 1}", self._vehicle, region)
+                    if not load.place(machine, width, depth, height, weight):  # Fits in no vehicle
+                        failed.add(size)
+                        unpacked[region] = unpacked.get(region, 0) + 1
+                        continue
+                    region_loads.append(load)
+                first[size] = index
+            loads.extend(region_loads)
+        return Shipment(loads, unpacked)
+
+    def plan_orders(self, orders, games=None):
+        """
+        Packs the machines of completed orders, as returned by
+        ArcadeCatalog.complete_purchase or read from the orders file.
+        """
+        lookup = game_lookup(games)  # Once for the batch, not once per line
+        deliveries = []
+        for order in orders:
+            address = from_json_value(order["customer"], lookup=lookup).address
+            for machine, quantity, _ in order["lines"]:
+                deliveries.append((address, from_json_value(machine, lookup=lookup), quantity))
+        return self.plan(deliveries)
+
+
+if __name__ == "__main__":
+    # Benchmark: 5000 cabinets of random machine types to ten cities
+    import random
+    import time
+    from spec_catalog import current
+    from synthetic import orders, games as synthetic_games
+    from validation import build_order
+
+    for _ in synthetic_games(2000, seed=9, start_code=70_000, register=True):
+        pass
+    rng = random.Random(9)
+    cities = ["Bogotá", "Medellín", "Cali", "Barranquilla", "Cartagena", "Bucaramanga", "Pereira", "Manizales",
+              "Santa Marta", "Ibagué"]
+    deliveries = [(f"Calle {rng.randrange(200)} # {rng.randrange(100)}-{rng.randrange(100)}, {rng.choice(cities)}",
+                   build_order(spec, current()), rng.choice((1, 1, 1, 2, 4)))
+                  for spec in orders(2500, seed=9, game_count=2000, start_code=70_000)]
+    cabinets = sum(quantity for _, _, quantity in deliveries)
+    planner = ShipmentPlanner()
+    start = time.perf_counter()
+    shipment = planner.plan(deliveries)
+    elapsed = time.perf_counter() - start
+    assert shipment.packed() + sum(shipment.unpacked.values()) == cabinets
+    for load in shipment.loads:
+        assert load.weight <= load.vehicle.max_weight
+        for machine, x, y, rotated in load.cabinets:
+            height, width, depth = machine.specs[:3]
+            across, along = (depth, width) if rotated else (width, depth)
+            assert x + across <= load.vehicle.width + 1e-9 and y + along <= load.vehicle.length + 1e-9
+    weight, floor, volume = shipment.mean_utilisation()
+    print(f"{cabinets} cabinets to {len(cities)} cities: {len(shipment.loads)} trucks in {elapsed * 1000:.0f}ms, "
+          f"mean weight {weight:.0%}, floor {floor:.0%}, volume {volume:.0%}")
+    print("\n".join(str(shipment).splitlines()[:4]))
@@ -0,0 +1,455 @@
+"""
+This module contains the memory accounting of the catalog process. With large
+catalogs the registries (games, customers, title indexes) and the caches
+built around them (parsed specs, sorted listings) grew until
+the worker ran out of memory; every component now reports its approximate
+size, and a global budget evicts cache entries when the total goes over the
+limit, so the process gets slower lookups instead of crashing.
+
+Registries cannot be evicted: they are measured (by sampling, so measuring a
+million games is cheap) and count against the budget. Caches are SizedCache
+objects that know the size of every entry and evict by LRU or LFU, preferring
+large entries, when the budget asks them to free memory.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import sys
+import time
+import types
+import weakref
+from collections import OrderedDict
+from enum import Enum
+from itertools import islice
+
+STRIDE = 64  # About one in STRIDE items of a large container is measured
+WHOLE = 256  # Containers of up to WHOLE items are measured whole
+MAX_DEPTH = 64  # Levels of nested objects followed when measuring
+EVICTION_WINDOW = 8  # Oldest entries among which an LRU cache evicts the largest first
+LOW_WATER = 0.9  # Fraction of the room left to the caches they are evicted down to, so not on every insertion
+REFRESH_SECONDS = 30.0  # Age of the size of a registry without len or version before it is measured again
+POLICIES = ("lru", "lfu")
+
+# Objects shared by the whole process, never counted in a component
+_SHARED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+           weakref.ref, Enum)
+_ATOMIC = (int, float, complex, bool, str, bytes, type(None))
+
+
+def approximate_size(obj, stride=STRIDE):
+    """
+    Returns the approximate bytes of an object and of the objects it holds
+    (items of containers, attributes of instances), each counted once.
+
+    Containers with more than WHOLE items are measured on about one in
+    stride of their items and the rest is extrapolated. Classes, functions,
+    modules and enum members are shared by the process and not counted.
+    """
+    return _size(obj, set(), (1 << 32) // stride, 0)
+
+
+def _size(obj, seen, rate, depth):
+    if isinstance(obj, _SHARED) or id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, _ATOMIC) or depth >= MAX_DEPTH:
+        return size
+    depth += 1
+    if isinstance(obj, dict):
+        size += _items_size(obj.items(), len(obj), seen, rate, depth, pairs=True)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += _items_size(obj, len(obj), seen, rate, depth)
+    attributes = getattr(obj, "__dict__", None)
+    if isinstance(attributes, dict):
+        size += _size(attributes, seen, rate, depth)
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            value = getattr(obj, name, None)
+            if value is not None and name not in ("__dict__", "__weakref__"):
+                size += _size(value, seen, rate, depth)
+    return size
+
+
+def _sampled(item, rate):
+    """Whether an object is in the sample, by its address: the same objects in every container."""
+    return ((id(item) >> 4) * 2654435761) & 0xFFFFFFFF < rate
+
+
+def _items_size(items, count, seen, rate, depth, pairs=False):
+    """
+    Returns the bytes of the items of a container. Large containers are
+    sampled by the address of their items (the values of dicts), so an
+    object held by two indexes is sampled, and counted once, in both.
+    """
+    if not count:
+        return 0
+    if count > WHOLE:
+        measured = [item for item in items if _sampled(item[1] if pairs else item, rate)] \
+            or list(islice(items, WHOLE))
+    else:
+        measured = items
+    held = 0
+    for item in measured:
+        if pairs:
+            held += _size(item[0], seen, rate, depth) + _size(item[1], seen, rate, depth)
+        else:
+            held += _size(item, seen, rate, depth)
+    return held * count // len(measured)
+
+
+class SizedCache:
+    """
+    Cache of values with the approximate bytes of every entry.
+
+    Misses are the caller's business (get returns the default and the
+    caller computes the value and puts it), so an evicted entry only costs
+    computing it again.
+
+    Parameters:
+    -----------
+    name : str
+        The name of the cache in the metrics of the budget.
+    policy : str
+        "lru" evicts among the least recently used entries, the largest
+        first; "lfu" evicts the entries with the fewest uses per byte.
+    max_bytes : int, optional
+        A limit of this cache alone.
+    budget : MemoryBudget, optional
+        The budget it counts against (the default budget if not given;
+        False for none).
+    sizeof : callable
+        Returns the bytes of a value, when put is not given them.
+    priority : int
+        Caches of lower priority are evicted first by the budget.
+    """
+    def __init__(self, name, policy="lru", max_bytes=None, budget=None, sizeof=approximate_size, priority=0):
+        if policy not in POLICIES:
+            raise ValueError(f"Invalid policy: {policy} (expected one of: {', '.join(POLICIES)})")
+        self.name = name
+        self.policy = policy
+        self.max_bytes = max_bytes
+        self.priority = priority
+        self._sizeof = sizeof
+        self._entries = OrderedDict()  # Key -> [value, bytes, uses]
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.rejected = 0
+        self._budget = default_budget() if budget is None else budget or None
+        if self._budget is not None:
+            self._budget.register(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def memory_bytes(self):
+        """Returns the approximate bytes of the entries."""
+        return self._bytes
+
+    def get(self, key, default=None):
+        """Returns the value of a key, or default."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        entry[2] += 1
+        if self.policy == "lru":
+            self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, size=None):
+        """
+        Adds or replaces the value of a key; size is its bytes (measured
+        with sizeof if not given). The cache and then the budget evict other
+        entries if they go over their limits. A value larger than the cache
+        or than the room of the budget is not kept (it would evict everything
+        else and then itself).
+        """
+        if size is None:
+            size = self._sizeof(value)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        room = self._budget.room() if self._budget is not None else None  # As of the last enforcement pass
+        if (self.max_bytes is not None and size > self.max_bytes) or (room is not None and size > room):
+            self.rejected += 1
+            return
+        self._entries[key] = [value, size, 1 if old is None else old[2]]
+        self._bytes += size
+        if self.max_bytes is not None and self._bytes > self.max_bytes:
+            self.evict(self._bytes - int(self.max_bytes * LOW_WATER), keep=key)
+        if self._budget is not None:
+            self._budget.enforce()
+
+    def pop(self, key, default=None):
+        """Removes a key and returns its value, or default."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self._bytes -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        """Removes every entry (not counted as evictions)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def evict(self, nbytes, keep=None):
+        """
+        Evicts entries until nbytes are freed or the cache is empty (keep,
+        the entry just added, goes last).
+
+        Returns:
+        --------
+        int : The bytes freed.
+        """
+        entries = self._entries
+        freed = 0
+        if self.policy == "lfu":
+            victims = iter(sorted(entries, key=lambda key: (key == keep, entries[key][2] / max(entries[key][1], 1))))
+        while freed < nbytes and entries:
+            if self.policy == "lfu":
+                key = next(victims)
+            else:
+                window = [key for key in islice(entries, EVICTION_WINDOW + 1) if key != keep][:EVICTION_WINDOW]
+                key = max(window, key=lambda key: entries[key][1]) if window else keep
+            size = entries.pop(key)[1]
+            self._bytes -= size
+            freed += size
+            self.evictions += 1
+            self.evicted_bytes += size
+        return freed
+
+    def stats(self):
+        """Returns the metrics of the cache."""
+        lookups = self.hits + self.misses
+        return {"kind": "cache", "bytes": self._bytes, "entries": len(self._entries), "hits": self.hits,
+                "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions, "evicted_bytes": self.evicted_bytes, "rejected": self.rejected}
+
+
+class _Registry:
+    """A tracked registry and its last measured size."""
+    __slots__ = ("ref", "sizeof", "bytes", "key", "measured")
+
+    def __init__(self, obj, sizeof):
+        try:
+            self.ref = weakref.ref(obj)  # A registry that is dropped stops counting
+        except TypeError:  # Plain lists and dicts
+            self.ref = lambda: obj
+        self.sizeof = sizeof
+        self.bytes = 0
+        self.key = None
+        self.measured = None
+
+    def memory_bytes(self):
+        obj = self.ref()
+        if obj is None:
+            return 0
+        # Measured again only when it changed (its length or version) or, without them, after a while
+        key = (len(obj) if hasattr(obj, "__len__") else None, getattr(obj, "version", None))
+        now = time.monotonic()
+        if key != self.key or (key == (None, None) and now - self.measured > REFRESH_SECONDS):
+            self.bytes = self.sizeof(obj)
+            self.key = key
+            self.measured = now
+        return self.bytes
+
+
+class MemoryBudget:
+    """
+    Global memory budget of the registries and caches of the process.
+
+    When the total of the components goes over the limit, the caches are
+    asked to free memory down to LOW_WATER of the room the registries leave
+    them: the caches of lower priority first and, among equal priorities,
+    the largest first. If the registries alone are over the limit, the
+    caches are emptied and the overflow is counted in the metrics.
+
+    Parameters:
+    -----------
+    limit : int, optional
+        The bytes allowed to the components (None: only accounting).
+    """
+    def __init__(self, limit=None):
+        self.limit = limit
+        self._caches = weakref.WeakSet()
+        self._registries = {}  # Name -> _Registry
+        self.enforcements = 0
+        self.overflows = 0
+        self._enforcing = False
+        self._registered = None  # Bytes of the registries at the last enforcement pass
+
+    def register(self, cache):
+        """Counts a cache (an object with name, priority, memory_bytes, evict and stats) against the budget."""
+        self._caches.add(cache)
+
+    def track(self, name, registry, sizeof=approximate_size):
+        """
+        Counts a registry that cannot be evicted (the game catalog, the
+        customer directory, ...) against the budget. It is measured again
+        when its length or version changes.
+        """
+        self._registries[name] = _Registry(registry, sizeof)
+        self._registered = None
+
+    def usage(self):
+        """Returns the approximate bytes of every component by name."""
+        usage = {name: registry.memory_bytes() for name, registry in self._registries.items()}
+        for cache in list(self._caches):
+            usage[cache.name] = usage.get(cache.name, 0) + cache.memory_bytes()
+        return usage
+
+    def _measure(self):
+        """Returns the bytes of the registries, measuring the ones that changed, and keeps them for room."""
+        self._registered = sum(registry.memory_bytes() for registry in self._registries.values())
+        return self._registered
+
+    def room(self):
+        """
+        Returns the bytes the registries leave to the caches (None without a
+        limit), with the registries as measured by the last enforcement pass:
+        a cache checks every put against it, and measuring a large registry
+        that keeps changing (the catalog) on every put would cost more than
+        the cache saves.
+        """
+        if self.limit is None:
+            return None
+        registered = self._measure() if self._registered is None else self._registered
+        return max(0, self.limit - registered)
+
+    def total(self):
+        """Returns the approximate bytes of all the components."""
+        return sum(self.usage().values())
+
+    def enforce(self):
+        """
+        Evicts cache entries if the components are over the limit.
+
+        Returns:
+        --------
+        int : The bytes freed.
+        """
+        if self.limit is None or self._enforcing:
+            return 0
+        caches = list(self._caches)
+        room = self.limit - self._measure()
+        cached = sum(cache.memory_bytes() for cache in caches)
+        if cached <= room:
+            return 0
+        self._enforcing = True
+        try:
+            self.enforcements += 1
+            if room < 0:
+                self.overflows += 1  # Nothing left to evict can bring the registries under the limit
+            need = cached - max(0, int(room * LOW_WATER))
+            freed = 0
+            for cache in sorted(caches, key=lambda cache: (cache.priority, -cache.memory_bytes())):
+                if freed >= need:
+                    break
+                freed += cache.evict(need - freed)
+            return freed
+        finally:
+            self._enforcing = False
+
+    def metrics(self):
+        """Returns the metrics of every component by name, with the total and the limit."""
+        components = {name: {"kind": "registry", "bytes": registry.memory_bytes()}
+                      for name, registry in self._registries.items()}
+        for cache in list(self._caches):
+            stats = cache.stats()
+            merged = components.get(cache.name)
+            if merged is not None and merged["kind"] == "cache":  # Caches of several instances (one per renderer)
+                for field in ("bytes", "entries", "hits", "misses", "evictions", "evicted_bytes", "rejected"):
+                    stats[field] += merged[field]
+                lookups = stats["hits"] + stats["misses"]
+                stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            components[cache.name] = stats
+        total = sum(component["bytes"] for component in components.values())
+        return {"components": components, "total": total, "limit": self.limit,
+                "enforcements": self.enforcements, "overflows": self.overflows}
+
+    def report(self):
+        """Returns the metrics as text, one line per component, the largest first."""
+        metrics = self.metrics()
+        limit = f" of {metrics['limit'] / 2 ** 20:.1f}MB" if metrics["limit"] is not None else ""
+        lines = [f"Memory: {metrics['total'] / 2 ** 20:.1f}MB{limit} ({metrics['enforcements']} evictions, "
+                 f"{metrics['overflows']} over the limit)"]
+        for name, component in sorted(metrics["components"].items(), key=lambda item: -item[1]["bytes"]):
+            line = f"- {name} ({component['kind']}): {component['bytes'] / 2 ** 20:.2f}MB"
+            if component["kind"] == "cache":
+                line += (f", {component['entries']} entries, hit rate {component['hit_rate']:.0%}, "
+                         f"{component['evictions']} evicted, {component['rejected']} too large")
+            lines.append(line)
+        return "\n".join(lines)
+
+
+_default = None
+
+
+def default_budget():
+    """Returns the budget of the process (no limit until one is set with default_budget().limit = bytes)."""
+    global _default
+    if _default is None:
+        _default = MemoryBudget()
+    return _default
+
+
+if __name__ == "__main__":
+    # A catalog of 300k games and listings of every machine type under a budget smaller than their caches
+    import memory_budget  # The module the caches of the other modules count against, not __main__
+    from arcade_common.game_catalog import Game
+    from listing import SORT_KEYS, ListingRenderer
+    from synthetic import games as synthetic_games
+
+    for _ in synthetic_games(300_000, seed=4, start_code=100_000, register=True):
+        pass
+    budget = memory_budget.default_budget()
+    start = time.perf_counter()
+    budget.track("games", Game.available_games)
+    games_bytes = budget.usage()["games"]
+    print(f"Measured the catalog of {len(Game.available_games)} games in {(time.perf_counter() - start) * 1000:.0f}ms: "
+          f"{games_bytes / 2 ** 20:.0f}MB")
+    renderer = ListingRenderer()
+
+    def listings():
+        start = time.perf_counter()
+        for machine_type in Game.available_games.machine_types():
+            for sort in SORT_KEYS:
+                renderer.render_page(machine_type, 0, sort)
+        return time.perf_counter() - start
+
+    cold = listings()
+    warm = listings()
+    unlimited = budget.total()
+    budget.limit = games_bytes + (unlimited - games_bytes) // 2  # Room for half of the caches
+    budget.enforce()
+    constrained = listings() + listings()
+    print(f"Listings: {cold * 1000:.0f}ms cold, {warm * 1000:.1f}ms warm, {constrained / 2 * 1000:.0f}ms "
+          f"within a budget of {budget.limit / 2 ** 20:.0f}MB")
+    assert budget.total() <= budget.limit
+    print(budget.report())
@@ -0,0 +1,277 @@
+"""
+This module contains the metering of the plays of the fleet. Every play of a
+game on a machine is charged the price of the game (Game._price_game, such as
+0.25 for Pac-Man); the meter ingests play events in batches and keeps the
+plays and the revenue per machine, per game and per time bucket.
+
+Totals are kept in numeric arrays indexed by machine id, game and bucket, not
+in objects per event, so millions of events take a few megabytes. The buckets
+form a ring covering the last BUCKETS periods, used for rolling windows such
+as the revenue of the last hour. The revenue of every game per bucket is a
+sparse map of the games played in that bucket, so the ring does not grow
+with the catalog and a new bucket only clears its own map.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import time
+from array import array
+from heapq import nlargest
+
+from arcade_common.game_catalog import Game
+
+BUCKET_SECONDS = 60  # Length of a time bucket
+BUCKETS = 1440  # Buckets kept for rolling windows (a day of minutes)
+
+
+class PlayMeter:
+    """
+    Plays and revenue of the fleet, per machine, per game and per time bucket.
+
+    Machines are identified by their integer id (as given by Fleet.add) and
+    games by their code. Events of games that are not in the catalog are
+    counted in `unknown` and not charged.
+
+    Parameters:
+    -----------
+    catalog : GameCatalog
+        The games and their prices (Game.available_games by default). The
+        meter subscribes to it, so games registered later can be played,
+        price changes are charged from then on and removed games are no
+        longer charged (their totals are kept).
+    bucket_seconds : int
+        The length of a time bucket.
+    buckets : int
+        The number of buckets kept for rolling windows.
+    """
+    def __init__(self, catalog=None, bucket_seconds=BUCKET_SECONDS, buckets=BUCKETS):
+        self._catalog = Game.available_games if catalog is None else catalog
+        self._bucket_seconds = bucket_seconds
+        self._buckets = buckets
+        self._games = {}  # Game code -> game index
+        self._removed = {}  # Game code -> game index of the games removed from the catalog
+        self._codes = []  # Game index -> game code
+        self._prices = array('d')  # Game index -> price of a play
+        self._machine_plays = array('q')
+        self._machine_revenue = array('d')
+        self._game_plays = array('q')
+        self._game_revenue = array('d')
+        self._slot_bucket = array('q', [-1]) * buckets  # Slot of the ring -> bucket number it holds
+        self._slot_plays = array('q', [0]) * buckets
+        self._slot_revenue = array('d', [0.0]) * buckets
+        self._slot_game_revenue = [{} for _ in range(buckets)]  # Slot of the ring -> {game index -> revenue}
+        self.unknown = 0
+        self._load_prices()
+        self._catalog.subscribe(self._changed)
+
+    def _changed(self, event, game, previous):
+        if event == "reset":
+            self._load_prices()
+        elif event == "remove":
+            self._retire(game._code)
+        else:
+            if previous and "_code" in previous:
+                index = self._games.pop(previous["_code"], None)
+                if index is not None and game._code not in self._games:
+                    self._games[game._code] = index
+                    self._codes[index] = game._code
+            self._set_price(game)
+
+    def _retire(self, code):
+        index = self._games.pop(code, None)
+        if index is not None:
+            self._removed[code] = index
+
+    def _load_prices(self):
+        codes = set()
+        for game in self._catalog:
+            self._set_price(game)
+            codes.add(game._code)
+        for code in [code for code in self._games if code not in codes]:
+            self._retire(code)
+
+    def _set_price(self, game):
+        index = self._games.get(game._code)
+        if index is None and game._code in self._removed:
+            index = self._games[game._code] = self._removed.pop(game._code)
+            self._prices[index] = float(game._price_game)
+        elif index is None:
+            index = self._games[game._code] = len(self._codes)
+            self._codes.append(game._code)
+            self._prices.append(float(game._price_game))
+            self._game_plays.append(0)
+            self._game_revenue.append(0.0)
+        else:
+            self._prices[index] = float(game._price_game)
+
+    def _grow_machines(self, machine_id):
+        missing = machine_id + 1 - len(self._machine_plays)
+        self._machine_plays.extend(array('q', [0]) * missing)
+        self._machine_revenue.extend(array('d', [0.0]) * missing)
+
+    def ingest(self, machine_ids, game_codes, timestamps):
+        """
+        Ingests a batch of play events given as three parallel sequences.
+
+        Events older than the ring of buckets are still counted in the totals
+        of their machine and game, but not in the rolling windows.
+
+        Returns:
+        --------
+        int : The number of events charged.
+        """
+        games, prices = self._games, self._prices
+        machine_plays, machine_revenue = self._machine_plays, self._machine_revenue
+        game_plays, game_revenue = self._game_plays, self._game_revenue
+        slot_bucket, slot_plays, slot_revenue = self._slot_bucket, self._slot_plays, self._slot_revenue
+        slot_game_revenue = self._slot_game_revenue
+        bucket_seconds, buckets = self._bucket_seconds, self._buckets
+        machines = len(machine_plays)
+        charged = 0
+        for machine_id, code, timestamp in zip(machine_ids, game_codes, timestamps):
+            game = games.get(code)
+            if game is None:
+                self.unknown += 1
+                continue
+            if machine_id >= machines:
+                self._grow_machines(machine_id)
+                machines = len(machine_plays)
+            price = prices[game]
+            machine_plays[machine_id] += 1
+            machine_revenue[machine_id] += price
+            game_plays[game] += 1
+            game_revenue[game] += price
+            bucket = int(timestamp // bucket_seconds)
+            slot = bucket % buckets
+            held = slot_bucket[slot]
+            if held != bucket:
+                if held > bucket:
+                    charged += 1
+                    continue  # Older than the ring
+                slot_bucket[slot] = bucket
+                slot_plays[slot] = 0
+                slot_revenue[slot] = 0.0
+                slot_game_revenue[slot] = {}
+            slot_plays[slot] += 1
+            slot_revenue[slot] += price
+            games_revenue = slot_game_revenue[slot]
+            games_revenue[game] = games_revenue.get(game, 0.0) + price
+            charged += 1
+        return charged
+
+    def ingest_events(self, events):
+        """Ingests a batch of (machine id, game code, timestamp) events."""
+        events = list(events)
+        if not events:
+            return 0
+        return self.ingest(*zip(*events))
+
+    def machine(self, machine_id):
+        """Returns (plays, revenue) of a machine."""
+        if machine_id >= len(self._machine_plays):
+            return 0, 0.0
+        return self._machine_plays[machine_id], self._machine_revenue[machine_id]
+
+    def game(self, code):
+        """Returns (plays, revenue) of a game."""
+        index = self._games.get(code, self._removed.get(code))
+        if index is None:
+            return 0, 0.0
+        return self._game_plays[index], self._game_revenue[index]
+
+    def top_machines(self, k=10):
+        """Returns the (machine id, revenue) of the k machines with the most revenue."""
+        revenue = self._machine_revenue
+        return [(machine_id, revenue[machine_id])
+                for machine_id in nlargest(k, range(len(revenue)), key=revenue.__getitem__)]
+
+    def top_games(self, k=10):
+        """Returns the (game code, revenue) of the k games with the most revenue."""
+        revenue = self._game_revenue
+        return [(self._codes[index], revenue[index])
+                for index in nlargest(k, range(len(revenue)), key=revenue.__getitem__)]
+
+    def _slots(self, seconds, now):
+        """Yields the slots of the buckets of the last seconds up to now (at most the whole ring)."""
+        last = int((time.time() if now is None else now) // self._bucket_seconds)
+        count = min(self._buckets, max(1, -(-seconds // self._bucket_seconds)))
+        slot_bucket = self._slot_bucket
+        for bucket in range(last - count + 1, last + 1):
+            slot = bucket % self._buckets
+            if slot_bucket[slot] == bucket:
+                yield slot
+
+    def window(self, seconds, now=None, game_code=None):
+        """
+        Returns the (plays, revenue) of the last seconds up to now, rounded to
+        whole buckets; with game_code, only the revenue of that game (plays 0).
+        """
+        if game_code is not None:
+            index = self._games.get(game_code, self._removed.get(game_code))
+            if index is None:
+                return 0, 0.0
+            slot_game_revenue = self._slot_game_revenue
+            return 0, sum(slot_game_revenue[slot].get(index, 0.0) for slot in self._slots(seconds, now))
+        plays = revenue = 0
+        for slot in self._slots(seconds, now):
+            plays += self._slot_plays[slot]
+            revenue += self._slot_revenue[slot]
+        return plays, float(revenue)
+
+    def series(self, seconds, now=None):
+        """Returns the revenue of every bucket of the last seconds up to now, oldest first (0 for empty buckets)."""
+        last = int((time.time() if now is None else now) // self._bucket_seconds)
+        count = min(self._buckets, max(1, -(-seconds // self._bucket_seconds)))
+        result = []
+        for bucket in range(last - count + 1, last + 1):
+            slot = bucket % self._buckets
+            result.append(self._slot_revenue[slot] if self._slot_bucket[slot] == bucket else 0.0)
+        return result
+
+
+if __name__ == "__main__":
+    # 10k machines playing the sample games of cli.py for an hour
+    import random
+    import cli  # noqa: F401 (registers the sample games)
+
+    rng = random.Random(5)
+    codes = [game._code for game in Game.available_games]
+    start_time = 1_700_000_000
+    count = 5_000_000
+    machine_ids = [rng.randrange(10_000) for _ in range(count)]
+    game_codes = rng.choices(codes, k=count)
+    timestamps = sorted(start_time + rng.random() * 3600 for _ in range(count))
+    meter = PlayMeter()
+    batch = 100_000
+    start = time.perf_counter()
+    for first in range(0, count, batch):
+        meter.ingest(machine_ids[first:first + batch], game_codes[first:first + batch],
+                     timestamps[first:first + batch])
+    elapsed = time.perf_counter() - start
+    print(f"{count} events in {elapsed:.2f}s: {count / elapsed * 60 / 1e6:.0f}M events per minute")
+
+    plays, revenue = meter.window(2 * 3600, now=start_time + 3600)
+    assert plays == count
+    expected = sum(Game.available_games.by_code(code)._price_game for code in game_codes)
+    assert abs(revenue - expected) < 1e-6 * expected
+    print(f"Whole run: {plays} plays, ${revenue:,.2f}; last 10 minutes: "
+          f"${meter.window(600, now=start_time + 3599)[1]:,.2f}")
+    print("Top games:", ", ".join(f"{Game.available_games.by_code(code)._title} ${value:,.2f}"
+                                  for code, value in meter.top_games(3)))
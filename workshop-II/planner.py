@@ -0,0 +1,273 @@
+"""
+This module contains the power and floor load planner for venues. A venue is
+described by its electrical circuits and by the floor zones those circuits
+feed; the planner places a requested mix of arcade machines on the circuits
+without exceeding the circuit power, the floor load or the heat budget of the
+zones, using a best-fit decreasing heuristic.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+from bisect import bisect_left, insort
+
+from ArcadeMachine import machine_type_of
+
+
+class Zone:
+    """
+    Represents a floor zone of a venue.
+
+    Attributes:
+    -----------
+    name : str
+        The name of the zone.
+    max_load : float
+        The maximum weight (kg) the floor of the zone can hold.
+    max_heat : float
+        The heat (W) the air conditioning of the zone can remove. Arcade
+        machines turn practically all the power they use into heat.
+        None means that the zone has no thermal limit.
+    """
+    def __init__(self, name, max_load, max_heat=None):
+        self.name = name
+        self.max_load = max_load
+        self.max_heat = max_heat
+        self.load = 0.0
+        self.heat = 0.0
+
+    def copy(self):
+        """Returns an empty zone with the same limits."""
+        return Zone(self.name, self.max_load, self.max_heat)
+
+    def fits(self, power, weight):
+        """Checks if a machine with the given power and weight still fits in the zone."""
+        if self.load + weight > self.max_load:
+            return False
+        return self.max_heat is None or self.heat + power <= self.max_heat
+
+
+class Circuit:
+    """
+    Represents an electrical circuit of a venue.
+
+    Attributes:
+    -----------
+    name : str
+        The name of the circuit.
+    capacity : float
+        The rated power (W) of the circuit.
+    zone : Zone
+        The floor zone where the outlets of the circuit are.
+    derating : float
+        Fraction of the rated power that can be used by continuous loads.
+    """
+    def __init__(self, name, capacity, zone, derating=0.8):
+        self.name = name
+        self.capacity = capacity
+        self.zone = zone
+        self.derating = derating
+        self.usable = capacity * derating
+        self.used = 0.0
+        self.machines = []
+
+    def copy(self, zone):
+        """Returns an empty circuit with the same capacity, in the given zone."""
+        return Circuit(self.name, self.capacity, zone, self.derating)
+
+
+class Plan:
+    """
+    Result of the planner.
+
+    Attributes:
+    -----------
+    circuits : list
+        The circuits of the venue with the machines placed on them. They are
+        copies made for this plan, so later plans do not change them.
+    zones : list
+        The zones of the circuits, with their load and heat.
+    unplaced : dict
+        Number of machines of every type that did not fit in the venue.
+    """
+    def __init__(self, circuits, zones, unplaced):
+        self.circuits = circuits
+        self.zones = zones
+        self.unplaced = unplaced
+
+    def placed(self):
+        """Returns the number of machines placed on the circuits."""
+        return sum(len(circuit.machines) for circuit in self.circuits)
+
+    def circuit_utilisation(self):
+        """Returns the fraction of the usable power used on every circuit."""
+        return {circuit.name: circuit.used / circuit.usable if circuit.usable else 0.0 for circuit in self.circuits}
+
+    def zone_utilisation(self):
+        """Returns the fraction of the floor load used on every zone."""
+        return {zone.name: zone.load / zone.max_load if zone.max_load else 0.0 for zone in self.zones}
+
+    def __str__(self):
+        lines = [f"Placed machines: {self.placed()}"]
+        for circuit in self.circuits:
+            if circuit.machines:
+                lines.append(f"- {circuit.name} ({circuit.zone.name}): {len(circuit.machines)} machines, "
+                             f"{circuit.used:.0f}W of {circuit.usable:.0f}W")
+        for machine_type, count in self.unplaced.items():
+            lines.append(f"Unplaced {machine_type}: {count}")
+        return "\n".join(lines)
+
+
+class PowerPlanner:
+    """
+    Places arcade machines on the circuits of a venue.
+
+    The machines are placed from the most to the least power hungry. Every
+    machine goes to the circuit with the least remaining power that can still
+    hold it (best fit) and whose zone still has floor load and heat budget.
+    The remaining power of the circuits is kept in a sorted list, so every
+    placement is a binary search instead of a scan of all the circuits.
+    """
+    def __init__(self, circuits):
+        """
+        Initializes the planner.
+
+        Parameters:
+        -----------
+        circuits : list
+            The circuits of the venue (their zones are taken from them). They
+            are not changed: every plan places the machines on copies.
+        """
+        self._circuits = circuits
+
+    def _venue(self):
+        """Returns empty copies of the circuits and of their zones, for one plan."""
+        zones = {}
+        circuits = []
+        for circuit in self._circuits:
+            zone = zones.get(id(circuit.zone))
+            if zone is None:
+                zone = zones[id(circuit.zone)] = circuit.zone.copy()
+            circuits.append(circuit.copy(zone))
+        return circuits, list(zones.values())
+
+    def _place(self, items):
+        """
+        Places (machine_type, power, weight, machine) items and returns the plan.
+        """
+        circuits, zones = self._venue()
+        free = sorted((circuit.usable, index) for index, circuit in enumerate(circuits))
+        unplaced = {}
+        if not items:
+            return Plan(circuits, zones, unplaced)
+        items = sorted(items, key=lambda item: (item[1], item[2]), reverse=True)
+        min_power = min(item[1] for item in items)
+        min_weight = min(item[2] for item in items)
+        failed = set()  # Sizes that fit nowhere; capacity only decreases, so they never will
+        for machine_type, power, weight, machine in items:
+            if (power, weight) in failed:
+                unplaced[machine_type] = unplaced.get(machine_type, 0) + 1
+                continue
+            position = bisect_left(free, (power, -1))
+            while position < len(free):
+                remaining, index = free[position]
+                circuit = circuits[index]
+                if circuit.zone.fits(power, weight):
+                    break
+                if not circuit.zone.fits(min_power, min_weight):
+                    del free[position]  # The zone is full, drop the circuit for good
+                else:
+                    position += 1
+            else:
+                failed.add((power, weight))
+                unplaced[machine_type] = unplaced.get(machine_type, 0) + 1
+                continue
+            del free[position]
+            circuit.used += power
+            circuit.machines.append(machine if machine is not None else machine_type)
+            circuit.zone.load += weight
+            circuit.zone.heat += power
+            insort(free, (remaining - power, index))
+        return Plan(circuits, zones, unplaced)
+
+    def plan(self, demand, specs):
+        """
+        Places a mix of machine types on the venue.
+
+        Parameters:
+        -----------
+        demand : dict
+            Number of machines wanted of every machine type.
+        specs : dict
+            The attributes of every machine type, with the same keys as the
+            defaults of the cli ('power_consumption' and 'weight').
+
+        Returns:
+        --------
+        Plan : The placement of the machines.
+        """
+        items = []
+        for machine_type, count in demand.items():
+            spec = specs[machine_type]
+            item = (machine_type, float(spec['power_consumption']), float(spec['weight']), None)
+            items.extend([item] * count)
+        return self._place(items)
+
+    def plan_machines(self, machines):
+        """Places already built machines, using their own power consumption and weight."""
+        return self._place([(machine_type_of(machine), machine._power_consumption, machine._weight, machine)
+                            for machine in machines])
+
+
+def synthetic_venue(circuit_count, circuits_per_zone=10, circuit_capacity=3680, zone_load=2500, zone_heat=None):
+    """Creates the circuits of a synthetic venue, used to benchmark the planner."""
+    circuits = []
+    zone = None
+    for index in range(circuit_count):
+        if index % circuits_per_zone == 0:
+            zone = Zone(f"Zone {index // circuits_per_zone + 1}", zone_load, zone_heat)
+        circuits.append(Circuit(f"Circuit {index + 1}", circuit_capacity, zone))
+    return circuits
+
+
+if __name__ == "__main__":
+    # Benchmark on synthetic venues with the power and weight of the cli defaults
+    import time
+
+    specs = {
+        "modern": {'power_consumption': 600, 'weight': 80.0},
+        "retro": {'power_consumption': 500, 'weight': 70.0},
+        "dance": {'power_consumption': 700, 'weight': 90.0},
+        "classical": {'power_consumption': 550, 'weight': 75.0},
+        "shooter": {'power_consumption': 750, 'weight': 95.0},
+        "racing": {'power_consumption': 800, 'weight': 100.0},
+        "vr": {'power_consumption': 900, 'weight': 110.0}
+    }
+    for circuit_count in (50, 200, 800):
+        per_type = circuit_count * 4 // len(specs)
+        planner = PowerPlanner(synthetic_venue(circuit_count, circuits_per_zone=4, zone_load=1500, zone_heat=12000))
+        demand = {machine_type: per_type for machine_type in specs}
+        start = time.perf_counter()
+        result = planner.plan(demand, specs)
+        elapsed = time.perf_counter() - start
+        utilisation = result.circuit_utilisation().values()
+        print(f"{circuit_count} circuits, {per_type * len(specs)} machines: "
+              f"placed {result.placed()} in {elapsed * 1000:.1f}ms, "
+              f"mean circuit use {sum(utilisation) / len(utilisation):.0%}, "
+              f"unplaced {sum(result.unplaced.values())}")
@@ -0,0 +1,125 @@
+"""
+This module contains the batch replay of orders. Every build of a batch ran
+with the garbage collector scanning the whole static catalog (games, indexes,
+modules) again and again as the new machines triggered collections.
+
+frozen_catalog runs a batch with the objects that already exist moved out of
+the collector (gc.freeze) and with a higher threshold for the youngest
+generation, and replay_orders builds a batch of orders inside it. On a warm
+replay (see the benchmark below) it removes almost every collection, but the
+time per order stays the same: most of it is the validation of the spec.
+
+A pool of builders reset between orders was tried too and removed: reset
+clears and refills the dict of the builder, so reusing one only saves the
+builder object itself, one allocation of the dozens of an order, with no
+measurable gain in time.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import gc
+from contextlib import contextmanager
+
+from validation import build_order
+
+GC_THRESHOLD = 50_000  # Allocations between collections of the youngest generation during a batch
+
+
+@contextmanager
+def frozen_catalog(threshold=GC_THRESHOLD):
+    """
+    Runs a batch with the objects created so far (the static catalog) frozen
+    out of the garbage collector, so collections during the batch only scan
+    the new objects, and with a higher threshold for the youngest generation.
+
+    gc.freeze is global to the process and cannot be undone for only some
+    objects. If objects were already frozen when the batch starts (by the
+    caller or an outer frozen_catalog), the batch leaves everything frozen
+    for whoever froze first to release; otherwise it unfreezes on exit.
+
+    No collection runs before freezing: a full collection costs a few
+    milliseconds, more than it saves on a batch of a few thousand orders,
+    and garbage frozen with the catalog is collected once it is unfrozen.
+
+    Parameters:
+    -----------
+    threshold : int
+        The threshold of the youngest generation during the batch (None
+        keeps the current one).
+    """
+    previous = gc.get_threshold()
+    frozen_before = gc.get_freeze_count()
+    gc.freeze()
+    if threshold:
+        gc.set_threshold(threshold, *previous[1:])
+    try:
+        yield
+    finally:
+        gc.set_threshold(*previous)
+        if not frozen_before:
+            gc.unfreeze()
+
+
+def replay_orders(specs, defaults, games=None):
+    """
+    Returns the machines of order specs (see validation.build_order), built
+    as one batch with the static catalog frozen (see frozen_catalog).
+    """
+    with frozen_catalog():
+        return [build_order(spec, defaults, games) for spec in specs]
+
+
+if __name__ == "__main__":
+    # Time, collections and allocations of a warm replay of 50k orders kept in memory, with and without
+    # the frozen catalog. Every order is validated, so both are slower than the unvalidated reference of
+    # differential.py.
+    import sys
+    import time
+    from spec_catalog import current
+    from synthetic import orders, games as synthetic_games
+
+    for _ in synthetic_games(5000, seed=3, start_code=50_000, register=True):
+        pass
+    specs = list(orders(50_000, seed=3, game_count=5000, start_code=50_000))
+
+    def plain():
+        return [build_order(spec, current()) for spec in specs]
+
+    def frozen():
+        return replay_orders(specs, current())
+
+    for label, replay in (("plain", plain), ("frozen catalog", frozen)):
+        del replay()[:]  # Warm up
+        elapsed = None
+        for _ in range(5):
+            collections = sum(stats["collections"] for stats in gc.get_stats())
+            start = time.perf_counter()
+            machines = replay()
+            run = time.perf_counter() - start
+            collections = sum(stats["collections"] for stats in gc.get_stats()) - collections
+            elapsed = run if elapsed is None else min(elapsed, run)
+            del machines
+        # Memory blocks still allocated per order once the replay returns (the machines kept)
+        blocks = sys.getallocatedblocks()
+        machines = replay()
+        blocks = sys.getallocatedblocks() - blocks
+        del machines
+        print(f"{label}: {elapsed / len(specs) * 1e6:.1f}us per order (best of 5), {collections} collections, "
+              f"{blocks / len(specs):.1f} blocks kept per order")
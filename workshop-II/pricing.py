@@ -0,0 +1,295 @@
+"""
+This module contains the pricing rule engine of the arcade catalog. Prices are
+described with declarative rules (promotions, volume discounts, game bundles
+and accessory surcharges). The rules are compiled once into an index by the
+attribute values they require, so a quote only evaluates the rules that can
+match the machine being quoted, however many rules exist.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+from datetime import date
+from itertools import combinations
+from math import comb
+
+from ArcadeMachine import Glasses, Resolution, SimRacing, machine_type_of
+from analytics import order_price
+
+# Machine attributes a rule can require, with the attribute of the machine they come from
+CONDITION_FIELDS = {
+    "machine_type": None,
+    "material": "_material",
+    "color": "_color",
+    "lights": "_lights",
+    "sound": "_sound",
+    "glasses_type": "_glasses_type",
+    "glasses_resolution": "_glasses_resolution",
+    "type_sim_racing": "_type_sim_racing",
+    "add_gearbox": "_add_gearbox",
+    "gun_color": "_gun_color",
+    "make_vibration": "_make_vibration"
+}
+
+ACTIONS = ("multiply", "percent_off", "add")
+
+
+class PriceRule:
+    """
+    A declarative pricing rule.
+
+    Attributes:
+    -----------
+    name : str
+        The name shown in the quote when the rule is applied.
+    action : str
+        "multiply" (the price is multiplied by amount), "percent_off"
+        (amount percent is discounted) or "add" (amount is added per unit;
+        negative amounts are discounts).
+    amount : float
+        The value used by the action.
+    conditions : dict
+        Machine attributes (see CONDITION_FIELDS) and the value they must have.
+    games : tuple
+        Codes of games that must all be installed (game bundles).
+    min_quantity : int
+        The minimum number of units ordered (volume discounts).
+    start, end : date
+        The optional period in which the rule is valid (promotions).
+    priority : int
+        Rules are applied from the lowest to the highest priority.
+    """
+    def __init__(self, name, action, amount, conditions=None, games=(), min_quantity=1,
+                 start=None, end=None, priority=0):
+        if action not in ACTIONS:
+            raise ValueError(f"Invalid pricing action: {action}")
+        unknown = set(conditions or ()) - set(CONDITION_FIELDS)
+        if unknown:
+            raise ValueError(f"Invalid pricing conditions: {', '.join(sorted(unknown))}")
+        self.name = name
+        self.action = action
+        self.amount = amount
+        self.conditions = dict(conditions or {})
+        self.games = tuple(games)
+        self.min_quantity = min_quantity
+        self.start = start
+        self.end = end
+        self.priority = priority
+
+    def matches(self, context, quantity, day):
+        """Checks every condition of the rule against a quote context."""
+        if quantity < self.min_quantity:
+            return False
+        if (self.start is not None and day < self.start) or (self.end is not None and day > self.end):
+            return False
+        for field, value in self.conditions.items():
+            if context.get(field) != value:
+                return False
+        installed = context["games"]
+        return all(code in installed for code in self.games)
+
+    def apply(self, price):
+        """Returns the unit price after applying the rule."""
+        if self.action == "multiply":
+            return price * self.amount
+        if self.action == "percent_off":
+            return price * (1 - self.amount / 100)
+        return price + self.amount
+
+
+class Quote:
+    """
+    Result of pricing a machine.
+
+    Attributes:
+    -----------
+    base_price : float
+        The unit price before the rules (base price plus accessories).
+    unit_price : float
+        The unit price after the rules.
+    quantity : int
+        The number of units.
+    applied : list
+        The names of the rules applied, in order.
+    """
+    def __init__(self, base_price, unit_price, quantity, applied):
+        self.base_price = base_price
+        self.unit_price = unit_price
+        self.quantity = quantity
+        self.applied = applied
+
+    @property
+    def total(self):
+        return self.unit_price * self.quantity
+
+    def __str__(self):
+        rules = ", ".join(self.applied) if self.applied else "none"
+        return (f"Base price: ${self.base_price:.2f}, Unit price: ${self.unit_price:.2f}, "
+                f"Quantity: {self.quantity}, Total: ${self.total:.2f}, Rules: {rules}")
+
+
+def quote_context(machine):
+    """Returns the attributes of a machine that rules can require."""
+    context = {"machine_type": machine_type_of(machine)}
+    for field, attribute in CONDITION_FIELDS.items():
+        if attribute is not None:
+            context[field] = getattr(machine, attribute, None)
+    context["games"] = {game._code for game in machine._games}
+    return context
+
+
+class PricingEngine:
+    """
+    Evaluates pricing rules.
+
+    compile() groups the rules by signature: the attributes they require and
+    the size of their game bundle. Inside a signature the rules are indexed
+    by the exact values they require. A quote makes one lookup per signature
+    (with every combination of installed games of the bundle size), so it
+    only evaluates the rules that require the values of the quoted machine,
+    however many rules exist for other values.
+    """
+    MAX_BUNDLE_COMBINATIONS = 256
+
+    def __init__(self, rules=()):
+        self._rules = list(rules)
+        self._tables = None
+
+    def add_rule(self, rule):
+        """Adds a rule; the index is compiled again on the next quote."""
+        self._rules.append(rule)
+        self._tables = None
+
+    def compile(self):
+        """Builds the index of the rules."""
+        tables = {}
+        for order, rule in enumerate(self._rules):
+            fields = tuple(sorted(rule.conditions))
+            signature = (fields, len(rule.games))
+            key = tuple(rule.conditions[field] for field in fields) + tuple(sorted(rule.games))
+            tables.setdefault(signature, {}).setdefault(key, []).append((rule.priority, order, rule))
+        self._tables = tables
+
+    def _candidates(self, context):
+        candidates = []
+        installed = sorted(context["games"])
+        for (fields, bundle_size), table in self._tables.items():
+            values = tuple(context.get(field) for field in fields)
+            if bundle_size == 0:
+                candidates.extend(table.get(values, ()))
+            elif bundle_size > len(installed):
+                continue
+            elif comb(len(installed), bundle_size) <= self.MAX_BUNDLE_COMBINATIONS:
+                for codes in combinations(installed, bundle_size):
+                    candidates.extend(table.get(values + codes, ()))
+            else:
+                for key, entries in table.items():  # Too many combinations, scan the signature
+                    if key[:len(fields)] == values:
+                        candidates.extend(entries)
+        return candidates
+
+    def quote(self, machine, quantity=1, day=None):
+        """
+        Prices a machine.
+
+        Parameters:
+        -----------
+        machine : ArcadeMachine
+            The configured machine, with its installed games.
+        quantity : int
+            The number of units ordered.
+        day : date
+            The day of the quote, used by promotions (today by default).
+
+        Returns:
+        --------
+        Quote : The price and the rules applied.
+        """
+        if self._tables is None:
+            self.compile()
+        day = day or date.today()
+        context = quote_context(machine)
+        candidates = self._candidates(context)
+        candidates.sort(key=lambda entry: entry[:2])
+        base = order_price(machine)
+        price = base
+        applied = []
+        for _, _, rule in candidates:
+            if rule.matches(context, quantity, day):
+                price = rule.apply(price)
+                applied.append(rule.name)
+        return Quote(base, price, quantity, applied)
+
+
+# Accessory surcharges applied by default
+DEFAULT_RULES = [
+    PriceRule("Valve Index glasses", "add", 150, {"glasses_type": Glasses.VALVE_INDEX}),
+    PriceRule("HTC Vive glasses", "add", 100, {"glasses_type": Glasses.HTC_Vive}),
+    PriceRule("QHD resolution", "add", 80, {"glasses_resolution": Resolution.QHD}),
+    PriceRule("UHD resolution", "add", 200, {"glasses_resolution": Resolution.UHD}),
+    PriceRule("Force feedback rig", "add", 350, {"type_sim_racing": SimRacing.PROFESIONAL}),
+    PriceRule("Digital rig", "add", 150, {"type_sim_racing": SimRacing.AMATEUR}),
+    PriceRule("Gearbox", "add", 90, {"machine_type": "racing", "add_gearbox": True})
+]
+
+
+if __name__ == "__main__":
+    # Benchmark: quote latency as the number of rules grows
+    import random
+    import time
+    from ArcadeMachine import ArcadeMachineBuilder, Material, Color, Game
+
+    random.seed(3)
+    games = [Game(f"Game {i}", str(i), "racing", "-", "-", "-", 1.0, "2024") for i in range(200)]
+    builder = ArcadeMachineBuilder()
+    builder.set_attributes({'base_price': 2200, 'dimensions': '2.00mx1.00mx1.00m', 'weight': 100.0,
+                            'power_consumption': 800, 'memory': '16GB', 'processor': 'Intel Core i9'})
+    builder.set_type_sim_racing(SimRacing.PROFESIONAL).set_add_gearbox(True)
+    machines = []
+    for _ in range(1000):
+        builder.set_material(random.choice(list(Material))).set_color(random.choice(list(Color)))
+        machine = builder.build_racing()
+        for game in random.sample(games, 3):
+            machine.add_game(game)
+        machines.append(machine)
+
+    def random_rule(number):
+        kind = random.random()
+        if kind < 0.4:
+            return PriceRule(f"Bundle {number}", "add", -10,
+                             games=[game._code for game in random.sample(games, 2)])
+        if kind < 0.7:
+            return PriceRule(f"Promo {number}", "percent_off", 5,
+                             {"machine_type": random.choice(["modern", "retro", "dance", "vr"]),
+                              "color": random.choice(list(Color))})
+        return PriceRule(f"Volume {number}", "percent_off", 2,
+                         {"material": random.choice(list(Material)), "color": random.choice(list(Color)),
+                          "lights": random.choice(list(Color))},
+                         min_quantity=random.randint(2, 50))
+
+    for rule_count in (10, 100, 1000, 10000):
+        engine = PricingEngine(DEFAULT_RULES + [random_rule(i) for i in range(rule_count)])
+        engine.compile()
+        start = time.perf_counter()
+        applied = 0
+        for machine in machines:
+            applied += len(engine.quote(machine, quantity=10).applied)
+        elapsed = (time.perf_counter() - start) / len(machines)
+        print(f"{rule_count} rules: {elapsed * 1e6:.1f}us per quote, "
+              f"{applied / len(machines):.1f} rules applied per quote")
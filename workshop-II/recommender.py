@@ -0,0 +1,266 @@
+"""
+This module contains the game recommender of the arcade catalog. It ranks the
+games compatible with a configured machine using how often games are installed
+together in past orders and the category, graphics creator and year they share
+with the games already installed. The co-install counts are a sparse matrix
+updated incrementally every time an order is completed.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+from heapq import nlargest
+
+from ArcadeMachine import machine_type_of
+from arcade_common.game_catalog import GameCatalog
+
+# Attributes of Game compared between titles
+ATTRIBUTES = ("_category", "graphics_creator", "_year")
+
+
+class _TopList:
+    """
+    The most installed games of a group (machine type or shared attribute).
+
+    Only the `size` best games are kept ordered; an install count update
+    touches this short list and not the whole group.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.codes = []
+
+    def add(self, code):
+        if len(self.codes) < self.size:
+            self.codes.append(code)
+
+    def discard(self, code):
+        if code in self.codes:
+            self.codes.remove(code)
+
+    def update(self, code, popularity):
+        """Moves a game up the list after its install count grew."""
+        codes = self.codes
+        count = popularity.get(code, 0)
+        if code in codes:
+            position = codes.index(code)
+        elif len(codes) < self.size:
+            codes.append(code)
+            position = len(codes) - 1
+        elif count > popularity.get(codes[-1], 0):
+            codes[-1] = code
+            position = len(codes) - 1
+        else:
+            return
+        while position > 0 and popularity.get(codes[position - 1], 0) < count:
+            codes[position] = codes[position - 1]
+            position -= 1
+        codes[position] = code
+
+
+class GameRecommender:
+    """
+    Recommends games for a configured machine.
+
+    The score of a candidate game is CO_INSTALL_WEIGHT times the number of
+    past orders where it was installed together with each game of the cart,
+    plus ATTRIBUTE_WEIGHT for every attribute it shares with them. Candidates
+    come from the co-install rows of the cart games and from the most
+    installed games of each shared attribute, so the cost of a request does
+    not depend on the size of the catalog.
+
+    The recommender can be subscribed to an ArcadeCatalog:
+
+        recommender = GameRecommender(Game.available_games)
+        catalog.subscribe(recommender.record_order)
+
+    Given a GameCatalog (such as Game.available_games), it also subscribes to
+    it, so games added, changed or removed later are recommended accordingly.
+    """
+    CO_INSTALL_WEIGHT = 1.0
+    ATTRIBUTE_WEIGHT = 0.5
+    TOP_SIZE = 32
+
+    def __init__(self, games=()):
+        """Initializes the recommender with the games of the catalog."""
+        self._games = {}  # Code -> Game
+        self._types = {}  # Code -> machine type of the game
+        self._by_type = {}  # Machine type -> _TopList
+        self._by_attribute = {}  # (machine type, attribute, value) -> _TopList
+        self._popularity = {}  # Code -> number of installs
+        self._co_installs = {}  # Code -> {code -> number of orders with both}
+        for game in games:
+            self.add_game(game)
+        if isinstance(games, GameCatalog):
+            self._catalog = games
+            games.subscribe(self._changed)
+
+    def _changed(self, event, game, previous):
+        if event == "add":
+            self.add_game(game)
+        elif event == "remove":
+            self.remove_game(game)
+        elif event == "update":
+            if "_code" in previous or "_type" in previous or any(attribute in previous for attribute in ATTRIBUTES):
+                self.remove_game(game, previous)
+                self.add_game(game)
+        else:  # Reset: the whole catalog may have changed
+            present = set(self._catalog)
+            for old in [old for old in self._games.values() if old not in present]:
+                self.remove_game(old)
+            for new in self._catalog:
+                if self._games.get(new._code) is not new:
+                    self.add_game(new)
+
+    def _groups(self, game, previous=None):
+        """Yields the groups of a game (with the values in previous instead of the current ones)."""
+        previous = previous or {}
+        game_type = previous.get("_type", game._type).lower()
+        yield self._by_type.setdefault(game_type, _TopList(self.TOP_SIZE))
+        for attribute in ATTRIBUTES:
+            key = (game_type, attribute, previous.get(attribute, getattr(game, attribute)))
+            yield self._by_attribute.setdefault(key, _TopList(self.TOP_SIZE))
+
+    def add_game(self, game):
+        """Registers a new game of the catalog."""
+        code = game._code
+        self._games[code] = game
+        self._types[code] = game._type.lower()
+        for group in self._groups(game):
+            if code in self._popularity:
+                group.update(code, self._popularity)
+            else:
+                group.add(code)
+
+    def remove_game(self, game, previous=None):
+        """
+        Stops recommending a game; previous holds the old values of the
+        attributes of a game that changed (see GameCatalog.update). Its
+        install counts are kept, under its new code if it changed.
+        """
+        code = (previous or {}).get("_code", game._code)
+        if self._games.get(code) is not game:
+            return
+        del self._games[code]
+        del self._types[code]
+        for group in self._groups(game, previous):
+            group.discard(code)
+        if code != game._code:
+            if code in self._popularity:
+                self._popularity[game._code] = self._popularity.pop(code)
+            if code in self._co_installs:
+                row = self._co_installs[game._code] = self._co_installs.pop(code)
+                for other in row:  # The rows of the games installed with it
+                    other_row = self._co_installs[other]
+                    other_row[game._code] = other_row.pop(code)
+
+    def record_order(self, machine, customer=None, quantity=1, unit_price=None):
+        """Updates the install and co-install counts with a completed order (the price is not used)."""
+        codes = [game._code for game in machine._games if game._code in self._games]
+        for code in codes:
+            self._popularity[code] = self._popularity.get(code, 0) + quantity
+            for group in self._groups(self._games[code]):
+                group.update(code, self._popularity)
+            row = self._co_installs.setdefault(code, {})
+            for other in codes:
+                if other != code:
+                    row[other] = row.get(other, 0) + quantity
+
+    def recommend(self, machine, k=5, installed=()):
+        """
+        Returns the k best games for a machine.
+
+        Parameters:
+        -----------
+        machine : ArcadeMachine or str
+            The configured machine (its installed games are used), or only
+            a machine type name.
+        k : int
+            The number of games to return.
+        installed : iterable, optional
+            The codes of the games chosen so far, when machine is a machine
+            type name (for a machine still being configured).
+
+        Returns:
+        --------
+        list : The recommended Game objects, best first.
+        """
+        if isinstance(machine, str):
+            machine_type, installed = machine.lower(), list(installed)
+        else:
+            machine_type, installed = machine_type_of(machine), [game._code for game in machine._games]
+        excluded = set(installed)
+        scores = {}
+        for code in installed:
+            for other, count in self._co_installs.get(code, {}).items():
+                scores[other] = scores.get(other, 0) + self.CO_INSTALL_WEIGHT * count
+            game = self._games.get(code)
+            if game is None:
+                continue
+            for attribute in ATTRIBUTES:
+                group = self._by_attribute.get((machine_type, attribute, getattr(game, attribute)))
+                if group is not None:
+                    for other in group.codes:
+                        scores[other] = scores.get(other, 0) + self.ATTRIBUTE_WEIGHT
+        popular = self._by_type.get(machine_type)
+        if popular is not None:
+            for other in popular.codes:
+                scores.setdefault(other, 0)
+        popularity = self._popularity
+        types = self._types
+        candidates = (code for code in scores
+                      if code not in excluded and types.get(code) == machine_type)
+        best = nlargest(k, candidates, key=lambda code: (scores[code], popularity.get(code, 0)))
+        return [self._games[code] for code in best]
+
+
+if __name__ == "__main__":
+    # Benchmark with a catalog of 100k titles and 200k past orders
+    import random
+    import time
+    from ArcadeMachine import Game, ArcadeMachineBuilder
+
+    random.seed(7)
+    categories = ["shooter", "puzzle", "racing", "music", "fighting", "sports", "rhythm", "action"]
+    creators = [f"Studio {i}" for i in range(500)]
+    games = []
+    for i in range(100_000):
+        game = Game.__new__(Game)  # Not registered in Game.available_games
+        game._title, game._code, game._type = f"Game {i}", str(i), "modern"
+        game._category, game.graphics_creator = random.choice(categories), random.choice(creators)
+        game._year, game._price_game = str(random.randint(1975, 2024)), 1.0
+        games.append(game)
+    recommender = GameRecommender(games)
+    builder = ArcadeMachineBuilder()
+    start = time.perf_counter()
+    for _ in range(200_000):
+        machine = builder.build_modern()
+        for game in random.sample(games[:2000], 3):
+            machine.add_game(game)
+        recommender.record_order(machine)
+    print(f"Recorded 200k orders in {time.perf_counter() - start:.2f}s")
+
+    carts = []
+    for _ in range(1000):
+        machine = builder.build_modern()
+        machine.add_game(random.choice(games[:2000]))
+        carts.append(machine)
+    start = time.perf_counter()
+    for machine in carts:
+        recommender.recommend(machine, k=5)
+    print(f"Mean recommendation time: {(time.perf_counter() - start) * 1000 / len(carts):.3f}ms")
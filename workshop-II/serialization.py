@@ -0,0 +1,356 @@
+"""
+This module contains the serializer of the arcade catalog. Every ArcadeMachine
+subclass, Game and Customer has a schema (the list of its fields and their
+kinds) that is compiled once into accessor functions, and objects are written
+either as compact JSON arrays or as a compact binary format, so machines and
+carts can be shipped between processes and services.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import gc
+import json
+import struct
+from contextlib import contextmanager
+
+from ArcadeMachine import (Material, Color, Sound, SimRacing, Glasses, Resolution,
+                           MACHINE_TYPES, Game, Customer)
+from specs import machine_specs
+
+# Fields of every ArcadeMachine, in order, with their kind (str, float, bool or an Enum class)
+MACHINE_FIELDS = (
+    ("_material", Material), ("_color", Color), ("_lights", Color), ("_sound", Sound),
+    ("_controls", str), ("_dimensions", str), ("_weight", float),
+    ("_power_consumption", float), ("_memory", str), ("_processor", str),
+    ("_base_price", float)
+)
+
+# Fields added by the subclasses
+EXTRA_FIELDS = {
+    "modern": (),
+    "retro": (),
+    "dance": (("_difficulties", str), ("_arrow_cardinalities", str), ("_controls_price", float)),
+    "classical": (("_make_vibration", bool), ("_sound_record_alert", bool)),
+    "shooter": (("_gun_color", Color),),
+    "racing": (("_type_sim_racing", SimRacing), ("_add_gearbox", bool)),
+    "vr": (("_glasses_type", Glasses), ("_glasses_resolution", Resolution), ("_glasses_price", float))
+}
+
+GAME_FIELDS = (
+    ("_title", str), ("_code", str), ("_type", str), ("_storytelling_creator", str),
+    ("graphics_creator", str), ("_category", str), ("_price_game", float), ("_year", str)
+)
+
+CUSTOMER_FIELDS = (("name", str), ("address", str), ("phone", str))
+
+_NONE = 255  # Enum index used for fields without value
+_SEPARATOR = "\x1f"  # Unit separator between the strings of a binary record
+
+
+class _Schema:
+    """
+    Compiled schema of a class.
+
+    The encoder and decoder of every class are generated once as Python
+    functions that read and write the attributes by name, so serializing an
+    object does not inspect it. Binary records are one struct with the tag,
+    the numbers, booleans and enum indexes and the length of the strings,
+    followed by the strings (and installed game codes) joined with a unit
+    separator.
+    """
+    def __init__(self, tag, cls, fields, has_games=False):
+        self.tag = tag
+        self.cls = cls
+        self.names = tuple(name for name, _ in fields)
+        self.has_games = has_games
+        fixed = [(name, kind) for name, kind in fields if kind is not str]
+        strings = [name for name, kind in fields if kind is str]
+        formats = {float: "d", bool: "?"}
+        self.struct = struct.Struct("<B" + "".join(formats.get(kind, "B") for _, kind in fixed)
+                                    + ("H" if has_games else "") + "I")
+        namespace = {"pack": self.struct.pack, "unpack_from": self.struct.unpack_from,
+                     "size": self.struct.size, "cls": cls, "new": object.__new__,
+                     "SEPARATOR": _SEPARATOR, "resolve": _resolve_games, "specs_of": machine_specs}
+        json_values, json_fields, packed, unpacked = [], [], [], []
+        for position, (name, kind) in enumerate(fields):
+            if kind in (str, float, bool):
+                json_values.append(f"obj.{name}")
+                json_fields.append(f"{name!r}: value[{position + 1}]")
+            else:
+                namespace[f"to{position}"] = {**_to_number(kind), None: _NONE}
+                namespace[f"from{position}"] = {**dict(enumerate(kind)), _NONE: None}
+                json_values.append(f"to{position}[obj.{name}]")
+                json_fields.append(f"{name!r}: from{position}[value[{position + 1}]]")
+        for index, (name, kind) in enumerate(fixed):
+            position = self.names.index(name)
+            if kind in (float, bool):
+                packed.append(f"obj.{name}")
+                unpacked.append(f"{name!r}: numbers[{index + 1}]")
+            else:
+                packed.append(f"to{position}[obj.{name}]")
+                unpacked.append(f"{name!r}: from{position}[numbers[{index + 1}]]")
+        unpacked += [f"{name!r}: parts[{index}]" for index, name in enumerate(strings)]
+        codes = " + [game._code for game in obj._games]" if has_games else ""
+        json_games = ", [game._code for game in obj._games]" if has_games else ""
+        game_count = "len(obj._games), " if has_games else ""
+        count = len(strings)
+        # Machines (the classes with games) get their parsed specs back, as when they are built
+        specs = "obj._specs = specs_of(obj._dimensions, obj._memory, obj._processor)" if has_games else ""
+        source = f"""
+def encode(obj):
+    strings = [{", ".join(f"obj.{name}" for name in strings)}]{codes}
+    text = SEPARATOR.join(strings)
+    if text.count(SEPARATOR) != len(strings) - 1:
+        raise ValueError("Cannot serialize {cls.__name__}: a string contains the unit separator (U+001F)")
+    text = text.encode("utf-8")
+    return pack({tag}, {"".join(value + ", " for value in packed)}{game_count}len(text)) + text
+
+def decode(data, offset, lookup):
+    numbers = unpack_from(data, offset)
+    start = offset + size
+    end = start + numbers[-1]
+    parts = data[start:end].decode("utf-8").split(SEPARATOR)
+    if len(parts) != {count}{" + numbers[-2]" if has_games else ""}:
+        raise ValueError("Corrupted record: a string contains the unit separator")
+    obj = new(cls)
+    obj.__dict__ = {{{", ".join(unpacked)}}}
+    {"obj._games = resolve(parts[" + str(count) + ":], lookup)" if has_games else ""}
+    {specs}
+    return obj, end
+
+def to_json(obj):
+    return [{tag}, {", ".join(json_values)}{json_games}]
+
+def from_json(value, lookup):
+    obj = new(cls)
+    obj.__dict__ = {{{", ".join(json_fields)}}}
+    {"obj._games = resolve(value[-1], lookup)" if has_games else ""}
+    {specs}
+    return obj
+"""
+        exec(source, namespace)
+        self.encode = namespace["encode"]
+        self.decode = namespace["decode"]
+        self.to_json = namespace["to_json"]
+        self.from_json = namespace["from_json"]
+        self.string_count = count
+
+
+def _to_number(kind):
+    return {member: index for index, member in enumerate(kind)}
+
+
+def _compile_schemas():
+    schemas = []
+    for machine_type, machine_class in MACHINE_TYPES.items():
+        schemas.append(_Schema(len(schemas), machine_class,
+                               MACHINE_FIELDS + EXTRA_FIELDS[machine_type], has_games=True))
+    schemas.append(_Schema(len(schemas), Game, GAME_FIELDS))
+    schemas.append(_Schema(len(schemas), Customer, CUSTOMER_FIELDS))
+    return schemas
+
+
+def _schema_of(obj):
+    try:
+        return _BY_CLASS[type(obj)]
+    except KeyError:
+        raise TypeError(f"Cannot serialize objects of type {type(obj).__name__}") from None
+
+
+def game_lookup(games=None):
+    """
+    Returns the code -> Game dict used to resolve installed games: games if
+    it is a dict, else built from games (Game.available_games by default).
+    Build it once to deserialize many values with from_json_value.
+    """
+    if games is None:
+        games = Game.available_games
+    if isinstance(games, dict):
+        return games
+    return {game._code: game for game in games}
+
+
+def _resolve_games(codes, lookup):
+    try:
+        return [lookup[code] for code in codes]
+    except KeyError as error:
+        raise ValueError(f"Unknown game code: {error.args[0]}") from None
+
+
+@contextmanager
+def gc_paused():
+    """
+    Pauses the cyclic garbage collector while a batch of objects is created.
+
+    The objects created do not form cycles, and collections triggered by
+    millions of new objects would only scan them again and again. Only use
+    it around code that creates no reference cycles.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _invalid(obj, error):
+    return ValueError(f"Cannot serialize {type(obj).__name__}: invalid value {error.args[0]!r}")
+
+
+SCHEMAS = _compile_schemas()
+_BY_CLASS = {schema.cls: schema for schema in SCHEMAS}
+
+
+# JSON
+
+def to_json_value(obj):
+    """
+    Returns the compact JSON value of an object: [tag, field, field, ...].
+
+    Enums are written as the index of the member and installed games as the
+    list of their codes.
+    """
+    try:
+        return _schema_of(obj).to_json(obj)
+    except KeyError as error:
+        raise _invalid(obj, error) from None
+
+
+def from_json_value(value, games=None, lookup=None):
+    """
+    Creates an object from its compact JSON value (see to_json_value).
+    lookup is a dict from game_lookup, reused instead of games across calls.
+    """
+    return SCHEMAS[value[0]].from_json(value, lookup if lookup is not None else game_lookup(games))
+
+
+def dumps_json(objs):
+    """Serializes an object, or a list of objects such as a cart, to compact JSON text."""
+    if isinstance(objs, (list, tuple)):
+        with gc_paused():
+            return json.dumps([to_json_value(obj) for obj in objs], separators=(",", ":"))
+    return json.dumps(to_json_value(objs), separators=(",", ":"))
+
+
+def loads_json(text, games=None):
+    """
+    Deserializes the text written by dumps_json.
+
+    Parameters:
+    -----------
+    text : str
+        The JSON text.
+    games : list or dict, optional
+        The games used to resolve installed game codes (Game.available_games by default).
+    """
+    with gc_paused():
+        value = json.loads(text)
+        lookup = game_lookup(games)
+        if not value or isinstance(value[0], list):  # A list of objects (an object starts with its tag)
+            return [SCHEMAS[item[0]].from_json(item, lookup) for item in value]
+        return from_json_value(value, lookup=lookup)
+
+
+# Binary
+
+_LIST = 0xFF  # First byte of a list of objects; an object starts with its tag, the index of its schema
+
+
+def _encode(obj):
+    schema = _schema_of(obj)
+    try:
+        return schema.encode(obj)
+    except KeyError as error:
+        raise _invalid(obj, error) from None
+
+
+def dumps_binary(objs):
+    """
+    Serializes an object, or a list of objects such as a cart, to compact binary data.
+
+    Lists start with a marker byte, so lists of one object or none are read
+    back as lists.
+
+    Raises:
+    -------
+    ValueError : If a string contains the unit separator character (\\x1f),
+        which separates the strings of a record and could not be read back.
+    """
+    if isinstance(objs, (list, tuple)):
+        by_class = _BY_CLASS
+        try:
+            return bytes((_LIST,)) + b"".join([by_class[type(obj)].encode(obj) for obj in objs])
+        except KeyError:
+            return b"".join([_encode(obj) for obj in objs])  # Finds the object and reports it
+    return _encode(objs)
+
+
+def iter_binary(data, games=None):
+    """Yields the objects of binary data written by dumps_binary."""
+    lookup = game_lookup(games)
+    schemas = SCHEMAS
+    offset = 1 if data[:1] == bytes((_LIST,)) else 0
+    end = len(data)
+    while offset < end:
+        obj, offset = schemas[data[offset]].decode(data, offset, lookup)
+        yield obj
+
+
+def loads_binary(data, games=None):
+    """
+    Deserializes the data written by dumps_binary.
+
+    Returns a list when a list was serialized, and a single object otherwise.
+    """
+    with gc_paused():
+        objs = list(iter_binary(data, games))
+    if data[:1] == bytes((_LIST,)):
+        return objs
+    if len(objs) != 1:
+        raise ValueError(f"Expected one object, found {len(objs)}")
+    return objs[0]
+
+
+if __name__ == "__main__":
+    # Round trip benchmark with 1M objects
+    import time
+    import cli  # The sample games of the catalog
+    from ArcadeMachine import ArcadeMachineBuilder, ArcadeMachineFactory
+
+    builder = ArcadeMachineBuilder()
+    builder.set_attributes({'base_price': 2500, 'dimensions': '2.10mx1.10mx1.10m', 'weight': 110.0,
+                            'power_consumption': 900, 'memory': '32GB', 'processor': 'Intel Core i9'})
+    builder.set_glasses_type(Glasses.VALVE_INDEX).set_glasses_resolution(Resolution.UHD).glasses_price(300)
+    machine = ArcadeMachineFactory.create_arcade_machine("vr", builder)
+    machine.add_game(Game.available_games[-1])
+    customer = Customer("Julian", "Calle 1 # 2-3, Bogota", "3001234567")
+    objs = [machine, customer] * 500_000
+
+    for name, dumps, loads in (("binary", dumps_binary, loads_binary), ("json", dumps_json, loads_json)):
+        start = time.perf_counter()
+        data = dumps(objs)
+        encoded = time.perf_counter()
+        result = loads(data)
+        decoded = time.perf_counter()
+        assert len(result) == len(objs)
+        print(f"{name}: {len(data) / len(objs):.0f} bytes per object, "
+              f"encode {encoded - start:.2f}s, decode {decoded - encoded:.2f}s for {len(objs)} objects")
@@ -0,0 +1,314 @@
+"""
+This module contains the catalog of the default specs of every machine type
+(base price, dimensions, weight, power consumption, memory and processor).
+They used to be a dict written inside cli.py, so only the cli could use them
+and changing a price meant changing the code; they are now read from a
+versioned file, machine_specs.json, validated once and frozen.
+
+The catalog of a process is loaded on first use and shared by everything in
+it. Worker processes forked after it is loaded inherit it as it is, and
+workers started with spawn receive it already validated (install), so no
+request parses the file. A running kiosk reloads the file after a SIGHUP:
+the signal handler only marks the reload as pending, and the next call to
+current() reads the file, so the handler never waits for a lock the
+interrupted code may hold. The new catalog replaces the old one in a single
+assignment, and orders being built keep the catalog they started with.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import hashlib
+import json
+import math
+import os
+import signal
+import sys
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from ArcadeMachine import MACHINE_TYPES
+from specs import parse_dimensions, parse_memory
+
+SPECS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "machine_specs.json")
+VERSION = 1  # Version of the file format read by this module
+
+# Fields of the defaults of a machine type and the types of their values
+FIELD_TYPES = {
+    "base_price": (int, float),
+    "dimensions": str,
+    "weight": (int, float),
+    "power_consumption": (int, float),
+    "memory": str,
+    "processor": str
+}
+_NUMBERS = ("base_price", "weight", "power_consumption")
+
+
+def validate(data):
+    """
+    Checks the content of a specs file and returns its defaults as a plain
+    dict of machine type -> fields.
+
+    Raises:
+    -------
+    ValueError : If the version is not supported, a machine type is unknown
+        or missing, or a field is missing, unknown or invalid.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("The machine specs must be an object.")
+    if data.get("version") != VERSION:
+        raise ValueError(f"Unsupported machine specs version: {data.get('version')!r} (expected {VERSION}).")
+    defaults = data.get("defaults")
+    if not isinstance(defaults, dict):
+        raise ValueError("The machine specs have no defaults.")
+    unknown = set(defaults) - set(MACHINE_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown machine types: {', '.join(sorted(unknown))}")
+    missing = set(MACHINE_TYPES) - set(defaults)
+    if missing:
+        raise ValueError(f"Machine types without defaults: {', '.join(sorted(missing))}")
+
+    result = {}
+    for machine_type, fields in defaults.items():
+        if not isinstance(fields, dict):
+            raise ValueError(f"The defaults of {machine_type} must be an object.")
+        if set(fields) != set(FIELD_TYPES):
+            wrong = sorted(set(fields) ^ set(FIELD_TYPES))
+            raise ValueError(f"Missing or unknown fields in the defaults of {machine_type}: {', '.join(wrong)}")
+        for field, kind in FIELD_TYPES.items():
+            value = fields[field]
+            if not isinstance(value, kind) or isinstance(value, bool):
+                raise ValueError(f"Invalid {field} of {machine_type}: {value!r}")
+        for field in _NUMBERS:
+            # NaN compares false with everything, so it is rejected apart
+            if not math.isfinite(fields[field]) or fields[field] <= 0:
+                raise ValueError(f"The {field} of {machine_type} must be a positive finite number.")
+        if not all(parse_dimensions(fields["dimensions"])):
+            raise ValueError(f"Invalid dimensions of {machine_type}: {fields['dimensions']!r}")
+        if not parse_memory(fields["memory"]):
+            raise ValueError(f"Invalid memory of {machine_type}: {fields['memory']!r}")
+        result[machine_type] = dict(fields)
+    return result
+
+
+def revision(defaults):
+    """Returns the content revision of defaults: a short hash of their canonical JSON."""
+    text = json.dumps(defaults, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+class SpecCatalog(Mapping):
+    """
+    Immutable defaults of every machine type: machine type -> read-only
+    mapping of fields, usable wherever the defaults dict was (such as
+    validation.build_order).
+
+    Attributes:
+    -----------
+    version : int
+        The version of the file format it was read from.
+    revision : str
+        A hash of the defaults: it changes when and only when their content
+        does, so reloads and worker processes can be told apart.
+    path : str
+        The file it was read from (None if built from a dict).
+    """
+    __slots__ = ("_defaults", "_version", "_revision", "_path")
+
+    def __init__(self, defaults, version=VERSION, path=None):
+        """Freezes validated defaults (see validate). Use load to read a file."""
+        frozen = {machine_type: MappingProxyType(dict(fields)) for machine_type, fields in defaults.items()}
+        object.__setattr__(self, "_defaults", MappingProxyType(frozen))
+        object.__setattr__(self, "_version", version)
+        object.__setattr__(self, "_revision", revision(defaults))
+        object.__setattr__(self, "_path", path)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SpecCatalog is immutable.")
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def revision(self):
+        return self._revision
+
+    @property
+    def path(self):
+        return self._path
+
+    def __getitem__(self, machine_type):
+        return self._defaults[machine_type]
+
+    def __iter__(self):
+        return iter(self._defaults)
+
+    def __len__(self):
+        return len(self._defaults)
+
+    def __reduce__(self):
+        # Sent to spawned workers as plain dicts, already validated
+        return SpecCatalog, ({machine_type: dict(fields) for machine_type, fields in self._defaults.items()},
+                             self._version, self._path)
+
+
+def load(path=SPECS_PATH):
+    """
+    Reads, validates and freezes a specs file.
+
+    Raises:
+    -------
+    OSError : If the file cannot be read.
+    ValueError : If it is not valid JSON or its content is invalid (see validate).
+    """
+    with open(path, encoding="utf-8") as file:
+        try:
+            data = json.load(file)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Invalid machine specs file {path}: {error}") from None
+    return SpecCatalog(validate(data), data["version"], path)
+
+
+_current = None
+_lock = threading.Lock()
+_reload_pending = False  # Set by the signal handler, applied by the next current()
+_signal_path = None  # The file reloaded on the signal (None: the file of the current catalog)
+
+
+def current():
+    """
+    Returns the catalog of the process, loading SPECS_PATH on first use.
+
+    Callers keep the returned catalog for the whole of an order, so a reload
+    in the middle does not mix the defaults of two files.
+    """
+    if _reload_pending:
+        _reload_requested()
+    catalog = _current
+    if catalog is None:
+        with _lock:
+            if _current is None:
+                install(load())
+            catalog = _current
+    return catalog
+
+
+def install(catalog):
+    """
+    Makes a catalog the catalog of the process. Also the initializer of
+    worker processes: ProcessPoolExecutor(initializer=install, initargs=(current(),)).
+    """
+    global _current
+    _current = catalog
+
+
+def reload(path=None):
+    """
+    Reads the specs file again and swaps it in. If the new file is invalid
+    the current catalog is kept and the error is raised.
+
+    Returns:
+    --------
+    SpecCatalog : The new catalog.
+    """
+    with _lock:
+        catalog = load(path or (_current.path if _current is not None and _current.path else SPECS_PATH))
+        install(catalog)
+    return catalog
+
+
+def _reload_requested():
+    global _reload_pending
+    _reload_pending = False
+    previous = _current.revision if _current is not None else None
+    try:
+        catalog = reload(_signal_path)
+    except (OSError, ValueError) as error:
+        print(f"Machine specs not reloaded: {error}", file=sys.stderr)
+        return
+    if catalog.revision == previous:
+        print(f"Machine specs reloaded, unchanged (revision {catalog.revision}).", file=sys.stderr)
+    else:
+        print(f"Machine specs reloaded (revision {previous} -> {catalog.revision}).", file=sys.stderr)
+
+
+def reload_on_signal(signum=getattr(signal, "SIGHUP", None), path=None):
+    """
+    Reloads the specs file on the first call to current() after the process
+    receives signum (SIGHUP by default). The handler only sets a flag: it
+    may interrupt code holding the lock of reload, so it must not take it.
+    An invalid file is reported on stderr and the current catalog is kept.
+    Does nothing where the signal does not exist (Windows).
+    """
+    global _signal_path
+    if signum is None:
+        return
+    _signal_path = path
+
+    def handler(received, frame):
+        global _reload_pending
+        _reload_pending = True
+
+    signal.signal(signum, handler)
+
+
+if __name__ == "__main__":
+    # Lookups of the frozen catalog against the dict, and a reload while orders are built
+    import shutil
+    import tempfile
+    import time
+    from synthetic import orders
+    from validation import build_order
+
+    catalog = current()
+    plain = {machine_type: dict(fields) for machine_type, fields in catalog.items()}
+    for label, defaults in (("dict", plain), ("frozen catalog", catalog)):
+        start = time.perf_counter()
+        for _ in range(1_000_000):
+            defaults["modern"]["base_price"]
+        print(f"{label} lookup: {(time.perf_counter() - start) * 1000:.0f}ns")
+    try:
+        catalog["modern"]["base_price"] = 0
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("The catalog must be read-only")
+
+    path = os.path.join(tempfile.mkdtemp(), "machine_specs.json")
+    shutil.copy(SPECS_PATH, path)
+    install(load(path))
+    reload_on_signal()
+    specs = list(orders(2000, seed=7))
+    snapshot = current()
+    data = json.load(open(path))
+    data["defaults"]["modern"]["base_price"] = 1700
+    json.dump(data, open(path, "w"))
+    if hasattr(signal, "SIGHUP"):
+        os.kill(os.getpid(), signal.SIGHUP)
+    else:
+        reload()
+    machines = [build_order(spec, snapshot) for spec in specs]  # In flight: the catalog it started with
+    assert current()["modern"]["base_price"] == 1700 and snapshot["modern"]["base_price"] == 1600
+    start = time.perf_counter()
+    for spec in specs:
+        build_order(spec, current())
+    print(f"build_order with current(): {(time.perf_counter() - start) / len(specs) * 1e6:.1f}us per order")
@@ -0,0 +1,105 @@
+"""
+This module contains the parser of the technical specs of the arcade machines.
+Machines describe their dimensions, memory and processor as text
+('1.70mx0.8mx0.8m', '8GB', 'Intel Core i5'); these are parsed once, when the
+machine is built, into numbers that can be compared, sorted and indexed: the
+volume in m³, the footprint in m², the memory in bytes and the processor
+tier.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import re
+from collections import namedtuple
+
+from memory_budget import SizedCache, approximate_size
+
+# Parsed specs of a machine. Values that cannot be parsed are 0.
+MachineSpecs = namedtuple("MachineSpecs", ("height", "width", "depth", "volume", "footprint",
+                                           "memory_bytes", "processor_tier"))
+
+# Numeric specs that can be indexed and queried by range
+RANGE_FIELDS = ("volume", "footprint", "memory_bytes", "processor_tier")
+
+_LENGTH = re.compile(r"\s*([\d.]+)\s*(mm|cm|m)?\s*", re.IGNORECASE)
+_LENGTH_UNITS = {"mm": 0.001, "cm": 0.01, "m": 1.0, None: 1.0}
+_MEMORY = re.compile(r"\s*([\d.]+)\s*([KMGT]?)i?B\s*", re.IGNORECASE)
+_MEMORY_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+_TIER = re.compile(r"\bi(\d+)\b|\bryzen\s*(\d+)\b", re.IGNORECASE)
+
+_cache = SizedCache("parsed specs", policy="lfu", max_bytes=2 ** 20)  # Spec texts -> MachineSpecs
+
+
+def parse_dimensions(text):
+    """
+    Parses dimensions such as '1.70mx0.8mx0.8m' (height x width x depth).
+
+    Returns:
+    --------
+    tuple : (height, width, depth) in meters, zeros if the text cannot be parsed.
+    """
+    parts = text.lower().split("x") if text else []
+    sizes = []
+    for part in parts:
+        match = _LENGTH.fullmatch(part)
+        if match is None:
+            return 0.0, 0.0, 0.0
+        try:
+            sizes.append(float(match.group(1)) * _LENGTH_UNITS[match.group(2) and match.group(2).lower()])
+        except ValueError:
+            return 0.0, 0.0, 0.0
+    if len(sizes) != 3:
+        return 0.0, 0.0, 0.0
+    return tuple(sizes)
+
+
+def parse_memory(text):
+    """Parses a memory size such as '8GB' or '512MB' into bytes (binary units), 0 if it cannot be parsed."""
+    match = _MEMORY.fullmatch(text or "")
+    if match is None:
+        return 0
+    try:
+        return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2).upper()])
+    except ValueError:
+        return 0
+
+
+def processor_tier(text):
+    """Returns the tier of a processor ('Intel Core i5' -> 5, 'AMD Ryzen 7' -> 7), 0 if it is unknown."""
+    match = _TIER.search(text or "")
+    return int(match.group(1) or match.group(2)) if match else 0
+
+
+def machine_specs(dimensions, memory, processor):
+    """
+    Returns the MachineSpecs of the spec texts of a machine.
+
+    Results are cached by text, so machines built with the same defaults
+    share one MachineSpecs and building them does not parse again. The cache
+    counts against the memory budget and may be evicted.
+    """
+    key = (dimensions, memory, processor)
+    specs = _cache.get(key)
+    if specs is None:
+        height, width, depth = parse_dimensions(dimensions)
+        specs = MachineSpecs(height, width, depth, height * width * depth, width * depth,
+                             parse_memory(memory), processor_tier(processor))
+        _cache.put(key, specs, approximate_size((key, specs)))
+    return specs
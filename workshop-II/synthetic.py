@@ -0,0 +1,287 @@
+"""
+This module contains the synthetic data generator used to load test the
+catalog. It produces games and orders with the distributions of the sample
+games of cli.py (the categories, years, prices and studios of every machine
+type) and orders that use every machine type and every enum option. The
+output is deterministic for a seed and is generated lazily in chunks, so
+millions of records can be streamed to an iterator or a file.
+
+The load tests asked for a million records per second. Measured on one core
+of the build machine (python synthetic.py), only orders without games reach
+it (1.2 to 1.4M per second). Game records come close but do not reliably
+reach it (0.7 to 1.0M per second between runs), and Game objects are far
+from it (about 0.5M per second: creating the object and its attribute dict
+alone takes more than a microsecond). Orders with games run at about 0.3M
+per second.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import json
+import random
+
+from ArcadeMachine import Material, Color, Sound, SimRacing, Glasses, Resolution, Game
+from serialization import gc_paused
+
+# Distributions of every machine type, taken from the sample games of cli.py:
+# categories and prices are drawn from the sample values (repeated values weigh
+# more), years uniformly in the range of the samples.
+PROFILES = {
+    "retro": {
+        "categories": ("classical", "platform", "puzzle", "shooter", "shooter"),
+        "years": (1979, 1981),
+        "prices": (0.25, 0.50, 0.25, 0.30, 0.20),
+        "studios": ("Namco", "Nintendo", "Sega", "Atari", "Konami")
+    },
+    "modern": {
+        "categories": ("fighting", "music", "fighting", "dance", "music"),
+        "years": (2009, 2019),
+        "prices": (1.00, 1.25, 1.50, 1.20, 1.50),
+        "studios": ("NetherRealm Studios", "Raw Thrills", "Nintendo", "Microsoft", "Harmonix")
+    },
+    "dance": {
+        "categories": ("rhythm",),
+        "years": (2018, 2022),
+        "prices": (3.50, 2.99, 4.00, 3.75, 3.25),
+        "studios": ("Rhythm Games Inc.", "Step Games Ltd.", "Groove Studios", "Arcade Beat Co.", "Disco Fun LLC")
+    },
+    "classical": {
+        "categories": ("shooter", "sports", "puzzle", "puzzle", "puzzle"),
+        "years": (1972, 1984),
+        "prices": (0.20, 0.50, 0.15, 0.30, 0.25),
+        "studios": ("Taito", "Atari", "Elorg", "Gottlieb", "Namco")
+    },
+    "shooter": {
+        "categories": ("shooter",),
+        "years": (1994, 1999),
+        "prices": (0.75, 1.00, 0.85, 1.00, 0.50),
+        "studios": ("Namco", "Sega", "Sega", "Konami", "Namco")
+    },
+    "racing": {
+        "categories": ("racing",),
+        "years": (1986, 2005),
+        "prices": (0.75, 0.50, 0.60, 0.70, 1.00),
+        "studios": ("Sega", "Sega", "Midway Games", "Namco", "Nintendo")
+    },
+    "vr": {
+        "categories": ("rhythm", "social", "social", "action", "action"),
+        "years": (2016, 2020),
+        "prices": (29.99, 0.00, 0.00, 59.99, 29.99),
+        "studios": ("Psyche Studios", "VRChat Inc.", "Against Gravity", "Valve", "Stress Level Zero")
+    }
+}
+
+MACHINE_TYPE_NAMES = tuple(PROFILES)  # The samples have the same number of games of every type
+
+_WORDS = ("Super", "Mega", "Turbo", "Space", "Dragon", "Street", "Neon", "Galaxy", "Pixel", "Thunder",
+          "Ninja", "Star", "Rocket", "Cyber", "Shadow", "Crystal")
+_NOUNS = ("Kong", "Racer", "Invaders", "Fighter", "Blaster", "Quest", "Rally", "Beat", "Runner",
+          "Saga", "Strike", "Party", "Legends", "Rush", "Arena", "Chase")
+
+# Order fields of every machine type and the values drawn for them
+_BOOLEANS = (True, False)
+ORDER_OPTIONS = {
+    "modern": {},
+    "retro": {},
+    "dance": {"difficulties": ("easy", "easy/normal", "easy/normal/hard", "normal/hard/expert"),
+              "arrow_cardinalities": ("4", "5", "8"), "controls_price": (50.0, 80.0, 120.0)},
+    "classical": {"make_vibration": _BOOLEANS, "sound_record_alert": _BOOLEANS},
+    "shooter": {"gun_color": tuple(Color)},
+    "racing": {"type_sim_racing": tuple(SimRacing), "add_gearbox": _BOOLEANS},
+    "vr": {"glasses_type": tuple(Glasses), "glasses_resolution": tuple(Resolution),
+           "glasses_price": (150.0, 300.0, 450.0)}
+}
+
+
+_TITLES = tuple(f"{word} {noun} " for word in _WORDS for noun in _NOUNS)
+TABLE_SIZE = 4096  # Rows drawn from the distributions for every chunk
+CHUNK_SIZE = 50_000  # Records drawn with the same random generator; fixed, so a seed always gives the same data
+
+
+def _chunk_random(seed, index):
+    """Returns the random generator of a chunk; chunks only depend on the seed and their index."""
+    return random.Random(seed * 1_000_003 + index)
+
+
+def _game_table(rng):
+    """
+    Draws TABLE_SIZE rows (title prefix, type, storytelling creator, graphics
+    creator, category, price, year) from the distributions of PROFILES.
+
+    Records are then sampled from the rows, which is much faster than drawing
+    every field of every record, and keeps the distribution of every field.
+    """
+    choices = rng.choices
+    rows = []
+    for machine_type, k in zip(MACHINE_TYPE_NAMES, _split(rng, TABLE_SIZE, len(MACHINE_TYPE_NAMES))):
+        profile = PROFILES[machine_type]
+        low, high = profile["years"]
+        rows += zip(choices(_TITLES, k=k), [machine_type] * k, choices(profile["studios"], k=k),
+                    choices(profile["studios"], k=k), choices(profile["categories"], k=k),
+                    choices(profile["prices"], k=k), choices([str(year) for year in range(low, high + 1)], k=k))
+    return rows
+
+
+def _split(rng, total, parts):
+    """Splits total in parts of random size (a multinomial draw with equal weights)."""
+    counts = [0] * parts
+    for part in rng.choices(range(parts), k=total):
+        counts[part] += 1
+    return counts
+
+
+def game_records(count, seed=0, start_code=1000):
+    """
+    Yields chunks of game records: lists of tuples with the fields of a Game
+    (title, code, type, storytelling creator, graphics creator, category,
+    price, year).
+
+    This is the fastest form of the data (no objects are created). The same
+    seed always gives the same records.
+    """
+    for index, first in enumerate(range(0, count, CHUNK_SIZE)):
+        size = min(CHUNK_SIZE, count - first)
+        rng = _chunk_random(seed, index)
+        with gc_paused():  # The tuples of a chunk do not form cycles
+            rows = rng.choices(_game_table(rng), k=size)
+            codes = map(str, range(start_code + first, start_code + first + size))
+            # One tuple per record, unpacked from the row (a concatenation builds two)
+            chunk = [(title + code, code, machine_type, story, graphics, category, price, year)
+                     for (title, machine_type, story, graphics, category, price, year), code in zip(rows, codes)]
+        yield chunk
+
+
+def games(count, seed=0, start_code=1000, register=False):
+    """
+    Yields Game objects.
+
+    Parameters:
+    -----------
+    register : bool
+        Also adds every game to Game.available_games (as creating them with
+        Game() does). By default the games are not registered.
+    """
+    new = Game.__new__
+    catalog = Game.available_games
+    for chunk in game_records(count, seed, start_code):
+        for title, code, machine_type, story, graphics, category, price, year in chunk:
+            game = new(Game)
+            game.__dict__ = {"_title": title, "_code": code, "_type": machine_type,
+                             "_storytelling_creator": story, "graphics_creator": graphics,
+                             "_category": category, "_price_game": price, "_year": year}
+            if register:
+                catalog.append(game)
+            yield game
+
+
+def _order_table(rng):
+    """Draws TABLE_SIZE order specs without games, every machine type with the same probability."""
+    choices = rng.choices
+    materials, colors, sounds = tuple(Material), tuple(Color), tuple(Sound)
+    table = []
+    for machine_type, k in zip(MACHINE_TYPE_NAMES, _split(rng, TABLE_SIZE, len(MACHINE_TYPE_NAMES))):
+        names = tuple(ORDER_OPTIONS[machine_type])
+        extras = zip(*[choices(values, k=k) for values in ORDER_OPTIONS[machine_type].values()]) if names else [()] * k
+        for material, color, lights, sound, values in zip(choices(materials, k=k), choices(colors, k=k),
+                                                          choices(colors, k=k), choices(sounds, k=k), extras):
+            spec = {"machine_type": machine_type, "material": material, "color": color,
+                    "lights": lights, "sound": sound}
+            spec.update(zip(names, values))
+            table.append(spec)
+    return table
+
+
+def orders(count, seed=0, game_count=0, start_code=1000, max_games=3):
+    """
+    Yields order specs, as accepted by validation.build_order.
+
+    Every machine type is ordered with the same probability, and every enum
+    field takes any of its values, so a stream of orders covers all the
+    options of the catalog. Every spec is a new dictionary.
+
+    Parameters:
+    -----------
+    game_count : int
+        The number of games generated with game_records(game_count, seed,
+        start_code=start_code); orders install up to max_games of them of their
+        machine type. With 0 no games are installed.
+    """
+    codes_by_type = {machine_type: [] for machine_type in MACHINE_TYPE_NAMES}
+    for chunk in game_records(game_count, seed, start_code):
+        for record in chunk:
+            codes_by_type[record[2]].append(record[1])
+    for index, first in enumerate(range(0, count, CHUNK_SIZE)):
+        size = min(CHUNK_SIZE, count - first)
+        rng = _chunk_random(seed + 1, index)  # Not the random numbers of the games
+        choices = rng.choices
+        with gc_paused():
+            specs = list(map(dict, choices(_order_table(rng), k=size)))
+            if game_count:
+                for spec, installed in zip(specs, choices(range(max_games + 1), k=size)):
+                    codes = codes_by_type[spec["machine_type"]]
+                    if installed and codes:
+                        spec["games"] = choices(codes, k=installed)
+        yield from specs
+
+
+def _json_value(value):
+    return value.value if hasattr(value, "value") else value
+
+
+def write_games(path, count, seed=0, start_code=1000):
+    """Writes games as tab-separated lines with a header, one chunk at a time."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("title\tcode\ttype\tstorytelling_creator\tgraphics_creator\tcategory\tprice_game\tyear\n")
+        for chunk in game_records(count, seed, start_code):
+            file.write("".join([f"{t}\t{c}\t{y}\t{s}\t{g}\t{k}\t{p}\t{a}\n" for t, c, y, s, g, k, p, a in chunk]))
+
+
+def write_orders(path, count, seed=0, game_count=0, start_code=1000):
+    """Writes order specs as JSON lines (enums as their values, which validation accepts)."""
+    with open(path, "w", encoding="utf-8") as file:
+        lines = []
+        for spec in orders(count, seed, game_count, start_code):
+            lines.append(json.dumps({field: _json_value(value) for field, value in spec.items()},
+                                    separators=(",", ":")))
+            if len(lines) == CHUNK_SIZE:
+                file.write("\n".join(lines) + "\n")
+                lines = []
+        if lines:
+            file.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    # Generation rates, against the target of the load tests
+    import time
+
+    TARGET = 1_000_000  # Records per second
+
+    for name, generate in (("game records", lambda: sum(len(chunk) for chunk in game_records(2_000_000, seed=7))),
+                           ("Game objects", lambda: sum(1 for _ in games(1_000_000, seed=7))),
+                           ("orders", lambda: sum(1 for _ in orders(1_000_000, seed=7))),
+                           ("orders with games", lambda: sum(1 for _ in orders(1_000_000, seed=7, game_count=10_000)))):
+        start = time.perf_counter()
+        total = generate()
+        elapsed = time.perf_counter() - start
+        rate = total / elapsed
+        print(f"{name}: {rate / 1e6:.2f}M per second ({'meets' if rate >= TARGET else 'below'} the 1M/s target)")
+    first = next(game_records(5, seed=7))
+    assert first == next(game_records(5, seed=7))
+    print(first[0])
@@ -0,0 +1,47 @@
+"""
+This module contains the fixtures shared by the tests of workshop-II. The
+modules of workshop-II are imported by their names, as the scripts do, so
+the folder is put first on the path.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from arcade_common.game_catalog import GameCatalog  # noqa: E402
+from catalog_sync import _new_game  # noqa: E402
+
+
+def make_game(code, title=None, machine_type="retro", price=0.25):
+    """Returns a game that is not registered in Game.available_games."""
+    return _new_game({"t": title or f"Game {code}", "c": code, "y": machine_type, "s": "Namco", "g": "Namco",
+                      "k": "puzzle", "p": price, "a": "1980"})
+
+
+@pytest.fixture
+def catalog():
+    """A catalog of three retro games, apart from Game.available_games."""
+    return GameCatalog([make_game("P1", "Pac-Man"), make_game("S1", "Space Invaders", price=0.5),
+                        make_game("D1", "Donkey Kong")])
@@ -0,0 +1,95 @@
+"""
+This module contains the tests of the sales analytics (analytics).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import random
+from collections import Counter
+
+from ArcadeMachine import ArcadeCatalog, Customer
+from analytics import SalesAnalytics, SpaceSaving, TDigest
+from conftest import make_game
+from spec_catalog import current
+from validation import build_order
+
+
+def test_space_saving_bounds_the_counts():
+    rng = random.Random(5)
+    stream = [rng.randrange(5000) for _ in range(20_000)] + ["hot"] * 3000 + ["warm"] * 1000
+    rng.shuffle(stream)
+    counter = SpaceSaving(100)
+    for item in stream:
+        counter.add(item)
+
+    counts = dict(counter.top(100))
+    exact = Counter(stream)
+    floor = min(counts.values())
+    assert len(counts) == 100 and sum(counts.values()) == len(stream)
+    assert [item for item, _ in counter.top(2)] == ["hot", "warm"]
+    for item, count in counts.items():
+        assert exact[item] <= count <= exact[item] + floor
+
+
+def test_space_saving_with_weights():
+    counter = SpaceSaving(2)
+    counter.add("a", 5)
+    counter.add("b", 1)
+    counter.add("c", 2)  # Replaces b and inherits its count
+
+    assert counter.top() == [("a", 5), ("c", 3)]
+
+
+def test_tdigest_quantiles():
+    digest = TDigest()
+    for value in range(1, 10_001):
+        digest.add(value)
+
+    assert abs(digest.quantile(0.5) - 5000) < 50
+    assert abs(digest.quantile(0.99) - 9900) < 20
+    assert digest.quantile(0) == 1 and digest.quantile(1) == 10_000
+
+
+def test_purchases_are_counted_once(capsys):
+    game = make_game("P1")
+    machine = build_order({"machine_type": "retro", "material": "wood", "games": ["P1"]}, current(),
+                          games={"P1": game})
+    analytics = SalesAnalytics()
+    catalog = ArcadeCatalog()
+    catalog.subscribe_purchases(analytics.ingest_purchase)
+    catalog.add_machine(machine, 2)
+    catalog.add_machine(build_order({"machine_type": "modern", "material": "wood"}, current()))
+
+    order = catalog.complete_purchase("Ana", "Calle 1, Bogota", "3001234567")
+
+    assert analytics.order_count() == 1
+    assert sum(analytics.units_by("type").values()) == 3
+    assert analytics.total_revenue() == order["total"]
+    assert analytics.top_games() == [("P1", 2)]
+
+
+def test_lines_alone_are_not_orders():
+    analytics = SalesAnalytics()
+    machine = build_order({"machine_type": "retro", "material": "wood"}, current())
+
+    analytics.ingest(machine, Customer("Ana", "Calle 1, Bogota", "300"), 2, 100.0)
+
+    assert analytics.order_count() == 0
+    assert analytics.revenue_by("type") == {"retro": 200.0}
@@ -0,0 +1,85 @@
+"""
+This module contains the tests of the title index (autocomplete) and its prefix trie.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import pytest
+
+from arcade_common.autocomplete import TitleIndex
+from arcade_common.search import PrefixTrie
+from conftest import make_game
+
+
+@pytest.fixture
+def index(catalog):
+    return TitleIndex(catalog)
+
+
+def test_trie_remove_refills_the_suggestions():
+    keys = [f"game {number:03}" for number in range(300)]
+    trie = PrefixTrie(lambda id: keys[id], top_k=4, burst=8)
+    for id, key in enumerate(keys):
+        trie.insert(key, id)
+    for id in range(0, 300, 2):
+        trie.remove(keys[id], id)
+    assert trie.suggest("game", 4) == [1, 3, 5, 7]
+    assert trie.suggest("game 00", 4) == [1, 3, 5, 7]
+    assert trie.suggest("game 298", 4) == []
+
+
+def test_complete_and_resolve(index, catalog):
+    assert index.complete("retro", "pac") == [catalog.by_code("P1")]
+    assert index.complete("retro", "inv") == [catalog.by_code("S1")]  # A word of the title onwards
+    assert index.resolve("retro", "donkey kong") is catalog.by_code("D1")
+    assert index.resolve("retro", "S1") is catalog.by_code("S1")
+    assert index.resolve("modern", "S1") is None
+
+
+def test_removed_games_leave_the_suggestions_without_rebuilding(index, catalog, monkeypatch):
+    games = [make_game(f"X{number}", f"Galaga {number}") for number in range(200)]
+    catalog.extend(games)
+    monkeypatch.setattr(index, "rebuild", lambda: pytest.fail("rebuilt on the query path"))
+    for game in games[:150]:
+        catalog.remove(game)
+    assert index.complete("retro", "galaga", 3) == games[150:153]
+    assert index.resolve("retro", "galaga 10") is None
+    assert games[5] not in index.fuzzy("retro", "Galag 5", 5)
+
+
+def test_a_game_with_the_same_title_takes_the_place_of_a_dropped_one(index, catalog):
+    copy = make_game("P2", "Pac-Man")
+    catalog.append(copy)
+    catalog.remove(catalog.by_code("P1"))
+    assert index.by_title("retro", "PAC MAN") is copy
+
+
+def test_fuzzy_finds_misspelled_titles(index, catalog):
+    assert index.fuzzy("retro", "Donky Kong")[0] is catalog.by_code("D1")
+    assert index.fuzzy("retro", "Spase Invaderz")[0] is catalog.by_code("S1")
+    assert index.fuzzy("retro", "zzzz") == []
+
+
+def test_changed_titles_are_indexed_again(index, catalog):
+    game = catalog.by_code("P1")
+    catalog.update(game, {"_title": "Ms. Pac-Man"})
+    assert index.complete("retro", "pac") == [game]
+    assert index.complete("retro", "ms") == [game]
+    assert index.by_title("retro", "pac-man") is None
@@ -0,0 +1,208 @@
+"""
+This module contains the tests of the catalog change feed (catalog_sync) and\nof the indexes that follow the updates of the catalog.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import pytest
+
+from arcade_common.autocomplete import TitleIndex
+from arcade_common.game_catalog import GameCatalog
+from catalog_sync import CatalogFeed, CatalogReplica, FeedLog, FileReplica
+from conftest import make_game
+from metering import PlayMeter
+
+
+def test_update_publishes_only_the_changed_fields(catalog):
+    feed = CatalogFeed(catalog)
+    version = catalog.version
+
+    delta = feed.update_game("P1", price_game=0.5, year="1980")
+
+    assert delta["op"] == "update" and delta["f"] == {"p": 0.5}
+    assert catalog.by_code("P1")._price_game == 0.5
+    assert catalog.version > version
+    assert feed.update_game("P1", price_game=0.5) is None  # Nothing changed, nothing published
+
+
+def test_update_rejects_unknown_games_and_attributes(catalog):
+    feed = CatalogFeed(catalog)
+
+    with pytest.raises(KeyError):
+        feed.update_game("X1", price_game=1.0)
+    with pytest.raises(ValueError, match="Unknown game attribute"):
+        feed.update_game("P1", colour="red")
+
+
+def test_code_change_moves_the_index(catalog):
+    feed = CatalogFeed(catalog)
+    game = catalog.by_code("P1")
+
+    feed.update_game("P1", code="P9")
+
+    assert catalog.by_code("P9") is game
+    assert catalog.by_code("P1") is None
+    assert catalog.codes()["P9"] is game
+
+
+def test_titles_follow_the_updates(catalog):
+    index = TitleIndex(catalog)
+    feed = CatalogFeed(catalog)
+
+    feed.update_game("P1", title="Ms. Pac-Man")
+
+    assert index.resolve("retro", "Ms. Pac-Man") is catalog.by_code("P1")
+    assert index.by_title("retro", "Pac-Man") is None
+    feed.remove_game("S1")
+    assert index.resolve("retro", "Space Invaders") is None
+
+
+def test_meter_charges_the_new_price(catalog):
+    meter = PlayMeter(catalog)
+    feed = CatalogFeed(catalog)
+    meter.ingest([0], ["P1"], [1000.0])
+
+    feed.update_game("P1", price_game=1.0)
+    meter.ingest([0], ["P1"], [1001.0])
+
+    assert meter.game("P1") == (2, 1.25)
+
+
+def test_meter_keeps_the_totals_of_a_renamed_game(catalog):
+    meter = PlayMeter(catalog)
+    feed = CatalogFeed(catalog)
+    meter.ingest([0], ["P1"], [1000.0])
+
+    feed.update_game("P1", code="P9")
+    meter.ingest([0], ["P9"], [1001.0])
+
+    assert meter.game("P9") == (2, 0.5)
+
+
+def test_replica_converges(catalog):
+    feed = CatalogFeed(catalog)  # Publishes the games it starts with as a reset
+    target = GameCatalog()
+    replica = CatalogReplica(target)
+    feed.add_game(make_game("T1", "Tetris"))
+    feed.update_game("S1", price_game=0.75, code="S2")
+    feed.remove_game("D1")
+
+    assert replica.pull(feed) == 4
+    assert sorted(game._code for game in target) == ["P1", "S2", "T1"]
+    assert target.by_code("T1")._title == "Tetris"
+    assert target.by_code("S2")._price_game == 0.75
+    assert target.by_code("D1") is None and target.by_code("S1") is None
+
+
+def test_changes_made_on_the_catalog_are_published(catalog):
+    feed = CatalogFeed(catalog)
+    target = GameCatalog()
+    replica = CatalogReplica(target)
+    replica.pull(feed)
+
+    catalog.append(make_game("T1", "Tetris"))
+    catalog.update(catalog.by_code("P1"), {"_code": "P2", "_price_game": 1.0})
+    catalog.remove(catalog.by_code("D1"))
+
+    assert [(delta["op"], delta.get("c")) for delta in feed.changes_since(1)] == [
+        ("add", "T1"), ("update", "P1"), ("remove", "D1")]
+    assert replica.pull(feed) == 3
+    assert target.by_code("P2")._price_game == 1.0
+    assert sorted(game._code for game in target) == ["P2", "S1", "T1"]
+
+    catalog.clear()
+    replica.pull(feed)
+    assert len(target) == 0
+
+
+def test_unpublished_attributes_are_not_published(catalog):
+    feed = CatalogFeed(catalog)
+
+    catalog.update(catalog.by_code("P1"), {"_rating": 5})
+
+    assert feed.version == 1
+
+
+def test_add_game_of_the_catalog_is_not_published_twice(catalog):
+    feed = CatalogFeed(catalog)
+
+    assert feed.add_game(catalog.by_code("P1")) is None
+    assert feed.version == 1
+
+
+def test_replica_far_behind_receives_a_reset(catalog):
+    feed = CatalogFeed(catalog, log_limit=1)
+    feed.add_game(make_game("T1", "Tetris"))
+    feed.update_game("T1", price_game=0.1)
+    target = GameCatalog([make_game("OLD")])
+
+    CatalogReplica(target).pull(feed)
+
+    assert sorted(game._code for game in target) == ["D1", "P1", "S1", "T1"]
+
+
+def test_replica_rejects_a_gap(catalog):
+    feed = CatalogFeed(catalog)
+    feed.add_game(make_game("T1"))
+    feed.add_game(make_game("T2"))
+
+    with pytest.raises(ValueError, match="Missing catalog changes"):
+        CatalogReplica(GameCatalog()).apply(feed.changes_since(1))
+
+
+def test_restarted_publisher_continues_the_versions(tmp_path, catalog):
+    path = str(tmp_path / "catalog.log")
+    feed = CatalogFeed(catalog, log=FeedLog(path))
+    feed.update_game("P1", price_game=0.5)
+    target = GameCatalog()
+    replica = FileReplica(path, target)
+    replica.poll()
+
+    reloaded = GameCatalog(make_game(game._code, game._title, price=game._price_game) for game in catalog)
+    restarted = CatalogFeed(reloaded, log=FeedLog(path))  # A new process over the same log
+    restarted.update_game("P1", price_game=0.75)
+
+    assert restarted.version == feed.version + 2  # Its own reset, then the update
+    assert replica.poll() == 2
+    assert target.by_code("P1")._price_game == 0.75
+
+
+def test_last_version_of_a_log(tmp_path):
+    log = FeedLog(str(tmp_path / "catalog.log"))
+    assert log.last_version() == 0
+
+    log.append([{"v": 1, "op": "reset", "games": [{"t": "x" * 100_000}]}, {"v": 2, "op": "remove", "c": "A"}])
+    assert log.last_version() == 2
+    with open(str(tmp_path / "catalog.log"), "a", encoding="utf-8") as file:
+        file.write('{"v":3,"op":')  # A delta still being written
+    assert log.last_version() == 2
+
+
+def test_file_replica_polls_the_new_deltas(tmp_path, catalog):
+    path = str(tmp_path / "catalog.log")
+    feed = CatalogFeed(GameCatalog(), log=FeedLog(path))
+    target = GameCatalog()
+    replica = FileReplica(path, target)
+    feed.add_game(make_game("T1"))
+
+    assert replica.poll() == 1
+    feed.update_game("T1", price_game=2.0)
+    assert replica.poll() == 1 and replica.poll() == 0
+    assert target.by_code("T1")._price_game == 2.0
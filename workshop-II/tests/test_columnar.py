@@ -0,0 +1,92 @@
+"""
+This module contains the tests of the columnar export (columnar).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import os
+
+import pytest
+
+from columnar import (GAME_SCHEMA, JOURNAL_SUFFIX, ColumnarReader, ColumnarWriter, export_games,
+                      read_columns)
+from conftest import make_game
+
+FIRST = [make_game(f"A{index}", price=index / 4) for index in range(5)]
+SECOND = [make_game(f"B{index}", machine_type="modern") for index in range(3)]
+
+
+def _columns(games):
+    return {name: [getattr(game, name) for game in games] for name, _ in GAME_SCHEMA}
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "games.col")
+
+    assert export_games(path, FIRST) == 5
+    columns = read_columns(path, ["_code", "_price_game"])
+
+    assert columns["_code"] == [game._code for game in FIRST]
+    assert list(columns["_price_game"]) == [game._price_game for game in FIRST]
+
+
+def test_append_replaces_the_footer(tmp_path):
+    appended, whole = str(tmp_path / "appended.col"), str(tmp_path / "whole.col")
+    export_games(appended, FIRST)
+    export_games(appended, SECOND)
+    with ColumnarWriter(whole, GAME_SCHEMA) as writer:
+        writer.write(_columns(FIRST))
+        writer.write(_columns(SECOND))
+
+    with open(appended, "rb") as file, open(whole, "rb") as expected:
+        assert file.read() == expected.read()  # The old footer is not left behind
+    assert ColumnarReader(appended).rows == 8
+    assert not os.path.exists(appended + JOURNAL_SUFFIX)
+
+
+def test_interrupted_append_keeps_the_file_readable(tmp_path):
+    path = str(tmp_path / "games.col")
+    export_games(path, FIRST)
+    writer = ColumnarWriter(path, GAME_SCHEMA)
+    writer.write(_columns(SECOND))
+    writer._file.close()  # The process dies before the footer is written
+
+    assert os.path.exists(path + JOURNAL_SUFFIX)
+    assert read_columns(path, ["_code"])["_code"] == [game._code for game in FIRST]
+
+    export_games(path, SECOND)  # The next append starts from the journaled footer
+    assert read_columns(path, ["_code"])["_code"] == [game._code for game in FIRST + SECOND]
+    assert not os.path.exists(path + JOURNAL_SUFFIX)
+
+
+def test_append_with_another_schema(tmp_path):
+    path = str(tmp_path / "games.col")
+    export_games(path, FIRST)
+
+    with pytest.raises(ValueError, match="another schema"):
+        ColumnarWriter(path, GAME_SCHEMA[:2])
+
+
+def test_not_a_columnar_file(tmp_path):
+    path = tmp_path / "games.col"
+    path.write_bytes(b"ACOL" + b"x" * 64)
+
+    with pytest.raises(ValueError, match="not a columnar file"):
+        ColumnarReader(str(path))
@@ -0,0 +1,79 @@
+"""
+This module contains the tests of the differential harness: every path that
+builds machines gives the machines of the reference path, and the timings
+are checked in strict mode (ARCADE_STRICT_TIMINGS=1, set by CI).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import time
+
+import pytest
+
+import differential
+from differential import PATHS, compare, reference_build, run
+from pricing import PricingEngine, DEFAULT_RULES
+from spec_catalog import current
+from synthetic import games as synthetic_games, orders as synthetic_orders
+
+
+@pytest.fixture(scope="module")
+def batch():
+    games = {game._code: game for game in synthetic_games(500, 7)}
+    specs = list(synthetic_orders(100, 7, 500))
+    return specs, games, [reference_build(spec, current(), games) for spec in specs]
+
+
+@pytest.mark.parametrize("name", list(PATHS))
+def test_path_gives_the_reference_machines(name, batch):
+    specs, games, reference = batch
+    machines = PATHS[name](specs, current(), games, reference)
+    assert compare(reference, machines, PricingEngine(DEFAULT_RULES)) == []
+
+
+@pytest.fixture
+def slow_optimization(monkeypatch):
+    def slow(specs, defaults, games, reference):
+        time.sleep(0.02)
+        return [reference_build(spec, defaults, games) for spec in specs]
+    monkeypatch.setattr(differential, "PATHS", {"slow": slow})
+    monkeypatch.setitem(differential.FASTER_THAN, "slow", "reference")
+
+
+def test_an_optimization_slower_than_its_path_fails(slow_optimization, tmp_path):
+    lines = []
+    baseline = str(tmp_path / "baseline.json")
+    options = {"count": 20, "repeat": 1, "baseline": baseline, "output": lines.append, "require_baseline": False}
+    assert run(fail_slower=True, **options) is False
+    assert any("SLOWER than reference" in line for line in lines)
+    assert run(fail_slower=False, **options) is True
+
+
+def test_strict_mode_requires_a_baseline(slow_optimization, tmp_path, monkeypatch):
+    monkeypatch.setattr(differential, "STRICT", True)
+    lines = []
+    assert run(count=20, repeat=1, baseline=str(tmp_path / "missing.json"), output=lines.append,
+               fail_slower=False) is False
+
+
+@pytest.mark.skipif(not differential.STRICT, reason="timings are only checked with ARCADE_STRICT_TIMINGS=1 (CI)")
+def test_timings_against_the_baseline():
+    lines = []
+    assert run(count=2000, repeat=5, output=lines.append), "\n".join(lines)
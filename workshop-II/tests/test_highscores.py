@@ -0,0 +1,92 @@
+"""
+This module contains the tests of the leaderboards and of the asynchronous\nscore submitter (highscores).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import pytest
+
+from highscores import DAY, HighScoreService, ScoreSubmitter
+
+
+@pytest.fixture
+def service():
+    return HighScoreService(size=3)
+
+
+@pytest.fixture
+def submitter(service):
+    submitter = ScoreSubmitter(service, batch_size=2)
+    yield submitter
+    submitter.close()
+
+
+def test_boards_keep_the_best_scores(service):
+    now = 10 * DAY
+    for player, score in (("ana", 10), ("bob", 30), ("eve", 20), ("joe", 5)):
+        service.submit("P1", 0, player, score, now)
+    service.submit("P1", 1, "max", 25, now)
+
+    assert [entry.player for entry in service.leaderboard("P1", timestamp=now)] == ["bob", "max", "eve"]
+    assert [entry.score for entry in service.leaderboard("P1", timestamp=now, machine_ids=[1])] == [25]
+    assert service.record("P1", 0).player == "bob"
+
+
+def test_old_windows_are_dropped(service):
+    service.submit("P1", 0, "ana", 10, 10 * DAY)
+    service.submit("P1", 0, "bob", 5, 30 * DAY)
+
+    assert service.leaderboard("P1", "daily", 10 * DAY) == []
+    assert [entry.player for entry in service.leaderboard("P1", "all")] == ["ana", "bob"]
+
+
+@pytest.mark.parametrize("score, timestamp", [("10", None), (True, None), (10, "today")])
+def test_submit_rejects_invalid_values(submitter, score, timestamp):
+    with pytest.raises(ValueError):
+        submitter.submit("P1", 0, "ana", score, timestamp)
+
+
+def test_flush_applies_the_queued_scores(submitter, service):
+    for score in range(5):
+        submitter.submit("P1", 0, "ana", score, DAY)
+
+    assert submitter.flush(timeout=5)
+    assert service.record("P1", 0).score == 4
+
+
+def test_failed_batch_is_counted_and_the_worker_goes_on(submitter, service, capsys):
+    submitter.submit("P1", [0], "ana", 10, DAY)  # A machine id that cannot be a key of the boards
+    assert submitter.flush(timeout=5)
+
+    submitter.submit("P1", 0, "bob", 20, DAY)
+    assert submitter.flush(timeout=5)
+
+    assert submitter.failed == 1
+    assert "Scores not applied (1)" in capsys.readouterr().err
+    assert service.record("P1", 0).player == "bob"
+
+
+def test_close_applies_the_pending_scores(service):
+    submitter = ScoreSubmitter(service)
+    submitter.submit("P1", 0, "ana", 10, DAY)
+
+    submitter.close()
+
+    assert service.record("P1", 0).player == "ana"
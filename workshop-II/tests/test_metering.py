@@ -0,0 +1,68 @@
+"""
+This module contains the tests of the play meter (metering).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+from arcade_common.game_catalog import GameCatalog
+from conftest import make_game
+from metering import PlayMeter
+
+NOW = 1_000_000 * 60.0
+
+
+def test_windows_of_a_game(catalog):
+    meter = PlayMeter(catalog, bucket_seconds=60, buckets=10)
+    meter.ingest([0, 1, 0], ["P1", "S1", "P1"], [NOW - 120, NOW - 60, NOW])
+
+    assert meter.window(60, NOW, game_code="P1") == (0, 0.25)
+    assert meter.window(600, NOW, game_code="P1") == (0, 0.5)
+    assert meter.window(600, NOW) == (3, 1.0)
+    assert meter.machine(0) == (2, 0.5)
+
+
+def test_rolled_over_buckets_forget_their_revenue(catalog):
+    meter = PlayMeter(catalog, bucket_seconds=60, buckets=2)
+    meter.ingest([0], ["P1"], [NOW])
+    meter.ingest([0], ["S1"], [NOW + 120])  # Same slot of the ring, two buckets later
+
+    assert meter.window(120, NOW + 120, game_code="P1") == (0, 0.0)
+    assert meter.window(120, NOW + 120, game_code="S1") == (0, 0.5)
+    assert meter.game("P1") == (1, 0.25)  # Totals are kept
+
+
+def test_unknown_and_removed_games(catalog):
+    meter = PlayMeter(catalog)
+    meter.ingest([0], ["P1"], [NOW])
+    catalog.remove(catalog.by_code("P1"))
+    meter.ingest([0, 0], ["P1", "X1"], [NOW, NOW])
+
+    assert meter.unknown == 2
+    assert meter.game("P1") == (1, 0.25)
+
+
+def test_games_added_later_are_charged():
+    catalog = GameCatalog()
+    meter = PlayMeter(catalog)
+    catalog.append(make_game("T1", price=2.0))
+    meter.ingest([3], ["T1"], [NOW])
+
+    assert meter.top_games(1) == [("T1", 2.0)]
+    assert meter.top_machines(1) == [(3, 2.0)]
@@ -0,0 +1,70 @@
+"""
+This module contains the tests of the power planner of venues (planner).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+from planner import Circuit, PowerPlanner, Zone, synthetic_venue
+
+SPECS = {"retro": {"power_consumption": 500, "weight": 70.0}, "vr": {"power_consumption": 900, "weight": 110.0}}
+
+
+def test_machines_fit_the_circuits_and_zones():
+    plan = PowerPlanner(synthetic_venue(4, circuits_per_zone=2, zone_load=300)).plan({"retro": 10}, SPECS)
+
+    assert plan.placed() + plan.unplaced.get("retro", 0) == 10
+    for circuit in plan.circuits:
+        assert circuit.used <= circuit.usable
+    for zone in plan.zones:
+        assert zone.load <= zone.max_load
+
+
+def test_earlier_plans_are_not_changed():
+    venue = synthetic_venue(4)
+    planner = PowerPlanner(venue)
+
+    first = planner.plan({"retro": 3}, SPECS)
+    second = planner.plan({"vr": 1}, SPECS)
+
+    assert first.placed() == 3 and second.placed() == 1
+    assert sum(circuit.used for circuit in first.circuits) == 1500
+    assert all(not circuit.machines and not circuit.used for circuit in venue)  # The venue itself is not used
+
+
+def test_circuits_of_a_zone_share_its_copy():
+    plan = PowerPlanner(synthetic_venue(4, circuits_per_zone=2)).plan({"retro": 1}, SPECS)
+
+    assert len(plan.zones) == 2
+    assert plan.circuits[0].zone is plan.circuits[1].zone is plan.zones[0]
+
+
+def test_utilisation_of_empty_circuits_and_zones():
+    zone = Zone("Storage", max_load=0)
+    plan = PowerPlanner([Circuit("Spare", 0, zone), Circuit("Main", 1000, Zone("Hall", 500))]).plan({"retro": 2}, SPECS)
+
+    assert plan.circuit_utilisation() == {"Spare": 0.0, "Main": 0.625}
+    assert plan.zone_utilisation()["Storage"] == 0.0
+    assert plan.unplaced == {"retro": 1}
+
+
+def test_plan_without_machines():
+    plan = PowerPlanner(synthetic_venue(1)).plan_machines([])
+
+    assert plan.placed() == 0 and plan.unplaced == {}
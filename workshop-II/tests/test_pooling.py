@@ -0,0 +1,53 @@
+"""
+This module contains the tests of the batch replay of orders (pooling).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import gc
+
+from pooling import frozen_catalog, replay_orders
+from serialization import to_json_value
+from spec_catalog import current
+from validation import build_order
+
+
+def test_frozen_catalog_restores_the_collector():
+    threshold = gc.get_threshold()
+    with frozen_catalog(threshold=1234):
+        assert gc.get_threshold()[0] == 1234
+        assert gc.get_freeze_count() > 0
+    assert gc.get_threshold() == threshold
+    assert gc.get_freeze_count() == 0
+
+
+def test_nested_batches_leave_the_outer_freeze():
+    with frozen_catalog():
+        with frozen_catalog():
+            pass
+        assert gc.get_freeze_count() > 0
+    assert gc.get_freeze_count() == 0
+
+
+def test_replay_builds_the_same_machines():
+    specs = [{"machine_type": "retro", "material": "wood"}, {"machine_type": "modern", "material": "fiber"}]
+    machines = replay_orders(specs, current())
+    expected = [build_order(spec, current()) for spec in specs]
+    assert [to_json_value(machine) for machine in machines] == [to_json_value(machine) for machine in expected]
@@ -0,0 +1,68 @@
+"""
+This module contains the tests of the cart and the purchases of ArcadeCatalog.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import pytest
+
+from ArcadeMachine import ArcadeCatalog
+from spec_catalog import current
+from validation import build_order
+
+
+def _machine(machine_type, material="wood"):
+    return build_order({"machine_type": machine_type, "material": material}, current())
+
+
+@pytest.fixture
+def catalog():
+    catalog = ArcadeCatalog()
+    catalog.add_machine(_machine("retro"), 2)
+    catalog.add_machine(_machine("modern"))
+    catalog.add_machine(_machine("retro"))  # Same configuration as the first line
+    return catalog
+
+
+def test_identical_machines_share_a_line(catalog):
+    assert [line.quantity for line in catalog.cart_lines()] == [3, 1]
+
+
+def test_listeners_see_every_line_and_the_purchase_once(catalog, capsys):
+    lines, purchases = [], []
+    catalog.subscribe(lambda machine, customer, quantity, unit_price: lines.append((quantity, unit_price)))
+    catalog.subscribe_purchases(lambda customer, cart, order: purchases.append((customer.name, cart, order)))
+
+    order = catalog.complete_purchase("Ana", "Calle 1, Bogota", "3001234567")
+
+    assert [quantity for quantity, _ in lines] == [3, 1]
+    assert len(purchases) == 1
+    name, cart, purchase = purchases[0]
+    assert name == "Ana" and purchase is order
+    assert [(line.quantity, line.unit_price) for line in cart] == lines
+    assert order["total"] == sum(quantity * unit_price for quantity, unit_price in lines)
+    assert "Purchase completed" in capsys.readouterr().out
+
+
+def test_the_cart_is_emptied(catalog, capsys):
+    catalog.complete_purchase("Ana", "Calle 1, Bogota", "3001234567")
+
+    with pytest.raises(ValueError, match="empty"):
+        catalog.complete_purchase("Ana", "Calle 1, Bogota", "3001234567")
@@ -0,0 +1,102 @@
+"""
+This module contains the tests of the JSON and binary serializers (serialization).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import pytest
+
+from ArcadeMachine import Customer, Material
+from conftest import make_game
+from serialization import dumps_binary, dumps_json, loads_binary, loads_json, to_json_value
+from spec_catalog import current
+from validation import build_order
+
+FORMATS = [(dumps_json, loads_json), (dumps_binary, loads_binary)]
+
+
+@pytest.fixture
+def game():
+    return make_game("P1", "Pac-Man")
+
+
+@pytest.fixture
+def machine(game):
+    return build_order({"machine_type": "retro", "material": Material.WOOD, "games": ["P1"]}, current(),
+                       games={"P1": game})
+
+
+@pytest.fixture
+def customer():
+    return Customer("Ana", "Calle 10 # 5-20, Bogota", "3001234567")
+
+
+@pytest.mark.parametrize("dumps, loads", FORMATS)
+def test_round_trip_of_a_list(dumps, loads, game, machine, customer):
+    result = loads(dumps([machine, customer, game]), games=[game])
+
+    assert [to_json_value(obj) for obj in result] == [to_json_value(obj) for obj in (machine, customer, game)]
+    assert result[0]._games == [game]  # Installed games are resolved to the games of the catalog
+
+
+@pytest.mark.parametrize("dumps, loads", FORMATS)
+def test_round_trip_of_one_object(dumps, loads, game, customer):
+    result = loads(dumps(customer), games=[game])
+
+    assert isinstance(result, Customer)
+    assert to_json_value(result) == to_json_value(customer)
+
+
+@pytest.mark.parametrize("dumps, loads", FORMATS)
+@pytest.mark.parametrize("size", [0, 1])
+def test_short_lists_stay_lists(dumps, loads, size, game, customer):
+    result = loads(dumps([customer] * size), games=[game])
+
+    assert isinstance(result, list) and len(result) == size
+
+
+@pytest.mark.parametrize("dumps, loads", FORMATS)
+def test_unknown_game_code(dumps, loads, machine):
+    with pytest.raises(ValueError, match="Unknown game code"):
+        loads(dumps(machine), games=[])
+
+
+@pytest.mark.parametrize("objs", [Customer("a\x1fb", "Calle 1", "300"), [Customer("Ana", "Calle 1", "300\x1f")]])
+def test_binary_rejects_the_unit_separator(objs):
+    with pytest.raises(ValueError, match="unit separator"):
+        dumps_binary(objs)
+
+
+def test_binary_rejects_the_unit_separator_in_game_codes(machine):
+    machine._games = [make_game("P\x1f1")]
+
+    with pytest.raises(ValueError, match="unit separator"):
+        dumps_binary(machine)
+
+
+def test_json_keeps_the_unit_separator(game):
+    customer = loads_json(dumps_json(Customer("a\x1fb", "Calle 1", "300")), games=[game])
+
+    assert customer.name == "a\x1fb"
+
+
+def test_binary_object_with_trailing_data(customer):
+    with pytest.raises(ValueError, match="Expected one object"):
+        loads_binary(dumps_binary(customer) + dumps_binary(customer))
@@ -0,0 +1,100 @@
+"""
+This module contains the tests of the resumable sessions (arcade_common.session).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import time
+
+import pytest
+
+from arcade_common.session import Session, SessionMachine, SessionStore, Step, choice, number, yes_no
+
+
+@pytest.fixture
+def machine():
+    return SessionMachine([
+        Step("machine_type", "Type: ", choice(("modern", "retro"), "Invalid machine type.")),
+        Step("quantity", "Quantity: ", number(range(1, 4), "Invalid quantity.")),
+        Step("confirm", "Confirm (y/n): ", yes_no)
+    ])
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(str(tmp_path), idle_timeout=60, app="kiosk")
+
+
+def test_resume_continues_at_the_saved_step(machine, store):
+    session = machine.resume(store, "k1")
+    assert machine.answer(session, "retro") is None
+    assert machine.answer(session, "2") is None
+    store.save(session)
+
+    resumed = machine.resume(store, "k1")
+    assert resumed.step == 2
+    assert resumed.data == {"machine_type": "retro", "quantity": 2}
+    assert machine.prompt(resumed) == "Confirm (y/n): "
+
+
+def test_invalid_answer_keeps_the_step(machine, store):
+    session = machine.resume(store, "k1")
+    assert machine.answer(session, "pinball") == "Invalid machine type."
+    assert session.step == 0 and session.data == {}
+
+
+def test_expired_session_starts_over(machine, store):
+    session = Session("k1", step=1, data={"machine_type": "retro"}, updated=time.time() - 120)
+    store.save(session)
+
+    resumed = machine.resume(store, "k1")
+    assert resumed.step == 0 and resumed.data == {}
+    assert store.load("k1") is None
+
+
+def test_session_of_another_app_is_not_resumed(machine, store, tmp_path):
+    other = SessionStore(str(tmp_path), app="v1")
+    other.save(Session("k1", step=1, data={"machine_type": "retro"}))
+
+    assert machine.resume(store, "k1").data == {}
+    assert other.load("k1") is None  # Deleted by the store that could not resume it
+
+
+def test_answers_the_flow_no_longer_accepts_are_dropped(machine, store):
+    store.save(Session("k1", step=1, data={"machine_type": "pinball"}))
+
+    assert machine.resume(store, "k1").data == {}
+    assert store.load("k1") is None
+
+
+def test_run_deletes_the_finished_session(machine, store):
+    answers = iter(["modern", "1", "y"])
+    session = machine.resume(store, "k1")
+
+    assert machine.run(session, store, read=lambda prompt, timeout: next(answers), write=lambda message: None)
+    assert session.data == {"machine_type": "modern", "quantity": 1, "confirm": True}
+    assert store.load("k1") is None
+
+
+def test_run_abandons_an_idle_session(machine, store):
+    session = machine.resume(store, "k1")
+
+    assert not machine.run(session, store, read=lambda prompt, timeout: None)
+    assert store.load("k1") is None
@@ -0,0 +1,77 @@
+"""
+This module contains the tests of the core shared by workshop-II and the
+original ArcadeMachine package (v1) through arcade_common.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import importlib.util
+import os
+
+import pytest
+
+import ArcadeMachine
+from arcade_common import machines
+from arcade_common.game_catalog import Game
+
+V1_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "ArcadeMachine",
+                       "ArcadeMachine.py")
+
+
+@pytest.fixture
+def v1():
+    """The ArcadeMachine module of v1 (named v1_arcade: workshop-II has its own ArcadeMachine)."""
+    saved = list(Game.available_games)
+    spec = importlib.util.spec_from_file_location("v1_arcade", V1_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield module
+    Game.available_games[:] = saved
+
+
+def test_both_packages_use_the_same_core(v1):
+    assert ArcadeMachine.ModernArcadeMachine is machines.ModernArcadeMachine is v1.ModernArcadeMachine
+    assert ArcadeMachine.ArcadeMachineBuilder is v1.ArcadeMachineBuilder
+    assert v1.Game.available_games is Game.available_games
+
+
+def test_v1_games_are_registered_in_the_shared_catalog(v1):
+    game = v1.Game("Fortnite", 904, "modern")
+    assert Game.available_games.by_code(904) is game
+    assert game.code == 904 and game in Game.available_games.by_type("modern")
+
+
+def test_v1_catalog_adds_games_by_integer_code(v1, capsys):
+    game = v1.Game("Rocket League", 905, "modern")
+    retro = v1.Game("Tetris", 906, "retro")
+    catalog = v1.ArcadeCatalog()
+    catalog.configure(1, 1, 1, 7, "With sound")
+    assert isinstance(catalog._cart, machines.ModernArcadeMachine)
+    catalog.add_game_by_code(905)
+    catalog.add_game_by_code(906)
+    assert catalog._cart._games == [game]
+    assert "not valid" in capsys.readouterr().out
+    assert retro in Game.available_games.by_type("retro")
+
+
+def test_workshop_machines_parse_their_specs():
+    builder = ArcadeMachine.ArcadeMachineBuilder().set_dimensions("1.7mx0.8mx0.8m").set_memory("8GB")
+    machine = ArcadeMachine.ArcadeMachineFactory.create_arcade_machine("modern", builder)
+    assert machine.specs.memory_bytes == 8 * 1024 ** 3
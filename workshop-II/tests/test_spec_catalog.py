@@ -0,0 +1,111 @@
+"""
+This module contains the tests of the machine specs catalog (spec_catalog).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import json
+import os
+import shutil
+import signal
+
+import pytest
+
+import spec_catalog
+
+
+@pytest.fixture
+def specs_file(tmp_path):
+    path = str(tmp_path / "machine_specs.json")
+    shutil.copy(spec_catalog.SPECS_PATH, path)
+    previous = spec_catalog._current
+    spec_catalog.install(spec_catalog.load(path))
+    yield path
+    spec_catalog.install(previous)
+    spec_catalog._reload_pending = False
+
+
+def _set_price(path, price):
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    data["defaults"]["modern"]["base_price"] = price
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+
+
+def test_catalog_is_read_only(specs_file):
+    with pytest.raises(TypeError):
+        spec_catalog.current()["modern"]["base_price"] = 0
+
+
+def test_invalid_file_is_rejected(tmp_path):
+    path = tmp_path / "machine_specs.json"
+    path.write_text(json.dumps({"version": 1, "defaults": {}}))
+
+    with pytest.raises(ValueError, match="without defaults"):
+        spec_catalog.load(str(path))
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP does not exist on this platform")
+def test_signal_only_flags_the_reload(specs_file):
+    handler = signal.getsignal(signal.SIGHUP)
+    try:
+        spec_catalog.reload_on_signal()
+        snapshot = spec_catalog.current()
+        _set_price(specs_file, 1700)
+        os.kill(os.getpid(), signal.SIGHUP)
+
+        assert spec_catalog._reload_pending
+        assert spec_catalog._current is snapshot  # Nothing read in the handler
+        assert spec_catalog.current()["modern"]["base_price"] == 1700
+        assert snapshot["modern"]["base_price"] != 1700
+    finally:
+        signal.signal(signal.SIGHUP, handler)
+
+
+def test_invalid_reload_keeps_the_catalog(specs_file, capsys):
+    snapshot = spec_catalog.current()
+    with open(specs_file, "w", encoding="utf-8") as file:
+        file.write("{")
+    spec_catalog._reload_pending = True
+
+    assert spec_catalog.current() is snapshot
+    assert "not reloaded" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("price", [float("nan"), float("inf")])
+def test_non_finite_prices_are_rejected(specs_file, price):
+    _set_price(specs_file, price)  # json writes them as NaN and Infinity, which it also reads
+
+    with pytest.raises(ValueError, match="positive finite number"):
+        spec_catalog.load(specs_file)
+
+
+def test_reloads_report_the_content_revision(specs_file, capsys):
+    first = spec_catalog.current()
+    spec_catalog._reload_pending = True
+    assert spec_catalog.current().revision == first.revision
+    assert f"unchanged (revision {first.revision})" in capsys.readouterr().err
+
+    _set_price(specs_file, 1700)
+    spec_catalog._reload_pending = True
+    second = spec_catalog.current()
+    assert second.revision != first.revision and second.version == first.version
+    assert f"revision {first.revision} -> {second.revision}" in capsys.readouterr().err
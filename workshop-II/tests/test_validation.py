@@ -0,0 +1,89 @@
+"""
+This module contains the tests of the validation of order specs (validation).
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import pytest
+
+from ArcadeMachine import Material
+from conftest import make_game
+from spec_catalog import current
+from validation import build_order, validate_batch, validate_spec
+
+GAMES = {"P1": make_game("P1", "Pac-Man"), "M1": make_game("M1", "Beat Saber", machine_type="modern")}
+
+
+def _spec(**fields):
+    spec = {"machine_type": "retro", "material": "wood"}
+    spec.update(fields)
+    return spec
+
+
+def test_valid_spec_is_normalized():
+    normalized, errors = validate_spec(_spec(games=["P1"]), games=GAMES)
+
+    assert errors == []
+    assert normalized == {"machine_type": "retro", "material": Material.WOOD, "games": ["P1"]}
+
+
+@pytest.mark.parametrize("codes", [5, "P1", {"P1": 1}, [["P1"]], [5], [""], [None]])
+def test_invalid_games_field_is_reported(codes):
+    normalized, errors = validate_spec(_spec(games=codes), games=GAMES)
+
+    assert normalized is None
+    assert [error.field for error in errors] == ["games"]
+
+
+def test_unknown_and_incompatible_games():
+    _, errors = validate_spec(_spec(games=["X1", "M1"]), games=GAMES)
+
+    assert [error.message for error in errors] == ["unknown game code 'X1'",
+                                                   "game 'M1' is not compatible with retro machines"]
+
+
+def test_batch_reports_every_error():
+    specs = [_spec(games=5), _spec(), _spec(games=[["P1"]], material="paper"), "retro"]
+
+    report = validate_batch(specs, games=GAMES)
+
+    assert [spec is not None for spec in report.specs] == [False, True, False, False]
+    assert [(error.index, error.field) for error in report.errors] == [
+        (0, "games"), (2, "material"), (2, "games"), (3, "spec")]
+
+
+def test_build_order_lists_the_errors():
+    with pytest.raises(ValueError, match="games"):
+        build_order(_spec(games="P1"), current(), games=GAMES)
+
+
+def test_build_order_installs_the_games():
+    machine = build_order(_spec(games=["P1", "P1"]), current(), games=GAMES)
+
+    assert machine._games == [GAMES["P1"]] * 2
+
+
+@pytest.mark.parametrize("price", [float("nan"), float("inf"), -1.0])
+def test_non_finite_or_negative_numbers_are_reported(price):
+    normalized, errors = validate_spec({"machine_type": "dance", "material": "wood", "controls_price": price})
+
+    assert normalized is None
+    assert ("controls_price", f"expected a non-negative finite number, got {price!r}") in [
+        (error.field, error.message) for error in errors]
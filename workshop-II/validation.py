@@ -0,0 +1,315 @@
+"""
+This module contains the validation of order specifications. An order spec is
+a dictionary with the machine type, the material, the colors and the fields
+required by the machine type (for example the glasses of a VR machine). Specs
+are checked against the required fields and the enum domains of their machine
+type before anything is built, and a whole batch of orders is checked in one
+pass with a report of every error found.
+
+Author: Julian David Celis Giraldo <jdcelisg@udistrital.edu.co>
+
+This file is part of ArcadeMachine.
+
+ArcadeMachine is free software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+ArcadeMAchine is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with ArcadeMachine If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Google Doc Python: python documentation style guide
+# Doc String
+import math
+
+from ArcadeMachine import (Material, Color, Sound, SimRacing, Glasses, Resolution, Game,
+                           MACHINE_TYPES, MATERIAL_INCREASES, ArcadeMachineBuilder,
+                           ArcadeMachineFactory)
+
+# Fields shared by every machine type: kind and whether they are required
+COMMON_FIELDS = {
+    "machine_type": (str, True),
+    "material": (Material, True),
+    "color": (Color, False),
+    "lights": (Color, False),
+    "sound": (Sound, False)
+}
+
+# Fields required by each machine type (the arguments of its build method)
+TYPE_FIELDS = {
+    "modern": {},
+    "retro": {},
+    "dance": {"difficulties": str, "arrow_cardinalities": str, "controls_price": float},
+    "classical": {"make_vibration": bool, "sound_record_alert": bool},
+    "shooter": {"gun_color": Color},
+    "racing": {"type_sim_racing": SimRacing, "add_gearbox": bool},
+    "vr": {"glasses_type": Glasses, "glasses_resolution": Resolution, "glasses_price": float}
+}
+
+# Names accepted for the materials besides the enum names and values (the cli options)
+MATERIAL_ALIASES = {"wood": Material.WOOD, "aluminum": Material.ALUMINUM, "fiber": Material.CARBON_FIBER}
+
+
+def _enum_lookup(enum_class):
+    """Returns a dictionary from every accepted spelling to the enum member."""
+    lookup = {}
+    for member in enum_class:
+        lookup[member] = member
+        lookup[member.name.lower()] = member
+        lookup[member.value.lower()] = member
+    if enum_class is Material:
+        lookup.update(MATERIAL_ALIASES)
+    return lookup
+
+
+_ENUM_LOOKUPS = {enum_class: _enum_lookup(enum_class)
+                 for enum_class in (Material, Color, Sound, SimRacing, Glasses, Resolution)}
+
+
+class ValidationError:
+    """
+    An error found in an order spec.
+
+    Attributes:
+    -----------
+    index : int
+        The position of the spec in the batch.
+    field : str
+        The field with the error.
+    message : str
+        The description of the error.
+    """
+    def __init__(self, index, field, message):
+        self.index = index
+        self.field = field
+        self.message = message
+
+    def __str__(self):
+        return f"Order {self.index}: {self.field}: {self.message}"
+
+    def __repr__(self):
+        return f"ValidationError({self.index!r}, {self.field!r}, {self.message!r})"
+
+
+class ValidationReport:
+    """
+    Result of validating a batch of order specs.
+
+    Attributes:
+    -----------
+    specs : list
+        The normalized specs (enums resolved), None for the invalid ones.
+    errors : list
+        Every ValidationError found in the batch.
+    """
+    def __init__(self, specs, errors):
+        self.specs = specs
+        self.errors = errors
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def valid_specs(self):
+        """Returns the (index, normalized spec) pairs of the valid specs."""
+        return [(index, spec) for index, spec in enumerate(self.specs) if spec is not None]
+
+    def errors_by_order(self):
+        """Returns a dictionary from the index of every invalid spec to its errors."""
+        grouped = {}
+        for error in self.errors:
+            grouped.setdefault(error.index, []).append(error)
+        return grouped
+
+    def __str__(self):
+        if self.ok:
+            return f"{len(self.specs)} orders valid."
+        invalid = len(self.errors_by_order())
+        lines = [f"{invalid} of {len(self.specs)} orders invalid:"]
+        lines += [f"- {error}" for error in self.errors]
+        return "\n".join(lines)
+
+
+# Fields of the specs of every machine type and the fields accepted, built
+# once and not for every spec
+_SPEC_FIELDS = {machine_type: {**COMMON_FIELDS, **{field: (kind, True) for field, kind in type_fields.items()}}
+                for machine_type, type_fields in TYPE_FIELDS.items()}
+_ALLOWED_FIELDS = {machine_type: frozenset(fields) | {"games"} for machine_type, fields in _SPEC_FIELDS.items()}
+_COMMON_ALLOWED = frozenset(COMMON_FIELDS) | {"games"}
+# (field, kind, required) of the fields checked by validate_spec (the machine type is checked first)
+_CHECKED_FIELDS = {machine_type: tuple((field, kind, required) for field, (kind, required) in fields.items()
+                                       if field != "machine_type")
+                   for machine_type, fields in _SPEC_FIELDS.items()}
+_COMMON_CHECKED = tuple((field, kind, required) for field, (kind, required) in COMMON_FIELDS.items()
+                        if field != "machine_type")
+
+
+def _check(kind, value):
+    """Returns (normalized value, error message or None) for a field value."""
+    lookup = _ENUM_LOOKUPS.get(kind)
+    if lookup is not None:
+        if type(value) is kind:  # Already a member; hashing a member would run Enum.__hash__
+            return value, None
+        key = value.lower() if isinstance(value, str) else value
+        try:
+            member = lookup.get(key)
+        except TypeError:
+            member = None
+        if member is None:
+            options = ", ".join(member.value for member in kind)
+            return None, f"invalid value {value!r} (expected one of: {options})"
+        return member, None
+    if kind is bool:
+        if not isinstance(value, bool):
+            return None, f"expected a boolean, got {value!r}"
+        return value, None
+    if kind is float:
+        # NaN passes value < 0, so finiteness is checked apart
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+            return None, f"expected a non-negative finite number, got {value!r}"
+        return float(value), None
+    if not isinstance(value, str) or not value.strip():
+        return None, f"expected a non-empty text, got {value!r}"
+    return value, None
+
+
+def catalog_games():
+    """
+    Returns the games of Game.available_games by code: the read-only code
+    index of the catalog, so nothing is built or cached per catalog version
+    and its memory is counted once, with the catalog.
+    """
+    return Game.available_games.codes()
+
+
+def validate_spec(spec, index=0, games=None):
+    """
+    Validates one order spec.
+
+    Parameters:
+    -----------
+    spec : dict
+        The order spec.
+    index : int
+        The position of the spec, used in the errors.
+    games : dict, optional
+        The games of the catalog by code, used to check the "games" field.
+
+    Returns:
+    --------
+    tuple : (normalized spec or None, list of ValidationError)
+    """
+    errors = []
+    if not isinstance(spec, dict):
+        return None, [ValidationError(index, "spec", "expected a dictionary")]
+    normalized = {}
+    machine_type = spec.get("machine_type")
+    if isinstance(machine_type, str):
+        machine_type = machine_type.lower()
+    known = isinstance(machine_type, str) and machine_type in _SPEC_FIELDS
+    fields = _CHECKED_FIELDS[machine_type] if known else _COMMON_CHECKED
+    if known:
+        normalized["machine_type"] = machine_type
+    else:
+        errors.append(ValidationError(index, "machine_type",
+                                      f"invalid value {machine_type!r} (expected one of: {', '.join(MACHINE_TYPES)})"))
+    for field, kind, required in fields:
+        value = spec.get(field)
+        if value is None:
+            if required:
+                errors.append(ValidationError(index, field, "missing required field"))
+            continue
+        value, message = _check(kind, value)
+        if message:
+            errors.append(ValidationError(index, field, message))
+        else:
+            normalized[field] = value
+    allowed = _ALLOWED_FIELDS[machine_type] if known else _COMMON_ALLOWED
+    if not allowed.issuperset(spec):
+        for field in spec:
+            if field not in allowed:
+                errors.append(ValidationError(index, field, f"unknown field for a {machine_type} machine"))
+    codes = spec.get("games")
+    if codes is not None and not isinstance(codes, (list, tuple)):
+        errors.append(ValidationError(index, "games", f"expected a list of game codes, got {codes!r}"))
+    elif codes:
+        if games is None:
+            games = catalog_games()
+        for code in codes:
+            if not isinstance(code, str) or not code:
+                errors.append(ValidationError(index, "games", f"expected a non-empty game code, got {code!r}"))
+                continue
+            game = games.get(code)
+            if game is None:
+                errors.append(ValidationError(index, "games", f"unknown game code {code!r}"))
+            elif machine_type in MACHINE_TYPES and game._type.lower() != machine_type:
+                errors.append(ValidationError(index, "games", f"game {code!r} is not compatible with {machine_type} machines"))
+        normalized["games"] = list(codes)
+    return (None if errors else normalized), errors
+
+
+def validate_batch(specs, games=None):
+    """
+    Validates a batch of order specs in one pass.
+
+    Every spec is checked completely, so the report has every error of the
+    batch and not only the first one.
+
+    Returns:
+    --------
+    ValidationReport : The normalized specs and the errors.
+    """
+    if games is None:
+        games = catalog_games()
+    normalized = []
+    errors = []
+    for index, spec in enumerate(specs):
+        result, spec_errors = validate_spec(spec, index, games)
+        normalized.append(result)
+        errors.extend(spec_errors)
+    return ValidationReport(normalized, errors)
+
+
+def build_order(spec, defaults, games=None):
+    """
+    Validates an order spec and builds its machine.
+
+    Parameters:
+    -----------
+    spec : dict
+        The order spec.
+    defaults : dict
+        The default attributes of every machine type (as in the cli).
+    games : dict, optional
+        The games of the catalog by code.
+
+    Returns:
+    --------
+    ArcadeMachine : The machine, with the material increases applied and the games installed.
+
+    Raises:
+    -------
+    ValueError : If the spec is not valid; the message lists every error.
+    """
+    if games is None:
+        games = catalog_games()
+    normalized, errors = validate_spec(spec, games=games)
+    if errors:
+        raise ValueError(str(ValidationReport([None], errors)))
+    machine_type = normalized.pop("machine_type")
+    builder = ArcadeMachineBuilder()
+    builder.set_attributes(defaults[machine_type])
+    builder.set_increases(*MATERIAL_INCREASES[normalized["material"]])
+    codes = normalized.pop("games", ())
+    for field, value in normalized.items():
+        setattr(builder, "_" + field, value)
+    machine = ArcadeMachineFactory.create_arcade_machine(machine_type, builder)
+    for code in codes:
+        machine.add_game(games[code])
+    return machine